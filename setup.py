@@ -31,6 +31,11 @@ setup(
         "requests>=2.31.0",
         "PyYAML>=6.0.1",
     ],
+    extras_require={
+        "fast": [
+            "orjson>=3.9",
+        ],
+    },
     entry_points={
         "console_scripts": [
             "check-dolphin=check_dolphin.cli:main",
@@ -0,0 +1,179 @@
+"""
+Retry Admission Control
+根据集群负载（Worker/Master 资源使用率和运行中的工作流数量）决定是否允许发起新的重试
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+from .api_client import DolphinSchedulerClient
+
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionController:
+    """重试准入控制器（集群负载查询结果在 cache_ttl 内复用）"""
+
+    STATE_RUNNING_EXECUTION = 'RUNNING_EXECUTION'
+
+    def __init__(
+        self,
+        client: DolphinSchedulerClient,
+        project_codes: Optional[List[int]] = None,
+        max_cpu_usage: float = 0.85,
+        max_memory_usage: float = 0.85,
+        max_load_average: float = 0,
+        max_running_instances: int = 0,
+        cache_ttl: float = 30,
+        poll_interval: float = 30,
+        max_wait: float = 300
+    ):
+        """
+        初始化准入控制器
+
+        Args:
+            client: DolphinScheduler API 客户端
+            project_codes: 统计运行中工作流数量的项目代码列表
+            max_cpu_usage: Worker/Master 平均 CPU 使用率上限（0-1，0 表示不检查）
+            max_memory_usage: Worker/Master 平均内存使用率上限（0-1，0 表示不检查）
+            max_load_average: Worker/Master 平均系统负载上限（0 表示不检查）
+            max_running_instances: 运行中工作流实例数量上限（0 表示不检查）
+            cache_ttl: 集群负载缓存时间（秒）
+            poll_interval: 集群繁忙时重新检查的间隔（秒）
+            max_wait: 每轮检查中等待集群恢复的最长时间（秒），超时后留到下一轮
+        """
+        self.client = client
+        self.project_codes = list(project_codes or [])
+        self.max_cpu_usage = max_cpu_usage
+        self.max_memory_usage = max_memory_usage
+        self.max_load_average = max_load_average
+        self.max_running_instances = max_running_instances
+        self.cache_ttl = cache_ttl
+        self.poll_interval = poll_interval
+        self.max_wait = max_wait
+
+        self._lock = threading.Lock()
+        self._load: Optional[Dict] = None
+        self._load_time = 0.0
+        # 最近一次查询之后发起的重试数量（计入运行中的实例）
+        self._issued_since_refresh = 0
+
+    @staticmethod
+    def _server_metrics(server: Dict) -> Dict:
+        """
+        解析服务器的资源信息（兼容 resInfo 和 heartBeatInfo 字段，值可能是 JSON 字符串）
+
+        Args:
+            server: Worker/Master 服务器信息
+
+        Returns:
+            资源信息字典
+        """
+        info = server.get('resInfo') or server.get('heartBeatInfo') or {}
+        if isinstance(info, str):
+            try:
+                info = json.loads(info)
+            except ValueError:
+                return {}
+
+        return info if isinstance(info, dict) else {}
+
+    @classmethod
+    def _average(cls, servers: List[Dict], field: str) -> Optional[float]:
+        """计算一组服务器某项指标的平均值，缺少数据时返回 None"""
+        values = [
+            float(metrics[field])
+            for metrics in (cls._server_metrics(server) for server in servers)
+            if metrics.get(field) is not None
+        ]
+
+        return sum(values) / len(values) if values else None
+
+    def _fetch_load(self) -> Dict:
+        """
+        查询集群负载
+
+        Returns:
+            负载字典（查询失败的指标为 None）
+        """
+        load = {}
+
+        for role, servers in (
+            ('worker', self.client.get_worker_servers()),
+            ('master', self.client.get_master_servers())
+        ):
+            servers = servers or []
+            load[f'{role}_count'] = len(servers)
+            load[f'{role}_cpu_usage'] = self._average(servers, 'cpuUsage')
+            load[f'{role}_memory_usage'] = self._average(servers, 'memoryUsage')
+            load[f'{role}_load_average'] = self._average(servers, 'loadAverage')
+
+        load['running_instances'] = None
+        if self.max_running_instances:
+            counts = [
+                self.client.get_workflow_instance_count(project_code, state_type=self.STATE_RUNNING_EXECUTION)
+                for project_code in self.project_codes
+            ]
+            if all(count is not None for count in counts):
+                load['running_instances'] = sum(counts)
+
+        return load
+
+    def cluster_load(self) -> Dict:
+        """
+        获取集群负载（缓存 cache_ttl 秒）
+
+        Returns:
+            负载字典
+        """
+        with self._lock:
+            if self._load is not None and time.monotonic() - self._load_time < self.cache_ttl:
+                return self._load
+
+        load = self._fetch_load()
+
+        with self._lock:
+            self._load = load
+            self._load_time = time.monotonic()
+            self._issued_since_refresh = 0
+
+        return load
+
+    def admit(self) -> tuple[bool, str]:
+        """
+        判断当前是否允许发起新的重试
+
+        Returns:
+            (是否允许, 原因说明)
+        """
+        load = self.cluster_load()
+
+        checks = [
+            ('cpu_usage', self.max_cpu_usage),
+            ('memory_usage', self.max_memory_usage),
+            ('load_average', self.max_load_average)
+        ]
+        for role in ('worker', 'master'):
+            for metric, limit in checks:
+                value = load.get(f'{role}_{metric}')
+                # 指标缺失时不阻止重试
+                if limit and value is not None and value > limit:
+                    return False, f"{role} {metric} {value:.2f} exceeds {limit}"
+
+        running = load.get('running_instances')
+        if self.max_running_instances and running is not None:
+            with self._lock:
+                running += self._issued_since_refresh
+            if running >= self.max_running_instances:
+                return False, f"{running} running workflow instances (limit {self.max_running_instances})"
+
+        return True, "Cluster has capacity"
+
+    def record_retry(self):
+        """记录一次已发起的重试（在下次刷新负载前计入运行中的实例数量）"""
+        with self._lock:
+            self._issued_since_refresh += 1
@@ -5,17 +5,41 @@ DolphinScheduler API Client
 
 import requests
 import logging
-from typing import Dict, List, Optional, Any
+import re
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Any
 from datetime import datetime
 
+from .memory import BoundedDict
+
+try:
+    import orjson
+except ImportError:  # 可选依赖，未安装时使用 requests 自带的 JSON 解析
+    orjson = None
+
 
 logger = logging.getLogger(__name__)
 
+# 当前使用的 JSON 解析后端
+JSON_BACKEND = 'orjson' if orjson else 'json'
+
 
 class DolphinSchedulerClient:
     """DolphinScheduler API 客户端"""
 
-    def __init__(self, base_url: str, token: str, timeout: int = 30):
+    def __init__(
+        self,
+        base_url: str,
+        token: str,
+        timeout: int = 30,
+        conditional_requests: bool = True,
+        coalesce_requests: bool = True,
+        transport: Optional[Any] = None,
+        max_cached_responses: int = 10000,
+        session: Optional[requests.Session] = None,
+        rate_limiter: Optional[Any] = None
+    ):
         """
         初始化 DolphinScheduler 客户端
 
@@ -23,20 +47,196 @@ class DolphinSchedulerClient:
             base_url: DolphinScheduler API 基础 URL (例如: http://localhost:12345/dolphinscheduler)
             token: API 访问令牌
             timeout: 请求超时时间（秒）
+            conditional_requests: 是否对 GET 请求使用 ETag/Last-Modified 条件请求
+            coalesce_requests: 是否合并并发的相同 GET 请求（共享一次请求和解析结果）
+            transport: 发送请求的传输对象（可选，需要提供与 requests.request 相同的 request 方法，
+                例如 RecordingTransport/ReplayTransport；默认直接使用 requests）
+            max_cached_responses: 条件请求缓存的最大响应数（超过时淘汰最久未更新的响应，0 表示不限制）
+            session: 复用连接的会话（可选，默认每个请求单独建立连接）
+            rate_limiter: 请求速率限制（可选，需要提供 acquire 方法，每次实际发送请求前调用）
         """
         self.base_url = base_url.rstrip('/')
         self.token = token
         self.timeout = timeout
+        self.conditional_requests = conditional_requests
+        self.coalesce_requests = coalesce_requests
+        self.transport = transport
+        self.session = session
+        self.rate_limiter = rate_limiter
         self.headers = {
             'Accept': 'application/json',
+            'Accept-Encoding': 'gzip, deflate',
             'Content-Type': 'application/json',
             'token': token
         }
 
+        # 条件请求缓存：请求键 -> {etag, last_modified, data, size}
+        self._validators: Dict[str, Dict] = BoundedDict(max_cached_responses)
+        # 传输统计：端点模板 -> 统计字典
+        self._transfer_stats: Dict[str, Dict] = {}
+        # 进行中的 GET 请求：请求键 -> {'event', 'result', 'error'}
+        self._in_flight: Dict[str, Dict] = {}
+        # 请求合并统计：端点模板 -> {'requests', 'coalesced'}
+        self._coalescing_stats: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _endpoint_template(endpoint: str) -> str:
+        """将端点中的数字 ID 替换为占位符，用于按端点汇总统计"""
+        return re.sub(r'/\d+', '/{id}', '/' + endpoint.lstrip('/'))
+
+    @staticmethod
+    def _parse_json(response: requests.Response) -> Dict:
+        """使用可用的最快 JSON 后端解析响应体"""
+        if orjson:
+            try:
+                return orjson.loads(response.content)
+            except orjson.JSONDecodeError as e:
+                raise ValueError(str(e))
+
+        return response.json()
+
+    def _record_transfer(
+        self,
+        endpoint: str,
+        wire_bytes: int,
+        body_bytes: int,
+        parse_time: float,
+        not_modified: bool = False
+    ):
+        """
+        记录单次请求的传输统计
+
+        Args:
+            endpoint: API 端点
+            wire_bytes: 实际传输的字节数（压缩后）
+            body_bytes: 解压后的响应体字节数（304 时为缓存的响应体大小）
+            parse_time: JSON 解析耗时（秒）
+            not_modified: 是否为 304 响应
+        """
+        key = self._endpoint_template(endpoint)
+
+        with self._lock:
+            stats = self._transfer_stats.setdefault(key, {
+                'requests': 0,
+                'not_modified': 0,
+                'wire_bytes': 0,
+                'body_bytes': 0,
+                'parse_time': 0.0
+            })
+            stats['requests'] += 1
+            stats['not_modified'] += 1 if not_modified else 0
+            stats['wire_bytes'] += wire_bytes
+            stats['body_bytes'] += body_bytes
+            stats['parse_time'] += parse_time
+
+    def get_transfer_stats(self) -> Dict[str, Dict]:
+        """
+        获取按端点汇总的传输统计（节省的字节数和 JSON 解析耗时）
+
+        Returns:
+            端点模板 -> 统计字典
+        """
+        with self._lock:
+            result = {}
+            for key, stats in self._transfer_stats.items():
+                result[key] = dict(
+                    stats,
+                    bytes_saved=stats['body_bytes'] - stats['wire_bytes'],
+                    parse_time=round(stats['parse_time'], 4),
+                    avg_parse_ms=round(stats['parse_time'] * 1000 / stats['requests'], 3)
+                )
+
+        return {'json_backend': JSON_BACKEND, 'endpoints': result}
+
+    def memory_structures(self) -> Dict[str, Any]:
+        """
+        列出客户端中常驻内存的结构（用于内存诊断）
+
+        Returns:
+            结构名称 -> 返回结构对象的函数
+        """
+        return {
+            'client.validators': lambda: self._validators,
+            'client.transfer_stats': lambda: self._transfer_stats,
+            'client.coalescing_stats': lambda: self._coalescing_stats
+        }
+
+    @staticmethod
+    def _request_key(url: str, params: Optional[Dict]) -> str:
+        """生成 GET 请求的唯一键（URL 和排序后的查询参数）"""
+        return f"{url}?{sorted((params or {}).items())}"
+
+    def get_coalescing_stats(self) -> Dict:
+        """
+        获取请求合并统计（被合并、没有实际发送的 GET 请求数量）
+
+        Returns:
+            统计字典
+        """
+        with self._lock:
+            endpoints = {key: dict(stats) for key, stats in self._coalescing_stats.items()}
+
+        return {
+            'requests': sum(stats['requests'] for stats in endpoints.values()),
+            'coalesced': sum(stats['coalesced'] for stats in endpoints.values()),
+            'endpoints': endpoints
+        }
+
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Optional[Dict]:
         """
         发送 HTTP 请求
 
+        并发的相同 GET 请求只发送一次，等待中的调用共享同一个解析结果（调用方不应修改返回值）。
+
+        Args:
+            method: HTTP 方法 (GET, POST, etc.)
+            endpoint: API 端点
+            **kwargs: 其他请求参数
+
+        Returns:
+            响应数据字典，如果请求失败返回 None
+        """
+        if not self.coalesce_requests or method.upper() != 'GET':
+            return self._send_request(method, endpoint, **kwargs)
+
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        key = self._request_key(url, kwargs.get('params'))
+        template = self._endpoint_template(endpoint)
+
+        with self._lock:
+            stats = self._coalescing_stats.setdefault(template, {'requests': 0, 'coalesced': 0})
+            stats['requests'] += 1
+
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = {'event': threading.Event(), 'result': None, 'error': None}
+                self._in_flight[key] = call
+            else:
+                stats['coalesced'] += 1
+
+        if not leader:
+            call['event'].wait()
+            if call['error']:
+                raise call['error']
+            return call['result']
+
+        try:
+            call['result'] = self._send_request(method, endpoint, **kwargs)
+            return call['result']
+        except Exception as e:
+            call['error'] = e
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            call['event'].set()
+
+    def _send_request(self, method: str, endpoint: str, **kwargs) -> Optional[Dict]:
+        """
+        发送 HTTP 请求（不合并）
+
         Args:
             method: HTTP 方法 (GET, POST, etc.)
             endpoint: API 端点
@@ -46,30 +246,76 @@ class DolphinSchedulerClient:
             响应数据字典，如果请求失败返回 None
         """
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        headers = self.headers
+
+        # GET 请求携带上次响应的 ETag/Last-Modified，服务端或代理返回 304 时复用缓存
+        cache_key = None
+        cached = None
+        if self.conditional_requests and method.upper() == 'GET':
+            cache_key = self._request_key(url, kwargs.get('params'))
+            with self._lock:
+                cached = self._validators.get(cache_key)
+            if cached:
+                headers = dict(self.headers)
+                if cached['etag']:
+                    headers['If-None-Match'] = cached['etag']
+                if cached['last_modified']:
+                    headers['If-Modified-Since'] = cached['last_modified']
 
         try:
-            response = requests.request(
+            if self.transport:
+                send = self.transport.request
+            else:
+                send = self.session.request if self.session else requests.request
+
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            response = send(
                 method=method,
                 url=url,
-                headers=self.headers,
+                headers=headers,
                 timeout=self.timeout,
                 **kwargs
             )
             response.raise_for_status()
 
-            data = response.json()
+            if response.status_code == 304 and cached:
+                self._record_transfer(endpoint, 0, cached['size'], 0.0, not_modified=True)
+                return cached['data']
+
+            started = time.perf_counter()
+            data = self._parse_json(response)
+            parse_time = time.perf_counter() - started
+
+            body_bytes = len(response.content)
+            wire_bytes = int(response.headers.get('Content-Length') or body_bytes)
+            self._record_transfer(endpoint, wire_bytes, body_bytes, parse_time)
 
             if not data.get('success', False):
-                logger.error(f"API request failed: {data.get('msg', 'Unknown error')}")
+                logger.error("API request failed: %s", data.get('msg', 'Unknown error'))
                 return None
 
-            return data.get('data')
+            result = data.get('data')
+
+            if cache_key:
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+                if etag or last_modified:
+                    with self._lock:
+                        self._validators[cache_key] = {
+                            'etag': etag,
+                            'last_modified': last_modified,
+                            'data': result,
+                            'size': body_bytes
+                        }
+
+            return result
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Request error for {url}: {str(e)}")
+            logger.error("Request error for %s: %s", url, e)
             return None
         except ValueError as e:
-            logger.error(f"JSON decode error: {str(e)}")
+            logger.error("JSON decode error: %s", e)
             return None
 
     def get_projects(self, page_no: int = 1, page_size: int = 100) -> Optional[List[Dict]]:
@@ -95,7 +341,7 @@ class DolphinSchedulerClient:
 
         return []
 
-    def get_workflow_instances(
+    def get_workflow_instance_page(
         self,
         project_code: int,
         page_no: int = 1,
@@ -104,9 +350,9 @@ class DolphinSchedulerClient:
         state_type: Optional[str] = None,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None
-    ) -> Optional[List[Dict]]:
+    ) -> Optional[Dict]:
         """
-        获取工作流实例列表
+        获取一页工作流实例及符合条件的实例总数
 
         Args:
             project_code: 项目代码
@@ -118,7 +364,7 @@ class DolphinSchedulerClient:
             end_date: 结束日期（可选，格式: yyyy-MM-dd HH:mm:ss）
 
         Returns:
-            工作流实例列表
+            {'items': 实例列表, 'total': 总数}，请求失败时返回 None
         """
         params = {
             'pageNo': page_no,
@@ -138,9 +384,141 @@ class DolphinSchedulerClient:
         result = self._make_request('GET', endpoint, params=params)
 
         if result and 'totalList' in result:
-            return result['totalList']
+            items = result['totalList'] or []
+            return {'items': items, 'total': result.get('total', len(items))}
 
-        return []
+        return None
+
+    def get_workflow_instances(
+        self,
+        project_code: int,
+        page_no: int = 1,
+        page_size: int = 100,
+        workflow_name: Optional[str] = None,
+        state_type: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Optional[List[Dict]]:
+        """
+        获取工作流实例列表
+
+        Args:
+            project_code: 项目代码
+            page_no: 页码
+            page_size: 每页大小
+            workflow_name: 工作流名称（可选）
+            state_type: 状态类型（可选，例如: FAILURE, SUCCESS）
+            start_date: 开始日期（可选，格式: yyyy-MM-dd HH:mm:ss）
+            end_date: 结束日期（可选，格式: yyyy-MM-dd HH:mm:ss）
+
+        Returns:
+            工作流实例列表
+        """
+        page = self.get_workflow_instance_page(
+            project_code=project_code,
+            page_no=page_no,
+            page_size=page_size,
+            workflow_name=workflow_name,
+            state_type=state_type,
+            start_date=start_date,
+            end_date=end_date
+        )
+
+        return page['items'] if page else []
+
+    def iter_workflow_instances(
+        self,
+        project_code: int,
+        page_size: int = 100,
+        max_pages: Optional[int] = None,
+        strict: bool = False,
+        **filters
+    ) -> Iterator[Dict]:
+        """
+        逐页获取所有符合条件的工作流实例
+
+        Args:
+            project_code: 项目代码
+            page_size: 每页大小
+            max_pages: 最多获取的页数（可选，默认不限制）
+            strict: 某一页请求失败时是否抛出异常（默认静默结束，只返回已获取的实例）
+            **filters: 过滤条件（workflow_name、state_type、start_date、end_date）
+
+        Returns:
+            工作流实例迭代器
+
+        Raises:
+            RuntimeError: strict 为 True 且某一页请求失败
+        """
+        page_no = 1
+
+        while max_pages is None or page_no <= max_pages:
+            page = self.get_workflow_instance_page(
+                project_code=project_code, page_no=page_no, page_size=page_size, **filters
+            )
+            if not page:
+                if strict:
+                    raise RuntimeError(
+                        f"Failed to query workflow instances of project {project_code} (page {page_no})"
+                    )
+                return
+
+            yield from page['items']
+
+            if not page['items'] or page_no * page_size >= page['total']:
+                return
+            page_no += 1
+
+    def get_workflow_instance_count(
+        self,
+        project_code: int,
+        state_type: Optional[str] = None
+    ) -> Optional[int]:
+        """
+        获取工作流实例数量（只请求一条记录，读取分页结果中的总数）
+
+        Args:
+            project_code: 项目代码
+            state_type: 状态类型（可选，例如: RUNNING_EXECUTION）
+
+        Returns:
+            实例数量，请求失败时返回 None
+        """
+        params = {
+            'pageNo': 1,
+            'pageSize': 1
+        }
+
+        if state_type:
+            params['stateType'] = state_type
+
+        endpoint = f'/projects/{project_code}/process-instances'
+        result = self._make_request('GET', endpoint, params=params)
+
+        if result and 'total' in result:
+            return result['total']
+
+        return None
+
+    def get_worker_servers(self) -> Optional[List[Dict]]:
+        """
+        获取 Worker 服务器列表（包含资源使用信息）
+
+        Returns:
+            Worker 服务器列表，请求失败时返回 None
+        """
+        result = self._make_request('GET', '/monitor/workers')
+        return result if isinstance(result, list) else None
+
+    def get_master_servers(self) -> Optional[List[Dict]]:
+        """
+        获取 Master 服务器列表（包含资源使用信息）
+
+        Returns:
+            Master 服务器列表，请求失败时返回 None
+        """
+        result = self._make_request('GET', '/monitor/masters')
+        return result if isinstance(result, list) else None
 
     def get_workflow_instance(self, project_code: int, instance_id: int) -> Optional[Dict]:
         """
@@ -156,10 +534,44 @@ class DolphinSchedulerClient:
         endpoint = f'/projects/{project_code}/process-instances/{instance_id}'
         return self._make_request('GET', endpoint)
 
+    def get_sub_process_instance_id(self, project_code: int, task_instance_id: int) -> Optional[int]:
+        """
+        获取 SUB_PROCESS 任务实例对应的子工作流实例 ID
+
+        Args:
+            project_code: 项目代码
+            task_instance_id: SUB_PROCESS 任务实例 ID
+
+        Returns:
+            子工作流实例 ID，请求失败时返回 None
+        """
+        endpoint = f'/projects/{project_code}/process-instances/query-sub-by-parent'
+        result = self._make_request('GET', endpoint, params={'taskId': task_instance_id})
+
+        if result and result.get('subProcessInstanceId') is not None:
+            return result['subProcessInstanceId']
+
+        return None
+
+    def get_workflow_definition(self, project_code: int, definition_code: int) -> Optional[Dict]:
+        """
+        获取工作流定义详情（包含任务定义列表）
+
+        Args:
+            project_code: 项目代码
+            definition_code: 工作流定义代码
+
+        Returns:
+            工作流定义详情
+        """
+        endpoint = f'/projects/{project_code}/process-definition/{definition_code}'
+        return self._make_request('GET', endpoint)
+
     def retry_workflow_instance(
         self,
         project_code: int,
-        instance_id: int
+        instance_id: int,
+        execute_type: str = 'REPEAT_RUNNING'
     ) -> bool:
         """
         重试失败的工作流实例
@@ -167,6 +579,8 @@ class DolphinSchedulerClient:
         Args:
             project_code: 项目代码
             instance_id: 实例 ID
+            execute_type: 执行类型（REPEAT_RUNNING 重跑整个工作流，
+                          START_FAILURE_TASK_PROCESS 只重跑失败的任务）
 
         Returns:
             是否重试成功
@@ -175,16 +589,16 @@ class DolphinSchedulerClient:
 
         data = {
             'processInstanceId': instance_id,
-            'executeType': 'REPEAT_RUNNING'
+            'executeType': execute_type
         }
 
         result = self._make_request('POST', endpoint, json=data)
 
         if result:
-            logger.info(f"Successfully retried workflow instance {instance_id}")
+            logger.info("Successfully retried workflow instance %s", instance_id)
             return True
         else:
-            logger.error(f"Failed to retry workflow instance {instance_id}")
+            logger.error("Failed to retry workflow instance %s", instance_id)
             return False
 
     def get_task_instances(
@@ -209,3 +623,38 @@ class DolphinSchedulerClient:
             return result
 
         return []
+
+    def get_task_log(
+        self,
+        task_instance_id: int,
+        skip_line_num: int = 0,
+        limit: int = 1000,
+        project_code: Optional[int] = None
+    ) -> Optional[str]:
+        """
+        分段获取任务实例日志
+
+        Args:
+            task_instance_id: 任务实例 ID
+            skip_line_num: 跳过的行数
+            limit: 读取的行数
+            project_code: 任务所属的项目代码（可选，日志接口不需要，供客户端池选择有权限的凭据）
+
+        Returns:
+            日志内容，请求失败时返回 None
+        """
+        params = {
+            'taskInstanceId': task_instance_id,
+            'skipLineNum': skip_line_num,
+            'limit': limit
+        }
+
+        result = self._make_request('GET', '/log/detail', params=params)
+
+        # 不同版本的返回格式：日志字符串或 {'lineNum': ..., 'message': ...}
+        if isinstance(result, dict):
+            return result.get('message') or ''
+        if isinstance(result, str):
+            return result
+
+        return None
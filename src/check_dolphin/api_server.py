@@ -0,0 +1,166 @@
+"""
+Local HTTP API
+持续监控时提供本地 HTTP 查询/控制接口，查询直接读取监控器的内存状态，不访问 DolphinScheduler
+"""
+
+import hmac
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+from .memory import MemoryDiagnostics
+from .monitor import WorkflowMonitor
+
+
+logger = logging.getLogger(__name__)
+
+
+class MonitorAPIServer:
+    """本地 HTTP API 服务（在后台线程中运行）"""
+
+    def __init__(
+        self,
+        monitor: WorkflowMonitor,
+        host: str = '127.0.0.1',
+        port: int = 8080,
+        token: Optional[str] = None,
+        diagnostics: Optional[MemoryDiagnostics] = None
+    ):
+        """
+        初始化 HTTP API 服务
+
+        Args:
+            monitor: 工作流监控器
+            host: 监听地址（默认只监听本机）
+            port: 监听端口（0 表示自动分配）
+            token: 访问令牌（POST 请求需要携带 X-Auth-Token 请求头，未配置时不接受 POST 请求）
+            diagnostics: 内存诊断（可选，提供 /memory 查询）
+        """
+        self.monitor = monitor
+        self.token = token
+        self.diagnostics = diagnostics
+
+        handler = type('MonitorAPIHandler', (_MonitorAPIHandler,), {'api': self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> str:
+        """实际监听的地址（host:port）"""
+        host, port = self.httpd.server_address[:2]
+        return f"{host}:{port}"
+
+    def start(self):
+        """在后台线程中启动服务"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='api-server', daemon=True)
+        self._thread.start()
+        logger.info("Local HTTP API listening on http://%s", self.address)
+
+    def stop(self):
+        """停止服务"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join(5)
+            self._thread = None
+
+    def handle_get(self, path: str) -> tuple[int, Any]:
+        """
+        处理查询请求
+
+        Args:
+            path: 请求路径
+
+        Returns:
+            (HTTP 状态码, 响应内容)
+        """
+        if path == '/health':
+            return 200, {'status': 'ok', 'shutting_down': self.monitor.shutdown_event.is_set()}
+        if path == '/status':
+            return 200, {str(code): summary for code, summary in self.monitor.get_status_snapshot().items()}
+        if path == '/stats':
+            return 200, self.monitor.get_retry_statistics()
+        if path == '/queue':
+            return 200, self.monitor.get_queue_snapshot()
+        if path == '/cycle':
+            return 200, self.monitor.last_cycle
+        if path == '/memory' and self.diagnostics:
+            return 200, self.diagnostics.snapshot()
+
+        return 404, {'error': f"Unknown path: {path}"}
+
+    def handle_post(self, path: str, body: Any) -> tuple[int, Any]:
+        """
+        处理控制请求
+
+        Args:
+            path: 请求路径
+            body: 请求体（JSON）
+
+        Returns:
+            (HTTP 状态码, 响应内容)
+        """
+        if path != '/retry':
+            return 404, {'error': f"Unknown path: {path}"}
+
+        try:
+            project_code = int(body['project_code'])
+            instance_id = int(body['instance_id'])
+        except (KeyError, TypeError, ValueError):
+            return 400, {'error': "project_code and instance_id are required"}
+
+        success = self.monitor.manual_retry(
+            project_code=project_code,
+            instance_id=instance_id,
+            failed_tasks=bool(body.get('failed_tasks', False))
+        )
+        if not success:
+            return 502, {'error': f"Failed to retry workflow instance {instance_id}"}
+
+        return 200, {'retried': instance_id, 'retry_count': self.monitor.retry_records.get(instance_id, 0)}
+
+
+class _MonitorAPIHandler(BaseHTTPRequestHandler):
+    """HTTP 请求处理（具体逻辑由 MonitorAPIServer 完成）"""
+
+    api: MonitorAPIServer
+
+    def _send_json(self, status: int, payload: Any):
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._send_json(*self.api.handle_get(urlparse(self.path).path.rstrip('/') or '/'))
+
+    def do_POST(self):
+        # 控制接口会触发重试，未配置令牌时只提供查询
+        if not self.api.token:
+            self._send_json(403, {'error': "POST is disabled, configure api.token to enable it"})
+            return
+        if not hmac.compare_digest(self.headers.get('X-Auth-Token') or '', self.api.token):
+            self._send_json(401, {'error': "Invalid or missing X-Auth-Token"})
+            return
+        # 要求 JSON 请求头，浏览器的跨站表单请求无法携带
+        if self.headers.get_content_type() != 'application/json':
+            self._send_json(415, {'error': "Content-Type must be application/json"})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self._send_json(400, {'error': "Request body must be JSON"})
+            return
+
+        self._send_json(*self.api.handle_post(urlparse(self.path).path.rstrip('/'), body))
+
+    def log_message(self, format, *args):
+        logger.debug("API request from %s: %s", self.address_string(), format % args)
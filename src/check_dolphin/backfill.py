@@ -0,0 +1,392 @@
+"""
+Backfill Scanning
+把大时间范围切分为时间片并发扫描失败的工作流，时间片大小随结果密度自适应，支持断点续扫
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Deque, Dict, Iterable, List, Optional
+
+from .api_client import DolphinSchedulerClient
+from .checkpoint import CheckpointStore
+
+
+logger = logging.getLogger(__name__)
+
+
+class BackfillScanner:
+    """时间分片回溯扫描器"""
+
+    DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+    DEFAULT_STATES = ('FAILURE', 'STOP')
+    # 单个时间片的最大尝试次数
+    MAX_SLICE_ATTEMPTS = 3
+
+    def __init__(
+        self,
+        client: DolphinSchedulerClient,
+        states: Iterable[str] = DEFAULT_STATES,
+        slice_hours: float = 24,
+        min_slice_minutes: float = 15,
+        max_slice_hours: float = 7 * 24,
+        max_workers: int = 8,
+        page_size: int = 100,
+        max_pages: int = 5,
+        checkpoint_path: Optional[str] = None,
+        progress_interval: float = 10
+    ):
+        """
+        初始化回溯扫描器
+
+        Args:
+            client: DolphinScheduler API 客户端
+            states: 需要扫描的工作流状态
+            slice_hours: 初始时间片长度（小时）
+            min_slice_minutes: 最小时间片长度（分钟），达到后不再拆分，改为完整分页
+            max_slice_hours: 最大时间片长度（小时），结果稀疏时合并的上限
+            max_workers: 并发请求数
+            page_size: 每页大小
+            max_pages: 单个时间片的页数上限，超过时拆分时间片
+            checkpoint_path: 时间片检查点文件路径（可选，用于中断后续扫）
+            progress_interval: 进度日志的输出间隔（秒）
+        """
+        self.client = client
+        self.states = tuple(states)
+        self.slice_seconds = slice_hours * 3600
+        self.min_slice_seconds = min_slice_minutes * 60
+        self.max_slice_seconds = max_slice_hours * 3600
+        self.max_workers = max_workers
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.checkpoint = CheckpointStore(checkpoint_path) if checkpoint_path else None
+        self.progress_interval = progress_interval
+
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        """清空扫描进度"""
+        # 项目代码 -> {'cursor': 下一个时间片的开始时间戳, 'size': 当前时间片长度}
+        self._cursors: Dict[int, Dict] = {}
+        # 待扫描的时间片（拆分出来的或从检查点恢复的）：[项目代码, 开始, 结束, 已尝试次数]
+        self._queue: Deque[List] = deque()
+        self._in_flight: List[List] = []
+        self._found: Dict[int, Dict] = {}
+        self._covered = 0.0
+        self._slices_done = 0
+        self._failed_slices: List[List] = []
+        self._total = 0.0
+        self._round_robin = 0
+
+    @classmethod
+    def parse_date(cls, value: str) -> float:
+        """
+        解析日期字符串（yyyy-MM-dd HH:mm:ss 或 yyyy-MM-dd）
+
+        Args:
+            value: 日期字符串
+
+        Returns:
+            时间戳
+        """
+        for fmt in (cls.DATE_FORMAT, '%Y-%m-%d'):
+            try:
+                return datetime.strptime(value, fmt).timestamp()
+            except ValueError:
+                continue
+
+        raise ValueError(f"Invalid date: {value}")
+
+    @classmethod
+    def format_date(cls, timestamp: float) -> str:
+        """把时间戳格式化为 API 使用的日期字符串"""
+        return datetime.fromtimestamp(timestamp).strftime(cls.DATE_FORMAT)
+
+    def _next_slice(self, end: float) -> Optional[List]:
+        """
+        取出下一个待扫描的时间片（优先处理拆分出来的时间片，其次按项目轮流推进）
+
+        Args:
+            end: 扫描范围的结束时间戳
+
+        Returns:
+            时间片，全部分配完时返回 None
+        """
+        if self._queue:
+            return self._queue.popleft()
+
+        projects = [code for code, cursor in self._cursors.items() if cursor['cursor'] < end]
+        if not projects:
+            return None
+
+        project_code = projects[self._round_robin % len(projects)]
+        self._round_robin += 1
+
+        cursor = self._cursors[project_code]
+        slice_start = cursor['cursor']
+        slice_end = min(slice_start + cursor['size'], end)
+        cursor['cursor'] = slice_end
+
+        return [project_code, slice_start, slice_end, 0]
+
+    def _scan_slice(self, time_slice: List) -> Optional[Dict]:
+        """
+        扫描一个时间片
+
+        Args:
+            time_slice: [项目代码, 开始, 结束, 已尝试次数]
+
+        Returns:
+            {'items': 实例列表, 'total': 实例总数}，结果超过页数上限需要拆分时返回 None
+        """
+        project_code, slice_start, slice_end, _ = time_slice
+        filters = {
+            'start_date': self.format_date(slice_start),
+            'end_date': self.format_date(slice_end)
+        }
+        can_split = slice_end - slice_start >= 2 * self.min_slice_seconds
+
+        items = []
+        total = 0
+        for state in self.states:
+            page = self.client.get_workflow_instance_page(
+                project_code=project_code, page_no=1, page_size=self.page_size, state_type=state, **filters
+            )
+            if page is None:
+                raise RuntimeError(f"Failed to query {state} instances")
+
+            if can_split and page['total'] > self.page_size * self.max_pages:
+                return None
+
+            total += page['total']
+            items.extend(page['items'])
+
+            # 达到最小时间片长度时不再拆分，完整分页获取
+            page_no = 2
+            while (page_no - 1) * self.page_size < page['total']:
+                next_page = self.client.get_workflow_instance_page(
+                    project_code=project_code, page_no=page_no, page_size=self.page_size,
+                    state_type=state, **filters
+                )
+                if next_page is None:
+                    raise RuntimeError(f"Failed to query {state} instances (page {page_no})")
+                if not next_page['items']:
+                    break
+                items.extend(next_page['items'])
+                page_no += 1
+
+        return {'items': items, 'total': total}
+
+    def _complete(self, time_slice: List, result: Optional[Dict]):
+        """
+        记录时间片的扫描结果，并根据结果密度调整该项目后续时间片的长度
+
+        Args:
+            time_slice: 时间片
+            result: 扫描结果（None 表示需要拆分）
+        """
+        project_code, slice_start, slice_end, _ = time_slice
+        cursor = self._cursors[project_code]
+
+        if result is None:
+            middle = slice_start + (slice_end - slice_start) / 2
+            self._queue.appendleft([project_code, middle, slice_end, 0])
+            self._queue.appendleft([project_code, slice_start, middle, 0])
+            cursor['size'] = max(self.min_slice_seconds, min(cursor['size'], slice_end - slice_start) / 2)
+            return
+
+        for workflow in result['items']:
+            self._found[workflow.get('id')] = {'project_code': project_code, 'workflow': workflow}
+
+        self._covered += slice_end - slice_start
+        self._slices_done += 1
+
+        # 结果稀疏时合并（后续时间片加倍），接近页数上限时缩小
+        if result['total'] <= self.page_size // 4:
+            cursor['size'] = min(self.max_slice_seconds, cursor['size'] * 2)
+        elif result['total'] > self.page_size * self.max_pages // 2:
+            cursor['size'] = max(self.min_slice_seconds, cursor['size'] / 2)
+
+    def _fail(self, time_slice: List, error: Exception):
+        """
+        处理扫描失败的时间片（重新排队，超过最大尝试次数后放弃本次扫描，保留在检查点中下次再扫）
+
+        Args:
+            time_slice: 时间片
+            error: 异常
+        """
+        time_slice = time_slice[:3] + [time_slice[3] + 1]
+        if time_slice[3] < self.MAX_SLICE_ATTEMPTS:
+            self._queue.append(time_slice)
+            return
+
+        logger.error(
+            "Giving up backfill slice %s - %s of project %s: %s",
+            self.format_date(time_slice[1]), self.format_date(time_slice[2]), time_slice[0], error
+        )
+        self._failed_slices.append(time_slice)
+
+    def failed_slices(self) -> List[Dict]:
+        """
+        获取最近一次扫描中放弃的时间片（这些时间片中的失败工作流没有被找到）
+
+        Returns:
+            [{'project_code': 项目代码, 'start_date': 开始日期, 'end_date': 结束日期}]
+        """
+        with self._lock:
+            return [
+                {
+                    'project_code': project_code,
+                    'start_date': self.format_date(slice_start),
+                    'end_date': self.format_date(slice_end)
+                }
+                for project_code, slice_start, slice_end, _ in self._failed_slices
+            ]
+
+    def progress(self) -> Dict:
+        """
+        获取扫描进度
+
+        Returns:
+            进度字典
+        """
+        with self._lock:
+            return {
+                'percent': round(100 * self._covered / self._total, 1) if self._total else 100.0,
+                'slices_done': self._slices_done,
+                'slices_in_flight': len(self._in_flight),
+                'slices_queued': len(self._queue),
+                'slices_failed': len(self._failed_slices),
+                'failed_workflows': len(self._found)
+            }
+
+    def _save_checkpoint(self, project_codes: List[int], start_date: str, end_date: str):
+        """保存时间片检查点（进行中的和放弃的时间片作为待扫描时间片保存）"""
+        if not self.checkpoint:
+            return
+
+        with self._lock:
+            self.checkpoint.save({
+                'project_codes': list(project_codes),
+                'start_date': start_date,
+                'end_date': end_date,
+                'cursors': {str(code): dict(cursor) for code, cursor in self._cursors.items()},
+                'queue': list(self._in_flight) + list(self._queue) + [
+                    time_slice[:3] + [0] for time_slice in self._failed_slices
+                ],
+                'found': list(self._found.values()),
+                'covered': self._covered,
+                'slices_done': self._slices_done
+            })
+
+    def _restore_checkpoint(self, project_codes: List[int], start_date: str, end_date: str) -> bool:
+        """
+        从检查点恢复扫描进度（扫描范围一致时才恢复）
+
+        Returns:
+            是否恢复成功
+        """
+        state = self.checkpoint.load() if self.checkpoint else None
+        if not state or (
+            state.get('project_codes') != list(project_codes)
+            or state.get('start_date') != start_date
+            or state.get('end_date') != end_date
+        ):
+            return False
+
+        self._cursors = {int(code): cursor for code, cursor in state.get('cursors', {}).items()}
+        self._queue = deque(state.get('queue', []))
+        self._found = {c['workflow'].get('id'): c for c in state.get('found', [])}
+        self._covered = state.get('covered', 0.0)
+        self._slices_done = state.get('slices_done', 0)
+
+        logger.info(
+            "Resuming backfill from checkpoint: %d slices done, %d failed workflows found",
+            self._slices_done, len(self._found)
+        )
+        return True
+
+    def scan(
+        self,
+        project_codes: List[int],
+        start_date: str,
+        end_date: str,
+        stop_event: Optional[threading.Event] = None
+    ) -> List[Dict]:
+        """
+        并发扫描时间范围内所有项目的失败工作流
+
+        Args:
+            project_codes: 项目代码列表
+            start_date: 开始日期
+            end_date: 结束日期
+            stop_event: 停止请求（可选，收到后保存检查点并返回已找到的结果）
+
+        Returns:
+            候选列表，元素为 {'project_code': 项目代码, 'workflow': 工作流实例}
+        """
+        start, end = self.parse_date(start_date), self.parse_date(end_date)
+
+        self._reset()
+        self._total = (end - start) * len(project_codes)
+        if not self._restore_checkpoint(project_codes, start_date, end_date):
+            self._cursors = {code: {'cursor': start, 'size': self.slice_seconds} for code in project_codes}
+
+        last_report = last_save = time.monotonic()
+        futures = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while not (stop_event and stop_event.is_set()):
+                with self._lock:
+                    while len(futures) < self.max_workers:
+                        time_slice = self._next_slice(end)
+                        if time_slice is None:
+                            break
+                        self._in_flight.append(time_slice)
+                        futures[executor.submit(self._scan_slice, time_slice)] = time_slice
+
+                if not futures:
+                    break
+
+                done, _ = wait(futures, timeout=1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    time_slice = futures.pop(future)
+                    with self._lock:
+                        self._in_flight.remove(time_slice)
+                        try:
+                            self._complete(time_slice, future.result())
+                        except Exception as e:
+                            self._fail(time_slice, e)
+
+                now = time.monotonic()
+                if now - last_report >= self.progress_interval:
+                    logger.info("Backfill progress: %s", self.progress(), extra={'event': 'backfill_progress'})
+                    last_report = now
+                if now - last_save >= self.progress_interval:
+                    self._save_checkpoint(project_codes, start_date, end_date)
+                    last_save = now
+
+            # 停止时丢弃进行中时间片的结果，这些时间片会保存在检查点中
+            for future in futures:
+                future.cancel()
+
+        if stop_event and stop_event.is_set():
+            self._save_checkpoint(project_codes, start_date, end_date)
+            logger.info("Backfill interrupted, progress saved: %s", self.progress())
+        elif self._failed_slices:
+            # 放弃的时间片没有扫描，保留检查点，下次使用相同的范围运行时只重新扫描这些时间片
+            self._save_checkpoint(project_codes, start_date, end_date)
+            logger.warning(
+                "Backfill finished with %d failed slices, kept in checkpoint: %s",
+                len(self._failed_slices), self.failed_slices()
+            )
+        else:
+            if self.checkpoint:
+                self.checkpoint.clear()
+            logger.info("Backfill finished: %s", self.progress())
+
+        return list(self._found.values())
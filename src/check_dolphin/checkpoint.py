@@ -0,0 +1,71 @@
+"""
+Checkpoint Storage
+监控进度检查点的持久化（用于优雅停止后的断点恢复）
+"""
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointStore:
+    """基于 JSON 文件的检查点存储（原子写入）"""
+
+    def __init__(self, path: str):
+        """
+        初始化检查点存储
+
+        Args:
+            path: 检查点文件路径
+        """
+        self.path = Path(path)
+
+    def save(self, state: Dict):
+        """
+        保存检查点（先写临时文件再原子替换，避免进程被杀时写出半个文件）
+
+        Args:
+            state: 检查点内容
+        """
+        state = dict(state, saved_at=time.time())
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error("Failed to save checkpoint %s: %s", self.path, e)
+
+    def load(self) -> Optional[Dict]:
+        """
+        加载检查点
+
+        Returns:
+            检查点内容，文件不存在或损坏时返回 None
+        """
+        if not self.path.exists():
+            return None
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable checkpoint %s: %s", self.path, e)
+            return None
+
+    def clear(self):
+        """删除检查点文件（任务完成后不再需要恢复）"""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error("Failed to remove checkpoint %s: %s", self.path, e)
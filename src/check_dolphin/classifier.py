@@ -0,0 +1,264 @@
+"""
+Failure Classifier
+根据失败任务日志末尾的内容识别不会因重试而成功的永久性失败
+"""
+
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from .api_client import DolphinSchedulerClient
+
+
+logger = logging.getLogger(__name__)
+
+
+class FailureClassifier:
+    """失败分类器（每个任务实例的日志只获取一次，分类结果按任务实例缓存）"""
+
+    CLASS_PERMANENT = 'permanent'
+    CLASS_TRANSIENT = 'transient'
+    CLASS_UNKNOWN = 'unknown'
+
+    # 定位日志末尾时探测的最大行号（接口忽略 skipLineNum 时总是返回内容，避免无限探测）
+    MAX_LOG_LINES = 10 ** 8
+
+    # 默认的永久性失败特征（SQL 语法错误、表不存在、权限不足等）
+    DEFAULT_PERMANENT_PATTERNS = [
+        r'syntax error',
+        r'ParseException',
+        r'SemanticException',
+        r'Table (?:or view )?not found',
+        r'table .* does(?: not|n\'t) exist',
+        r'Unknown column',
+        r'Permission denied',
+        r'AccessControlException',
+        r'Access denied for user',
+        r'ClassNotFoundException',
+        r'No such file or directory'
+    ]
+
+    # 默认的临时性失败特征（匹配时即使同时命中永久性特征也允许重试）
+    DEFAULT_TRANSIENT_PATTERNS = [
+        r'Connection (?:refused|reset|timed out)',
+        r'SocketTimeoutException',
+        r'Too many connections',
+        r'OutOfMemoryError',
+        r'Container killed'
+    ]
+
+    def __init__(
+        self,
+        client: DolphinSchedulerClient,
+        permanent_patterns: Optional[List[str]] = None,
+        transient_patterns: Optional[List[str]] = None,
+        tail_lines: int = 200,
+        chunk_lines: int = 1000,
+        cache_size: int = 10000
+    ):
+        """
+        初始化失败分类器
+
+        Args:
+            client: DolphinScheduler API 客户端
+            permanent_patterns: 永久性失败的正则表达式列表（不区分大小写）
+            transient_patterns: 临时性失败的正则表达式列表（优先于永久性失败）
+            tail_lines: 参与匹配的日志末尾行数
+            chunk_lines: 定位日志末尾时的初始探测步长（行）
+            cache_size: 分类结果缓存的最大任务实例数
+        """
+        self.client = client
+        self.tail_lines = tail_lines
+        self.chunk_lines = chunk_lines
+        self.cache_size = cache_size
+
+        self.permanent_patterns = permanent_patterns or self.DEFAULT_PERMANENT_PATTERNS
+        self.transient_patterns = (
+            self.DEFAULT_TRANSIENT_PATTERNS if transient_patterns is None else transient_patterns
+        )
+        self._permanent = self._compile(self.permanent_patterns)
+        self._transient = self._compile(self.transient_patterns)
+
+        # 任务实例 ID -> (分类, 命中的特征)
+        self._cache: 'OrderedDict[int, Tuple[str, str]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _compile(patterns: List[str]) -> Optional['re.Pattern']:
+        """把一组特征编译为一个正则表达式，一次扫描即可判断是否命中"""
+        if not patterns:
+            return None
+
+        return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns), re.IGNORECASE)
+
+    def _read_lines(
+        self,
+        task_instance_id: int,
+        skip: int,
+        limit: int,
+        project_code: Optional[int] = None
+    ) -> Optional[List[str]]:
+        """读取日志的 [skip, skip + limit) 行，获取失败时返回 None"""
+        # 一次请求读取：分块拼接时，块末尾的空行可能不计入 splitlines，导致行错位
+        content = self.client.get_task_log(
+            task_instance_id, skip_line_num=skip, limit=limit, project_code=project_code
+        )
+        return None if content is None else content.splitlines()
+
+    def _count_lines(self, task_instance_id: int, known: int, project_code: Optional[int] = None) -> Optional[int]:
+        """
+        定位日志的总行数（日志接口不返回总行数：先按倍数跳跃越过末尾，再二分查找）
+
+        每次探测读取两行：单个空行的返回内容为空，与日志末尾无法区分，两行中至少有一个换行符。
+        只有最后一行是空行时会少计一行，不影响末尾内容。
+
+        Args:
+            task_instance_id: 任务实例 ID
+            known: 已知存在的行数
+            project_code: 任务所属的项目代码（可选）
+
+        Returns:
+            日志总行数，获取失败时返回 None
+        """
+        def exists(line: int) -> Optional[bool]:
+            content = self.client.get_task_log(
+                task_instance_id, skip_line_num=line, limit=2, project_code=project_code
+            )
+            return None if content is None else bool(content)
+
+        # 大多数日志很短，已知的行之后没有内容
+        found = exists(known)
+        if not found:
+            return None if found is None else known
+
+        # low 行一定存在，第 high 行（从 1 开始计数）一定不存在
+        low = known + 1
+        high = low + max(self.chunk_lines, 1)
+        while high <= self.MAX_LOG_LINES:
+            found = exists(high - 1)
+            if found is None:
+                return None
+            if not found:
+                break
+            low, high = high, high * 2
+        else:
+            return low
+
+        while high - low > 1:
+            middle = (low + high) // 2
+            found = exists(middle - 1)
+            if found is None:
+                return None
+            if found:
+                low = middle
+            else:
+                high = middle
+
+        return low
+
+    def fetch_log_tail(self, task_instance_id: int, project_code: Optional[int] = None) -> Optional[str]:
+        """
+        只读取任务日志末尾的 tail_lines 行（较长的日志先定位总行数，不下载前面的内容）
+
+        Args:
+            task_instance_id: 任务实例 ID
+            project_code: 任务所属的项目代码（可选，用于按项目选择凭据）
+
+        Returns:
+            日志末尾内容，获取失败时返回 None
+        """
+        head = self._read_lines(task_instance_id, 0, self.tail_lines, project_code)
+        if head is None:
+            return None
+
+        total = self._count_lines(task_instance_id, len(head), project_code)
+        if total is None:
+            return None
+        if total <= self.tail_lines:
+            return '\n'.join(head)
+
+        tail = self._read_lines(task_instance_id, total - self.tail_lines, self.tail_lines, project_code)
+        return None if tail is None else '\n'.join(tail)
+
+    def classify_log(self, log_text: str) -> Tuple[str, str]:
+        """
+        根据日志内容分类
+
+        Args:
+            log_text: 日志内容
+
+        Returns:
+            (分类, 命中的日志片段)
+        """
+        if self._transient:
+            match = self._transient.search(log_text)
+            if match:
+                return self.CLASS_TRANSIENT, match.group(0)
+
+        if self._permanent:
+            match = self._permanent.search(log_text)
+            if match:
+                return self.CLASS_PERMANENT, match.group(0)
+
+        return self.CLASS_UNKNOWN, ''
+
+    def classify_task(self, task: Dict, project_code: Optional[int] = None) -> Tuple[str, str]:
+        """
+        对失败的任务实例分类（结果按任务实例缓存，同一日志不会获取两次）
+
+        Args:
+            task: 任务实例信息
+            project_code: 任务所属的项目代码（可选，用于按项目选择凭据）
+
+        Returns:
+            (分类, 命中的日志片段)
+        """
+        task_id = task.get('id')
+
+        with self._lock:
+            if task_id in self._cache:
+                self._cache.move_to_end(task_id)
+                return self._cache[task_id]
+
+        log_text = self.fetch_log_tail(task_id, project_code)
+        if log_text is None:
+            # 获取失败时不缓存，下次再试
+            return self.CLASS_UNKNOWN, ''
+
+        result = self.classify_log(log_text)
+
+        with self._lock:
+            self._cache[task_id] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return result
+
+    def find_permanent_failure(
+        self,
+        tasks: List[Dict],
+        failed_states: set,
+        project_code: Optional[int] = None
+    ) -> Optional[str]:
+        """
+        检查失败任务中是否存在永久性失败
+
+        Args:
+            tasks: 任务实例列表
+            failed_states: 任务失败状态集合
+            project_code: 任务所属的项目代码（可选，用于按项目选择凭据）
+
+        Returns:
+            永久性失败的说明，不存在时返回 None
+        """
+        for task in tasks:
+            if task.get('state') not in failed_states:
+                continue
+
+            classification, evidence = self.classify_task(task, project_code)
+            if classification == self.CLASS_PERMANENT:
+                return f"Task {task.get('name', 'Unknown')} failed permanently: {evidence}"
+
+        return None
@@ -4,13 +4,31 @@ Command Line Interface
 """
 
 import argparse
+import atexit
+import json
 import logging
+import os
+import signal
 import sys
+import threading
 from pathlib import Path
 
+from .admission import AdmissionController
+from .backfill import BackfillScanner
+from .classifier import FailureClassifier
+from .client_pool import ClientPool
 from .config import Config
+from .memory import MemoryDiagnostics
+from .logging_utils import configure_logging, stop_logging
 from .api_client import DolphinSchedulerClient
+from .api_server import MonitorAPIServer
 from .monitor import WorkflowMonitor
+from .notifier import Notifier
+from .outcomes import OutcomeTracker
+from .planner import RetryPlanner
+from .status import StatusBoard, StatusWriter, run_status
+from .subworkflows import SubWorkflowInspector
+from .transport import RecordingTransport, ReplayTransport
 
 
 def setup_logging(config: Config):
@@ -20,20 +38,107 @@ def setup_logging(config: Config):
     Args:
         config: 配置对象
     """
-    log_level = config.get('logging.level', 'INFO')
-    log_format = config.get('logging.format', '%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    log_file = config.get('logging.file', '')
+    configure_logging(
+        level=config.get('logging.level', 'INFO'),
+        log_format=config.get('logging.format', '%(asctime)s - %(name)s - %(levelname)s - %(message)s'),
+        log_file=config.get('logging.file', ''),
+        json_format=config.get('logging.json', False),
+        max_bytes=config.get('logging.max_bytes', 0),
+        backup_count=config.get('logging.backup_count', 5),
+        sampling=config.get('logging.sampling', {}),
+        default_sample_rate=config.get('logging.default_sample_rate', 1.0),
+        rate_limit=config.get('logging.rate_limit', 0)
+    )
+
+
+def create_client(config: Config) -> DolphinSchedulerClient:
+    """
+    根据配置创建 API 客户端
 
-    logging_config = {
-        'level': getattr(logging, log_level.upper(), logging.INFO),
-        'format': log_format
+    Args:
+        config: 配置对象
+
+    Returns:
+        DolphinScheduler API 客户端（配置了按项目的凭据时返回接口相同的客户端池）
+    """
+    credentials = config.get('dolphinscheduler.credentials') or []
+
+    # 录制真实会话的 API 流量，或离线回放录制的归档
+    transport = None
+    if config.get('dolphinscheduler.replay_file'):
+        transport = ReplayTransport(
+            path=config.get('dolphinscheduler.replay_file'),
+            speed=config.get('dolphinscheduler.replay_speed', 1.0)
+        )
+    elif config.get('dolphinscheduler.record_file'):
+        transport = RecordingTransport(
+            path=config.get('dolphinscheduler.record_file'),
+            secrets=[config.get('dolphinscheduler.token')] + [
+                ClientPool.credential_token(credential) for credential in credentials
+            ]
+        )
+    if transport:
+        atexit.register(transport.close)
+
+    client_options = {
+        'timeout': config.get('dolphinscheduler.timeout', 30),
+        'conditional_requests': config.get('dolphinscheduler.conditional_requests', True),
+        'coalesce_requests': config.get('dolphinscheduler.coalesce_requests', True),
+        'transport': transport,
+        'max_cached_responses': config.get('memory.max_cached_responses', 10000)
     }
 
-    if log_file:
-        logging_config['filename'] = log_file
-        logging_config['filemode'] = 'a'
+    # 按项目映射的令牌：每个凭据独立的连接池和请求速率预算
+    if credentials:
+        try:
+            return ClientPool.from_config(
+                base_url=config.get('dolphinscheduler.base_url'),
+                token=config.get('dolphinscheduler.token'),
+                credentials=credentials,
+                max_connections=config.get('dolphinscheduler.max_connections', 10),
+                rate_limit=config.get('dolphinscheduler.rate_limit', 0),
+                **client_options
+            )
+        except ValueError as e:
+            logging.getLogger(__name__).error("Invalid dolphinscheduler.credentials: %s", e)
+            sys.exit(1)
+
+    return DolphinSchedulerClient(
+        base_url=config.get('dolphinscheduler.base_url'),
+        token=config.get('dolphinscheduler.token'),
+        **client_options
+    )
+
+
+def install_shutdown_handlers(monitor: WorkflowMonitor, shutdown_timeout: float):
+    """
+    安装 SIGTERM/SIGINT 处理函数：请求监控器停止，并在超时后强制保存检查点退出
+
+    Args:
+        monitor: 工作流监控器
+        shutdown_timeout: 等待进行中的请求完成的最长时间（秒）
+    """
+    logger = logging.getLogger(__name__)
+
+    def force_exit():
+        logger.error("Shutdown deadline of %s seconds exceeded, forcing exit", shutdown_timeout)
+        monitor.save_checkpoint()
+        stop_logging()
+        os._exit(1)
+
+    def handle_signal(signum, frame):
+        if monitor.shutdown_event.is_set():
+            return
 
-    logging.basicConfig(**logging_config)
+        logger.info("Received signal %s, shutting down", signal.Signals(signum).name)
+        monitor.request_shutdown()
+
+        watchdog = threading.Timer(shutdown_timeout, force_exit)
+        watchdog.daemon = True
+        watchdog.start()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
 
 
 def command_monitor(args, config: Config):
@@ -47,27 +152,144 @@ def command_monitor(args, config: Config):
     logger = logging.getLogger(__name__)
 
     # 创建客户端
-    client = DolphinSchedulerClient(
-        base_url=config.get('dolphinscheduler.base_url'),
-        token=config.get('dolphinscheduler.token'),
-        timeout=config.get('dolphinscheduler.timeout', 30)
-    )
+    client = create_client(config)
 
     # 创建监控器
-    monitor = WorkflowMonitor(
-        client=client,
-        max_retry_count=config.get('monitor.max_retry_count', 3),
-        retry_interval=config.get('monitor.retry_interval', 60),
-        check_interval=config.get('monitor.check_interval', 300)
-    )
+    try:
+        monitor = WorkflowMonitor(
+            client=client,
+            max_retry_count=config.get('monitor.max_retry_count', 3),
+            retry_interval=config.get('monitor.retry_interval', 60),
+            check_interval=config.get('monitor.check_interval', 300),
+            checkpoint_path=config.get('monitor.checkpoint_file') or None,
+            state_path=config.get('monitor.state_file') or None,
+            ramp_up_window=config.get('monitor.ramp_up_window', 0),
+            recovery=config.get('recovery', {}),
+            dependency_aware=config.get('monitor.dependency_aware', False),
+            dependency_max_hold=config.get('monitor.dependency_max_hold', 3600),
+            priority=config.get('priority'),
+            max_retries_per_cycle=config.get('monitor.max_retries_per_cycle', 0),
+            policies=config.get('policies'),
+            max_tracked_instances=config.get('memory.max_tracked_instances', 50000)
+        )
+    except ValueError as e:
+        logger.error("Invalid monitor configuration: %s", e)
+        sys.exit(1)
 
-    # 获取项目代码
+    # 递归验证 SUB_PROCESS 任务的子工作流
+    if config.get('monitor.sub_workflow_depth', 0) > 0:
+        monitor.sub_workflows = SubWorkflowInspector(
+            client=client,
+            max_depth=config.get('monitor.sub_workflow_depth'),
+            max_workers=config.get('monitor.max_workers', 8)
+        )
+
+    # 跟踪重试结果（需要在加载热启动缓存之前创建，以便恢复历史成功率）
+    if config.get('outcomes.enabled', False):
+        monitor.outcomes = OutcomeTracker(
+            client=client,
+            poll_interval=config.get('outcomes.poll_interval', 60),
+            max_poll_interval=config.get('outcomes.max_poll_interval', 1800),
+            backoff=config.get('outcomes.backoff', 2),
+            batch_size=config.get('outcomes.batch_size', 100),
+            min_attempts=config.get('outcomes.min_attempts', 3),
+            min_success_rate=config.get('outcomes.min_success_rate', 0),
+            half_life=config.get('outcomes.half_life', 86400),
+            max_entries=config.get('memory.max_tracked_instances', 50000)
+        )
+
+    # 热启动：加载上次退出时保存的缓存
+    monitor.load_state()
+
+    # 获取项目代码（未配置代码时按项目名称解析）
     project_codes = args.projects or config.get('projects.codes', [])
+    if not project_codes and config.get('projects.names'):
+        project_codes = monitor.resolve_project_codes(config.get('projects.names'))
+
+    # 根据任务日志识别永久性失败
+    if config.get('classifier.enabled', False):
+        monitor.classifier = FailureClassifier(
+            client=client,
+            permanent_patterns=config.get('classifier.permanent_patterns'),
+            transient_patterns=config.get('classifier.transient_patterns'),
+            tail_lines=config.get('classifier.tail_lines', 200)
+        )
+
+    # 集群负载准入控制
+    if config.get('admission.enabled', False):
+        monitor.admission = AdmissionController(
+            client=client,
+            project_codes=project_codes,
+            max_cpu_usage=config.get('admission.max_cpu_usage', 0.85),
+            max_memory_usage=config.get('admission.max_memory_usage', 0.85),
+            max_load_average=config.get('admission.max_load_average', 0),
+            max_running_instances=config.get('admission.max_running_instances', 0),
+            cache_ttl=config.get('admission.cache_ttl', 30),
+            poll_interval=config.get('admission.poll_interval', 30),
+            max_wait=config.get('admission.max_wait', 300)
+        )
 
     if not project_codes:
         logger.error("No project codes specified. Use --projects or set in config file.")
         sys.exit(1)
 
+    # 大时间范围按时间片并发回溯扫描
+    if args.backfill:
+        if not (args.start_date and args.end_date):
+            logger.error("--backfill requires --start-date and --end-date")
+            sys.exit(1)
+
+        monitor.backfill = BackfillScanner(
+            client=client,
+            states=sorted(WorkflowMonitor.FAILED_STATES),
+            slice_hours=config.get('backfill.slice_hours', 24),
+            min_slice_minutes=config.get('backfill.min_slice_minutes', 15),
+            max_slice_hours=config.get('backfill.max_slice_hours', 168),
+            max_workers=args.workers or config.get('backfill.max_workers', 8),
+            page_size=config.get('backfill.page_size', 100),
+            max_pages=config.get('backfill.max_pages', 5),
+            checkpoint_path=config.get('backfill.checkpoint_file') or None,
+            progress_interval=config.get('backfill.progress_interval', 10)
+        )
+
+    # 仅生成重试计划（不执行重试）
+    if args.plan:
+        command_plan(args, config, monitor, project_codes)
+        return
+
+    # 异步通知（按时间窗口合并为摘要消息）
+    if config.get('notification.enabled', False) and config.get('notification.webhook_url'):
+        monitor.notifier = Notifier(
+            webhook_url=config.get('notification.webhook_url'),
+            window=config.get('notification.window', 60),
+            events=config.get('notification.events'),
+            max_items=config.get('notification.max_items', 20),
+            max_attempts=config.get('notification.max_attempts', 3),
+            timeout=config.get('notification.timeout', 10)
+        )
+        monitor.notifier.start()
+
+    # 内存诊断：收到 SIGUSR1 时输出 RSS、各结构大小和 tracemalloc 分配热点
+    diagnostics = MemoryDiagnostics(top=config.get('memory.top_allocations', 10))
+    diagnostics.register_all(monitor.memory_structures())
+    if config.get('memory.tracemalloc', False):
+        diagnostics.start_tracing(config.get('memory.tracemalloc_frames', 1))
+    diagnostics.install_signal_handler()
+
+    # 本地 HTTP 查询/控制接口（读取监控器的内存状态）
+    api_server = None
+    if config.get('api.enabled', False):
+        api_server = MonitorAPIServer(
+            monitor=monitor,
+            host=config.get('api.host', '127.0.0.1'),
+            port=config.get('api.port', 8080),
+            token=config.get('api.token') or None,
+            diagnostics=diagnostics
+        )
+        api_server.start()
+
+    install_shutdown_handlers(monitor, config.get('monitor.shutdown_timeout', 30))
+
     # 开始监控
     try:
         monitor.monitor_and_retry(
@@ -80,12 +302,63 @@ def command_monitor(args, config: Config):
         # 输出统计信息
         stats = monitor.get_retry_statistics()
         logger.info(f"Retry statistics: {stats}")
+        logger.info("Transfer statistics: %s", client.get_transfer_stats())
+        logger.info("Request coalescing statistics: %s", client.get_coalescing_stats())
+        if isinstance(client, ClientPool):
+            logger.info("Rate limit statistics: %s", client.get_rate_stats())
+
+        # 回溯扫描有放弃的时间片时结果不完整，以非零状态退出
+        failed_slices = monitor.backfill.failed_slices() if monitor.backfill else []
+        if failed_slices:
+            logger.error(
+                "Backfill incomplete, %d slices failed and were kept in checkpoint: %s",
+                len(failed_slices), failed_slices
+            )
+            sys.exit(1)
 
     except KeyboardInterrupt:
         logger.info("Monitoring stopped by user")
     except Exception as e:
         logger.error(f"Error during monitoring: {str(e)}", exc_info=True)
         sys.exit(1)
+    finally:
+        if api_server:
+            api_server.stop()
+        if monitor.notifier:
+            monitor.notifier.stop(timeout=config.get('notification.timeout', 10))
+            logger.info("Notification statistics: %s", monitor.notifier.get_stats())
+
+
+def command_plan(args, config: Config, monitor: WorkflowMonitor, project_codes: list):
+    """
+    生成重试计划（dry-run，不调用 executors/execute）
+
+    Args:
+        args: 命令行参数
+        config: 配置对象
+        monitor: 工作流监控器
+        project_codes: 项目代码列表
+    """
+    # 与真实运行一致：已达到最大重试次数的实例不计入重试
+    monitor.restore_retry_records()
+
+    planner = RetryPlanner(
+        monitor=monitor,
+        max_workers=args.workers or config.get('monitor.max_workers', 8)
+    )
+
+    plan = planner.build_plan(
+        project_codes=project_codes,
+        start_date=args.start_date,
+        end_date=args.end_date
+    )
+    summary = planner.summarize(plan, project_count=len(project_codes))
+
+    if args.plan_output:
+        with open(args.plan_output, 'w', encoding='utf-8', newline='') as f:
+            planner.write_plan(plan, f, fmt=args.plan_format, summary=summary)
+    else:
+        planner.write_plan(plan, sys.stdout, fmt=args.plan_format, summary=summary)
 
 
 def command_status(args, config: Config):
@@ -99,15 +372,63 @@ def command_status(args, config: Config):
     logger = logging.getLogger(__name__)
 
     # 创建客户端
-    client = DolphinSchedulerClient(
-        base_url=config.get('dolphinscheduler.base_url'),
-        token=config.get('dolphinscheduler.token'),
-        timeout=config.get('dolphinscheduler.timeout', 30)
-    )
+    client = create_client(config)
 
     # 创建监控器
     monitor = WorkflowMonitor(client=client)
 
+    board = StatusBoard(
+        monitor=monitor,
+        max_workers=args.workers or config.get('monitor.max_workers', 8),
+        start_date=args.start_date,
+        end_date=args.end_date,
+        max_pages=args.max_pages
+    )
+
+    # 获取项目代码（未指定时按名称解析，仍然没有时查询所有可访问的项目）
+    project_codes = args.projects or config.get('projects.codes', [])
+    if not project_codes and config.get('projects.names'):
+        project_codes = monitor.resolve_project_codes(config.get('projects.names'))
+    if not project_codes:
+        project_codes = board.discover_project_codes()
+        logger.info("Discovered %d projects", len(project_codes))
+
+    if not project_codes:
+        logger.error("No projects found. Use --projects or set in config file.")
+        sys.exit(1)
+
+    # 按完成顺序流式输出，--watch 时持续刷新并只输出变化的行
+    try:
+        run_status(board, StatusWriter(sys.stdout, fmt=args.format), project_codes, watch=args.watch)
+    except KeyboardInterrupt:
+        pass
+
+
+def command_queue(args, config: Config):
+    """
+    显示当前的重试队列（按重试顺序，不执行重试）
+
+    Args:
+        args: 命令行参数
+        config: 配置对象
+    """
+    logger = logging.getLogger(__name__)
+
+    # 创建客户端
+    client = create_client(config)
+
+    # 创建监控器（只使用排序相关的配置）
+    try:
+        monitor = WorkflowMonitor(
+            client=client,
+            dependency_aware=config.get('monitor.dependency_aware', False),
+            dependency_max_hold=config.get('monitor.dependency_max_hold', 3600),
+            priority=config.get('priority')
+        )
+    except ValueError as e:
+        logger.error("Invalid monitor configuration: %s", e)
+        sys.exit(1)
+
     # 获取项目代码
     project_codes = args.projects or config.get('projects.codes', [])
 
@@ -115,12 +436,81 @@ def command_status(args, config: Config):
         logger.error("No project codes specified. Use --projects or set in config file.")
         sys.exit(1)
 
-    # 显示状态摘要
-    for project_code in project_codes:
-        logger.info(f"\nProject {project_code} status:")
-        summary = monitor.get_workflow_status_summary(project_code)
-        for state, count in summary.items():
-            logger.info(f"  {state}: {count}")
+    planner = RetryPlanner(monitor=monitor, max_workers=config.get('monitor.max_workers', 8))
+    candidates = planner.scan_candidates(project_codes)
+    queue, held = monitor.order_candidates(candidates)
+
+    rows = [
+        {
+            'position': position,
+            'project_code': candidate['project_code'],
+            'instance_id': candidate['workflow'].get('id'),
+            'name': candidate['workflow'].get('name', 'Unknown'),
+            'priority': candidate.get('priority', ''),
+            'held': held.get(candidate['workflow'].get('id'), '')
+        }
+        for position, candidate in enumerate(queue, start=1)
+    ]
+
+    if args.format == 'json':
+        json.dump(rows, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write('\n')
+        return
+
+    print(f"{'#':>4}  {'PROJECT':>15}  {'INSTANCE':>10}  {'PRIORITY':>8}  NAME")
+    for row in rows:
+        suffix = f"  (held: {row['held']})" if row['held'] else ''
+        print(
+            f"{row['position']:>4}  {row['project_code']:>15}  {row['instance_id']:>10}  "
+            f"{row['priority']!s:>8}  {row['name']}{suffix}"
+        )
+
+
+def command_policy(args, config: Config):
+    """
+    说明工作流命中的重试策略规则
+
+    Args:
+        args: 命令行参数
+        config: 配置对象
+    """
+    logger = logging.getLogger(__name__)
+
+    # 只用于解析策略，不会访问 API
+    try:
+        monitor = WorkflowMonitor(
+            client=None,
+            max_retry_count=config.get('monitor.max_retry_count', 3),
+            recovery=config.get('recovery', {}),
+            policies=config.get('policies') or {'rules': []}
+        )
+    except ValueError as e:
+        logger.error("Invalid retry policy: %s", e)
+        sys.exit(1)
+
+    explanation = monitor.policies.explain(args.project, args.workflow)
+    # 未配置的字段使用 monitor 的全局配置
+    policy = monitor.policy_for(args.project, args.workflow)
+    policy.pop('rule')
+    policy['recovery'] = monitor.recovery_mode_for(args.project, args.workflow)
+    explanation['policy'] = policy
+
+    if args.format == 'json':
+        json.dump(explanation, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write('\n')
+        return
+
+    if explanation['rule_index'] is None:
+        print(f"Workflow '{args.workflow}' in project {args.project} matches no rule, using defaults")
+    else:
+        rule = explanation['rule']
+        print(
+            f"Workflow '{args.workflow}' in project {args.project} matches rule #{explanation['rule_index']} "
+            f"({explanation['match_type']}: {rule[explanation['match_type']]!r}"
+            + (f", project {rule['project']}" if rule.get('project') is not None else '') + ")"
+        )
+    for key, value in explanation['policy'].items():
+        print(f"  {key}: {value}")
 
 
 def command_retry(args, config: Config):
@@ -134,16 +524,16 @@ def command_retry(args, config: Config):
     logger = logging.getLogger(__name__)
 
     # 创建客户端
-    client = DolphinSchedulerClient(
-        base_url=config.get('dolphinscheduler.base_url'),
-        token=config.get('dolphinscheduler.token'),
-        timeout=config.get('dolphinscheduler.timeout', 30)
-    )
+    client = create_client(config)
 
     # 执行重试
     success = client.retry_workflow_instance(
         project_code=args.project,
-        instance_id=args.instance_id
+        instance_id=args.instance_id,
+        execute_type=(
+            WorkflowMonitor.EXECUTE_FAILURE_TASK if args.failed_tasks
+            else WorkflowMonitor.EXECUTE_REPEAT_RUNNING
+        )
     )
 
     if success:
@@ -176,6 +566,21 @@ def main():
         '-c', '--config',
         help='Config file path (YAML or JSON)'
     )
+    parser.add_argument(
+        '--record',
+        metavar='FILE',
+        help='Record API traffic (tokens scrubbed) to this gzip archive'
+    )
+    parser.add_argument(
+        '--replay',
+        metavar='FILE',
+        help='Serve API traffic from a recorded archive instead of the network'
+    )
+    parser.add_argument(
+        '--replay-speed',
+        type=float,
+        help='Replay speed multiple (1 = recorded latency, 0 = no delay)'
+    )
 
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
 
@@ -200,15 +605,86 @@ def main():
         action='store_true',
         help='Run in continuous monitoring mode'
     )
+    monitor_parser.add_argument(
+        '--plan',
+        action='store_true',
+        help='Dry run: print the retry plan without retrying anything'
+    )
+    monitor_parser.add_argument(
+        '--plan-format',
+        choices=['json', 'csv'],
+        default='json',
+        help='Retry plan output format (default: json)'
+    )
+    monitor_parser.add_argument(
+        '--plan-output',
+        help='Write the retry plan to this file instead of stdout'
+    )
+    monitor_parser.add_argument(
+        '--backfill',
+        action='store_true',
+        help='Scan the --start-date/--end-date range in parallel time slices'
+    )
+    monitor_parser.add_argument(
+        '--workers',
+        type=int,
+        help='Number of concurrent API requests used by --plan and --backfill'
+    )
 
     # status 命令
     status_parser = subparsers.add_parser('status', help='Show workflow status summary')
     status_parser.add_argument(
+        '-p', '--projects',
+        type=int,
+        nargs='+',
+        help='Project codes to check (default: configured or all accessible projects)'
+    )
+    status_parser.add_argument(
+        '--format',
+        choices=['table', 'csv', 'json'],
+        default='table',
+        help='Output format, json is one object per line (default: table)'
+    )
+    status_parser.add_argument(
+        '--watch',
+        type=float,
+        default=0,
+        metavar='SECONDS',
+        help='Refresh every SECONDS and only redraw changed rows'
+    )
+    status_parser.add_argument(
+        '--workers',
+        type=int,
+        help='Number of projects fetched concurrently'
+    )
+    status_parser.add_argument(
+        '--start-date',
+        help='Only count instances started after this date (format: yyyy-MM-dd HH:mm:ss)'
+    )
+    status_parser.add_argument(
+        '--end-date',
+        help='Only count instances started before this date (format: yyyy-MM-dd HH:mm:ss)'
+    )
+    status_parser.add_argument(
+        '--max-pages',
+        type=int,
+        help='Maximum pages of instances counted per project (default: all)'
+    )
+
+    # queue 命令
+    queue_parser = subparsers.add_parser('queue', help='Show the current retry queue in retry order')
+    queue_parser.add_argument(
         '-p', '--projects',
         type=int,
         nargs='+',
         help='Project codes to check'
     )
+    queue_parser.add_argument(
+        '--format',
+        choices=['table', 'json'],
+        default='table',
+        help='Output format (default: table)'
+    )
 
     # retry 命令
     retry_parser = subparsers.add_parser('retry', help='Retry a specific workflow instance')
@@ -224,6 +700,31 @@ def main():
         required=True,
         help='Workflow instance ID to retry'
     )
+    retry_parser.add_argument(
+        '--failed-tasks',
+        action='store_true',
+        help='Only re-run failed tasks instead of the whole workflow'
+    )
+
+    # policy 命令
+    policy_parser = subparsers.add_parser('policy', help='Explain which retry policy rule matches a workflow')
+    policy_parser.add_argument(
+        '-p', '--project',
+        type=int,
+        required=True,
+        help='Project code'
+    )
+    policy_parser.add_argument(
+        '-w', '--workflow',
+        required=True,
+        help='Workflow name'
+    )
+    policy_parser.add_argument(
+        '--format',
+        choices=['text', 'json'],
+        default='text',
+        help='Output format (default: text)'
+    )
 
     # config 命令
     config_parser = subparsers.add_parser('config', help='Generate example config file')
@@ -247,6 +748,15 @@ def main():
     # 加载配置
     config = Config(args.config) if args.config else Config()
 
+    # 命令行指定的录制/回放参数覆盖配置文件
+    for key, value in (
+        ('record_file', args.record),
+        ('replay_file', args.replay),
+        ('replay_speed', args.replay_speed)
+    ):
+        if value is not None:
+            config.config.setdefault('dolphinscheduler', {})[key] = value
+
     # 设置日志
     setup_logging(config)
 
@@ -255,8 +765,12 @@ def main():
         command_monitor(args, config)
     elif args.command == 'status':
         command_status(args, config)
+    elif args.command == 'queue':
+        command_queue(args, config)
     elif args.command == 'retry':
         command_retry(args, config)
+    elif args.command == 'policy':
+        command_policy(args, config)
 
 
 if __name__ == '__main__':
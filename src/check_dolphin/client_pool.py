@@ -0,0 +1,270 @@
+"""
+Client Pool
+按项目使用不同令牌访问 DolphinScheduler：每个凭据有独立的连接池和请求速率预算，请求按项目代码路由
+"""
+
+import inspect
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .api_client import DolphinSchedulerClient
+
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """令牌桶速率限制（线程安全，令牌不足时阻塞等待）"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """
+        初始化速率限制
+
+        Args:
+            rate: 每秒允许的请求数
+            burst: 允许的突发请求数（默认等于每秒请求数，至少为 1）
+        """
+        self.rate = rate
+        self.burst = max(1, int(burst if burst is not None else rate))
+        self.waits = 0
+        self.waited_seconds = 0.0
+
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """获取一个令牌"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            # 预先扣除令牌，并发的调用依次排在后面等待
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            if delay:
+                self.waits += 1
+                self.waited_seconds += delay
+
+        if delay:
+            time.sleep(delay)
+
+    def get_stats(self) -> Dict:
+        """获取等待统计"""
+        with self._lock:
+            return {
+                'rate': self.rate,
+                'waits': self.waits,
+                'waited_seconds': round(self.waited_seconds, 3)
+            }
+
+
+class ClientPool:
+    """按项目路由的客户端池（接口与 DolphinSchedulerClient 相同）"""
+
+    DEFAULT_CREDENTIAL = 'default'
+
+    def __init__(self, default: DolphinSchedulerClient, clients: Optional[Dict[str, DolphinSchedulerClient]] = None):
+        """
+        初始化客户端池
+
+        Args:
+            default: 默认客户端（未映射的项目和与项目无关的请求）
+            clients: 凭据名称 -> 客户端
+        """
+        self.default = default
+        self.clients: Dict[str, DolphinSchedulerClient] = {self.DEFAULT_CREDENTIAL: default}
+        self.clients.update(clients or {})
+
+        # 项目代码 -> 凭据名称
+        self._routes: Dict[int, str] = {}
+        # 方法名称 -> 方法签名（用于找出调用中的 project_code 参数）
+        self._signatures: Dict[str, inspect.Signature] = {}
+
+    @staticmethod
+    def credential_token(credential: Dict) -> str:
+        """
+        获取凭据的令牌（直接配置的 token，或 token_env 指定的环境变量）
+
+        Args:
+            credential: 凭据配置
+
+        Returns:
+            令牌，没有配置时返回空字符串
+        """
+        return credential.get('token') or os.getenv(credential.get('token_env') or '', '')
+
+    @classmethod
+    def from_config(
+        cls,
+        base_url: str,
+        token: str,
+        credentials: List[Dict],
+        max_connections: int = 10,
+        rate_limit: float = 0,
+        **client_options
+    ) -> 'ClientPool':
+        """
+        根据凭据配置创建客户端池
+
+        Args:
+            base_url: DolphinScheduler API 基础 URL
+            token: 默认令牌
+            credentials: [{name, token 或 token_env, projects, max_connections, rate_limit}]
+            max_connections: 默认连接池大小
+            rate_limit: 默认每秒请求数（0 表示不限制）
+            **client_options: 其他客户端参数（timeout 等）
+
+        Returns:
+            客户端池
+
+        Raises:
+            ValueError: 凭据配置无效
+        """
+        def build(credential_token: str, connections: int, rate: float) -> DolphinSchedulerClient:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=connections, pool_maxsize=connections)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            return DolphinSchedulerClient(
+                base_url=base_url,
+                token=credential_token,
+                session=session,
+                rate_limiter=RateLimiter(rate) if rate else None,
+                **client_options
+            )
+
+        pool = cls(build(token, max_connections, rate_limit))
+
+        for index, credential in enumerate(credentials):
+            name = str(credential.get('name') or f"credential-{index}")
+            credential_token = cls.credential_token(credential)
+            if not credential_token:
+                raise ValueError(f"Credential {name} has no token (set token or token_env)")
+            if name in pool.clients:
+                raise ValueError(f"Duplicate credential name: {name}")
+
+            pool.clients[name] = build(
+                credential_token,
+                credential.get('max_connections', max_connections),
+                credential.get('rate_limit', rate_limit)
+            )
+            for project_code in credential.get('projects') or []:
+                pool.route(int(project_code), name)
+
+        return pool
+
+    def route(self, project_code: int, credential: str):
+        """
+        把项目映射到凭据
+
+        Args:
+            project_code: 项目代码
+            credential: 凭据名称
+        """
+        if credential not in self.clients:
+            raise ValueError(f"Unknown credential: {credential}")
+        if self._routes.get(project_code, credential) != credential:
+            logger.warning(
+                "Project %s is mapped to credentials %s and %s, using %s",
+                project_code, self._routes[project_code], credential, credential
+            )
+        self._routes[project_code] = credential
+
+    def client_for(self, project_code: Optional[int]) -> DolphinSchedulerClient:
+        """
+        获取访问项目使用的客户端
+
+        Args:
+            project_code: 项目代码（None 表示与项目无关的请求）
+
+        Returns:
+            客户端
+        """
+        if project_code is None:
+            return self.default
+        return self.clients[self._routes.get(int(project_code), self.DEFAULT_CREDENTIAL)]
+
+    def _project_code(self, name: str, args: tuple, kwargs: Dict) -> Optional[int]:
+        """从方法调用参数中找出项目代码"""
+        if 'project_code' in kwargs:
+            return kwargs['project_code']
+
+        signature = self._signatures.get(name)
+        if signature is None:
+            signature = inspect.signature(getattr(DolphinSchedulerClient, name))
+            self._signatures[name] = signature
+
+        try:
+            bound = signature.bind_partial(None, *args, **kwargs)
+        except TypeError:
+            return None
+        return bound.arguments.get('project_code')
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self.default, name)
+        if name.startswith('_') or not callable(attribute) or not hasattr(DolphinSchedulerClient, name):
+            return attribute
+
+        def call(*args, **kwargs):
+            client = self.client_for(self._project_code(name, args, kwargs))
+            return getattr(client, name)(*args, **kwargs)
+
+        call.__name__ = name
+        return call
+
+    def get_projects(self, page_no: int = 1, page_size: int = 100) -> Optional[List[Dict]]:
+        """
+        获取所有凭据可以访问的项目（按项目代码去重，未映射的项目路由到能访问它的凭据）
+
+        Args:
+            page_no: 页码
+            page_size: 每页大小
+
+        Returns:
+            项目列表
+        """
+        projects: Dict[Any, Dict] = {}
+        for name, client in self.clients.items():
+            for project in client.get_projects(page_no=page_no, page_size=page_size) or []:
+                code = project.get('code')
+                if code in projects:
+                    continue
+                projects[code] = project
+                if code is not None and name != self.DEFAULT_CREDENTIAL and int(code) not in self._routes:
+                    self._routes[int(code)] = name
+
+        return list(projects.values())
+
+    def _per_credential(self, getter: Callable[[DolphinSchedulerClient], Any]) -> Dict[str, Any]:
+        """按凭据汇总统计"""
+        return {name: getter(client) for name, client in self.clients.items()}
+
+    def get_transfer_stats(self) -> Dict:
+        """获取各凭据的传输统计"""
+        return self._per_credential(lambda client: client.get_transfer_stats())
+
+    def get_coalescing_stats(self) -> Dict:
+        """获取各凭据的请求合并统计"""
+        return self._per_credential(lambda client: client.get_coalescing_stats())
+
+    def get_rate_stats(self) -> Dict:
+        """获取各凭据的速率限制等待统计"""
+        return self._per_credential(
+            lambda client: client.rate_limiter.get_stats() if client.rate_limiter else None
+        )
+
+    def memory_structures(self) -> Dict[str, Callable[[], Any]]:
+        """列出各凭据客户端中常驻内存的结构（用于内存诊断）"""
+        structures = {}
+        for name, client in self.clients.items():
+            for key, getter in client.memory_structures().items():
+                structures[f"{key}[{name}]"] = getter
+        return structures
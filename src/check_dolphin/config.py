@@ -34,13 +34,63 @@ class Config:
             'dolphinscheduler': {
                 'base_url': os.getenv('DOLPHIN_BASE_URL', 'http://localhost:12345/dolphinscheduler'),
                 'token': os.getenv('DOLPHIN_TOKEN', ''),
-                'timeout': int(os.getenv('DOLPHIN_TIMEOUT', '30'))
+                'timeout': int(os.getenv('DOLPHIN_TIMEOUT', '30')),
+                'conditional_requests': os.getenv('DOLPHIN_CONDITIONAL_REQUESTS', 'true').lower() == 'true',
+                'coalesce_requests': os.getenv('DOLPHIN_COALESCE_REQUESTS', 'true').lower() == 'true',
+                'record_file': os.getenv('DOLPHIN_RECORD_FILE', ''),
+                'replay_file': os.getenv('DOLPHIN_REPLAY_FILE', ''),
+                'replay_speed': float(os.getenv('DOLPHIN_REPLAY_SPEED', '1'))
             },
             'monitor': {
                 'max_retry_count': int(os.getenv('MAX_RETRY_COUNT', '3')),
                 'retry_interval': int(os.getenv('RETRY_INTERVAL', '60')),
                 'check_interval': int(os.getenv('CHECK_INTERVAL', '300')),
-                'continuous': os.getenv('CONTINUOUS_MONITOR', 'false').lower() == 'true'
+                'continuous': os.getenv('CONTINUOUS_MONITOR', 'false').lower() == 'true',
+                'max_workers': int(os.getenv('MAX_WORKERS', '8')),
+                'checkpoint_file': os.getenv('CHECKPOINT_FILE', ''),
+                'shutdown_timeout': int(os.getenv('SHUTDOWN_TIMEOUT', '30')),
+                'state_file': os.getenv('STATE_FILE', ''),
+                'ramp_up_window': int(os.getenv('RAMP_UP_WINDOW', '0')),
+                'dependency_aware': os.getenv('DEPENDENCY_AWARE', 'false').lower() == 'true',
+                'max_retries_per_cycle': int(os.getenv('MAX_RETRIES_PER_CYCLE', '0')),
+                'sub_workflow_depth': int(os.getenv('SUB_WORKFLOW_DEPTH', '0'))
+            },
+            'admission': {
+                'enabled': os.getenv('ADMISSION_ENABLED', 'false').lower() == 'true',
+                'max_cpu_usage': float(os.getenv('ADMISSION_MAX_CPU_USAGE', '0.85')),
+                'max_memory_usage': float(os.getenv('ADMISSION_MAX_MEMORY_USAGE', '0.85')),
+                'max_running_instances': int(os.getenv('ADMISSION_MAX_RUNNING_INSTANCES', '0'))
+            },
+            'classifier': {
+                'enabled': os.getenv('CLASSIFIER_ENABLED', 'false').lower() == 'true'
+            },
+            'memory': {
+                'max_tracked_instances': int(os.getenv('MEMORY_MAX_TRACKED_INSTANCES', '50000')),
+                'max_cached_responses': int(os.getenv('MEMORY_MAX_CACHED_RESPONSES', '10000')),
+                'tracemalloc': os.getenv('MEMORY_TRACEMALLOC', 'false').lower() == 'true'
+            },
+            'api': {
+                'enabled': os.getenv('API_ENABLED', 'false').lower() == 'true',
+                'host': os.getenv('API_HOST', '127.0.0.1'),
+                'port': int(os.getenv('API_PORT', '8080')),
+                'token': os.getenv('API_TOKEN', '')
+            },
+            'backfill': {
+                'max_workers': int(os.getenv('BACKFILL_MAX_WORKERS', '8')),
+                'checkpoint_file': os.getenv('BACKFILL_CHECKPOINT_FILE', '')
+            },
+            'outcomes': {
+                'enabled': os.getenv('OUTCOMES_ENABLED', 'false').lower() == 'true',
+                'min_success_rate': float(os.getenv('OUTCOMES_MIN_SUCCESS_RATE', '0'))
+            },
+            'notification': {
+                'enabled': os.getenv('NOTIFICATION_ENABLED', 'false').lower() == 'true',
+                'webhook_url': os.getenv('NOTIFICATION_WEBHOOK_URL', ''),
+                'window': int(os.getenv('NOTIFICATION_WINDOW', '60'))
+            },
+            'recovery': {
+                'mode': os.getenv('RECOVERY_MODE', 'full'),
+                'auto_threshold': float(os.getenv('RECOVERY_AUTO_THRESHOLD', '0.5'))
             },
             'projects': {
                 'codes': self._parse_project_codes(os.getenv('PROJECT_CODES', ''))
@@ -48,7 +98,11 @@ class Config:
             'logging': {
                 'level': os.getenv('LOG_LEVEL', 'INFO'),
                 'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-                'file': os.getenv('LOG_FILE', '')
+                'file': os.getenv('LOG_FILE', ''),
+                'json': os.getenv('LOG_JSON', 'false').lower() == 'true',
+                'max_bytes': int(os.getenv('LOG_MAX_BYTES', '0')),
+                'backup_count': int(os.getenv('LOG_BACKUP_COUNT', '5')),
+                'rate_limit': int(os.getenv('LOG_RATE_LIMIT', '0'))
             }
         }
 
@@ -144,13 +198,117 @@ class Config:
             'dolphinscheduler': {
                 'base_url': 'http://localhost:12345/dolphinscheduler',
                 'token': 'your-api-token-here',
-                'timeout': 30
+                'timeout': 30,
+                'conditional_requests': True,
+                'coalesce_requests': True,
+                'record_file': '',
+                'replay_file': '',
+                'replay_speed': 1.0,
+                'max_connections': 10,
+                'rate_limit': 0,
+                'credentials': []
             },
             'monitor': {
                 'max_retry_count': 3,
                 'retry_interval': 60,
                 'check_interval': 300,
-                'continuous': False
+                'continuous': False,
+                'max_workers': 8,
+                'checkpoint_file': 'check_dolphin.checkpoint.json',
+                'shutdown_timeout': 30,
+                'state_file': 'check_dolphin.state.json',
+                'ramp_up_window': 120,
+                'dependency_aware': True,
+                'dependency_max_hold': 3600,
+                'max_retries_per_cycle': 0,
+                'sub_workflow_depth': 3
+            },
+            'admission': {
+                'enabled': False,
+                'max_cpu_usage': 0.85,
+                'max_memory_usage': 0.85,
+                'max_load_average': 0,
+                'max_running_instances': 200,
+                'cache_ttl': 30,
+                'poll_interval': 30,
+                'max_wait': 300
+            },
+            'memory': {
+                'max_tracked_instances': 50000,
+                'max_cached_responses': 10000,
+                'tracemalloc': False,
+                'tracemalloc_frames': 1,
+                'top_allocations': 10
+            },
+            'api': {
+                'enabled': False,
+                'host': '127.0.0.1',
+                'port': 8080,
+                'token': ''
+            },
+            'policies': {
+                'default': {
+                    'backoff': 0
+                },
+                'rules': [
+                    {'name': 'nightly_etl', 'max_retries': 5, 'backoff': 600},
+                    {'prefix': 'report_', 'recovery': 'failed_tasks', 'quiet_hours': '08:00-10:00'},
+                    {'regex': '.*_(tmp|test)', 'exclude': True}
+                ]
+            },
+            'backfill': {
+                'slice_hours': 24,
+                'min_slice_minutes': 15,
+                'max_slice_hours': 168,
+                'max_workers': 8,
+                'page_size': 100,
+                'max_pages': 5,
+                'checkpoint_file': 'check_dolphin.backfill.json',
+                'progress_interval': 10
+            },
+            'outcomes': {
+                'enabled': False,
+                'poll_interval': 60,
+                'max_poll_interval': 1800,
+                'backoff': 2,
+                'batch_size': 100,
+                'min_attempts': 3,
+                'min_success_rate': 0,
+                'half_life': 86400
+            },
+            'classifier': {
+                'enabled': False,
+                'tail_lines': 200,
+                'permanent_patterns': [
+                    'syntax error',
+                    'Table (?:or view )?not found',
+                    'Permission denied'
+                ],
+                'transient_patterns': [
+                    'Connection (?:refused|reset|timed out)'
+                ]
+            },
+            'priority': {
+                'default_weight': 1,
+                'sla_weight': 10,
+                'sla_horizon': 14400,
+                'cost_weight': 0,
+                'projects': {
+                    123456789: 5
+                },
+                'workflows': [
+                    {'pattern': 'report_*', 'weight': 10, 'sla': '06:00'}
+                ]
+            },
+            'recovery': {
+                'mode': 'full',
+                'auto_threshold': 0.5,
+                'projects': {
+                    123456789: 'auto'
+                },
+                'workflows': {
+                    'nightly_etl': 'failed_tasks'
+                }
             },
             'projects': {
                 'codes': [123456789, 987654321],
@@ -159,12 +317,25 @@ class Config:
             'logging': {
                 'level': 'INFO',
                 'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-                'file': 'check_dolphin.log'
+                'file': 'check_dolphin.log',
+                'json': False,
+                'max_bytes': 10485760,
+                'backup_count': 5,
+                'sampling': {
+                    'workflow_task_status': 0.1
+                },
+                'default_sample_rate': 1.0,
+                'rate_limit': 0
             },
             'notification': {
                 'enabled': False,
                 'webhook_url': '',
-                'email': ''
+                'email': '',
+                'window': 60,
+                'max_items': 20,
+                'max_attempts': 3,
+                'timeout': 10,
+                'events': ['retry_issued', 'retry_exhausted', 'permanent_failure', 'cycle_overrun']
             }
         }
 
@@ -175,7 +346,15 @@ class Config:
         """返回配置的字符串表示"""
         # 隐藏敏感信息
         safe_config = self.config.copy()
-        if 'dolphinscheduler' in safe_config and 'token' in safe_config['dolphinscheduler']:
-            safe_config['dolphinscheduler']['token'] = '***'
+        if 'dolphinscheduler' in safe_config:
+            section = dict(safe_config['dolphinscheduler'])
+            if 'token' in section:
+                section['token'] = '***'
+            if section.get('credentials'):
+                section['credentials'] = [
+                    dict(credential, token='***') if credential.get('token') else credential
+                    for credential in section['credentials']
+                ]
+            safe_config['dolphinscheduler'] = section
 
         return json.dumps(safe_config, indent=2, ensure_ascii=False)
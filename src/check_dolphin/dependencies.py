@@ -0,0 +1,239 @@
+"""
+Workflow Dependencies
+根据 DEPENDENT 任务构建失败工作流之间的依赖关系，按拓扑顺序安排重试
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from .api_client import DolphinSchedulerClient
+from .memory import BoundedDict
+
+
+logger = logging.getLogger(__name__)
+
+# 工作流定义的唯一标识：(项目代码, 工作流定义代码)
+DefinitionKey = Tuple[int, int]
+
+
+class DependencyResolver:
+    """工作流依赖解析器（工作流定义只获取一次并缓存）"""
+
+    TASK_TYPE_DEPENDENT = 'DEPENDENT'
+    STATE_SUCCESS = 'SUCCESS'
+
+    def __init__(self, client: DolphinSchedulerClient, cache_size: int = 50000, max_hold: float = 3600):
+        """
+        初始化依赖解析器
+
+        Args:
+            client: DolphinScheduler API 客户端
+            cache_size: 上游缓存和已重试上游各自的最大条目数（0 表示不限制）
+            max_hold: 已重试的上游迟迟没有成功（或实例已查询不到）时，下游最长暂缓的时间（秒，0 表示不限制）
+        """
+        self.client = client
+        self.max_hold = max_hold
+
+        # 工作流定义 -> 上游工作流定义集合
+        self._upstreams: Dict[DefinitionKey, Set[DefinitionKey]] = BoundedDict(cache_size)
+        # 已重试、尚未确认成功的上游：工作流定义 -> (项目代码, 实例 ID, 重试时间戳)
+        self._retried: Dict[DefinitionKey, Tuple[int, int, float]] = BoundedDict(cache_size)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def definition_key(project_code: int, workflow: Dict) -> Optional[DefinitionKey]:
+        """
+        获取工作流实例对应的工作流定义标识
+
+        Args:
+            project_code: 项目代码
+            workflow: 工作流实例信息
+
+        Returns:
+            (项目代码, 工作流定义代码)，实例中没有定义代码时返回 None
+        """
+        definition_code = workflow.get('processDefinitionCode')
+        if not definition_code:
+            return None
+
+        return int(project_code), int(definition_code)
+
+    def _parse_upstreams(self, definition: Dict) -> Set[DefinitionKey]:
+        """
+        从工作流定义的 DEPENDENT 任务中解析上游工作流
+
+        Args:
+            definition: 工作流定义详情
+
+        Returns:
+            上游工作流定义集合
+        """
+        upstreams = set()
+
+        for task in definition.get('taskDefinitionList') or []:
+            if task.get('taskType') != self.TASK_TYPE_DEPENDENT:
+                continue
+
+            params = task.get('taskParams') or {}
+            if isinstance(params, str):
+                try:
+                    params = json.loads(params)
+                except ValueError:
+                    continue
+
+            dependence = params.get('dependence') or {}
+            for depend_task in dependence.get('dependTaskList') or []:
+                for item in depend_task.get('dependItemList') or []:
+                    if item.get('projectCode') and item.get('definitionCode'):
+                        upstreams.add((int(item['projectCode']), int(item['definitionCode'])))
+
+        return upstreams
+
+    def upstreams_of(self, key: DefinitionKey) -> Set[DefinitionKey]:
+        """
+        获取工作流定义依赖的上游工作流定义
+
+        Args:
+            key: 工作流定义标识
+
+        Returns:
+            上游工作流定义集合
+        """
+        with self._lock:
+            if key in self._upstreams:
+                return self._upstreams[key]
+
+        definition = self.client.get_workflow_definition(project_code=key[0], definition_code=key[1])
+        if definition is None:
+            # 获取失败时不缓存，下次再试
+            return set()
+
+        upstreams = self._parse_upstreams(definition)
+        with self._lock:
+            self._upstreams[key] = upstreams
+
+        return upstreams
+
+    def note_retry(self, project_code: int, workflow: Dict, now: Optional[float] = None):
+        """
+        记录已经重试的工作流，其下游在它成功之前会被暂缓
+
+        Args:
+            project_code: 项目代码
+            workflow: 工作流实例信息
+            now: 当前时间戳（可选）
+        """
+        key = self.definition_key(project_code, workflow)
+        if key:
+            with self._lock:
+                self._retried[key] = (
+                    int(project_code), workflow.get('id'), now if now is not None else time.time()
+                )
+
+    def _upstream_pending(self, key: DefinitionKey, now: Optional[float] = None) -> Optional[str]:
+        """
+        检查已重试的上游是否仍未成功（成功后解除暂缓；超过 max_hold 仍未成功时也解除暂缓，避免下游被永久搁置）
+
+        Args:
+            key: 上游工作流定义标识
+            now: 当前时间戳（可选）
+
+        Returns:
+            下游需要暂缓的原因，不需要暂缓时返回 None
+        """
+        with self._lock:
+            retried = self._retried.get(key)
+        if not retried:
+            return None
+
+        project_code, instance_id, retried_at = retried
+        instance = self.client.get_workflow_instance(project_code=project_code, instance_id=instance_id)
+        if instance and instance.get('state') == self.STATE_SUCCESS:
+            with self._lock:
+                self._retried.pop(key, None)
+            return None
+
+        now = now if now is not None else time.time()
+        if self.max_hold and now - retried_at >= self.max_hold:
+            logger.warning(
+                "Upstream workflow %s (instance %s) has not succeeded within %.0f seconds, releasing its downstream",
+                key[1], instance_id, self.max_hold
+            )
+            with self._lock:
+                self._retried.pop(key, None)
+            return None
+
+        if instance is None:
+            # 实例被删除或请求失败：暂缓并记录原因，超过 max_hold 后解除
+            logger.warning(
+                "Cannot fetch retried upstream workflow %s (instance %s), holding its downstream",
+                key[1], instance_id
+            )
+            return f"Upstream workflow {key[1]} (instance {instance_id}) cannot be fetched"
+
+        return f"Upstream workflow {key[1]} has not succeeded yet"
+
+    def order(self, candidates: List[Dict]) -> Tuple[List[Dict], Dict[int, str]]:
+        """
+        按依赖关系对候选工作流进行拓扑排序，并找出需要暂缓重试的下游工作流
+
+        Args:
+            candidates: 候选列表，元素为 {'project_code': 项目代码, 'workflow': 工作流实例}
+
+        Returns:
+            (排序后的候选列表, 实例 ID -> 暂缓原因)
+        """
+        keys = [self.definition_key(c['project_code'], c['workflow']) for c in candidates]
+        failed_keys = {key for key in keys if key}
+
+        # 只保留候选集合内部的依赖边
+        upstreams = {
+            key: self.upstreams_of(key) & failed_keys
+            for key in failed_keys
+        }
+
+        # Kahn 拓扑排序，同一层内保持原有顺序；存在环时剩余部分按原顺序追加
+        remaining = {key: set(ups) - {key} for key, ups in upstreams.items()}
+        rank: Dict[DefinitionKey, int] = {}
+        level = 0
+        while remaining:
+            ready = [key for key, ups in remaining.items() if not ups]
+            if not ready:
+                break
+            for key in ready:
+                rank[key] = level
+                del remaining[key]
+            for ups in remaining.values():
+                ups.difference_update(ready)
+            level += 1
+        for key in remaining:
+            rank[key] = level
+
+        ordered = sorted(
+            range(len(candidates)),
+            key=lambda i: rank.get(keys[i], 0) if keys[i] else 0
+        )
+
+        # 上游仍失败或重试后尚未成功的下游工作流暂缓重试
+        held: Dict[int, str] = {}
+        pending_cache: Dict[DefinitionKey, Optional[str]] = {}
+        for i in ordered:
+            key = keys[i]
+            if not key:
+                continue
+
+            for upstream in self.upstreams_of(key) - {key}:
+                if upstream in failed_keys:
+                    held[candidates[i]['workflow'].get('id')] = f"Upstream workflow {upstream[1]} has failed"
+                    break
+
+                if upstream not in pending_cache:
+                    pending_cache[upstream] = self._upstream_pending(upstream)
+                if pending_cache[upstream]:
+                    held[candidates[i]['workflow'].get('id')] = pending_cache[upstream]
+                    break
+
+        return [candidates[i] for i in ordered], held
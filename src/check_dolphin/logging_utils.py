@@ -0,0 +1,233 @@
+"""
+Logging Utilities
+结构化日志、采样限流以及基于队列的异步日志输出
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+from typing import Dict, Optional
+
+
+# LogRecord 的标准属性，结构化输出时不作为额外字段
+_STANDARD_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+
+def _message_type(record: logging.LogRecord) -> str:
+    """
+    获取日志的消息类型（优先使用 extra 中的 event，否则使用未格式化的消息模板）
+
+    Args:
+        record: 日志记录
+
+    Returns:
+        消息类型
+    """
+    return getattr(record, 'event', None) or str(record.msg)
+
+
+class JsonFormatter(logging.Formatter):
+    """JSON 格式化器，每条日志输出为一行 JSON"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        格式化日志记录
+
+        Args:
+            record: 日志记录
+
+        Returns:
+            JSON 字符串
+        """
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+
+        # 附加 extra 中的结构化字段（例如 event、instance_id）
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """按消息类型采样和限流的过滤器（WARNING 及以上级别不受影响）"""
+
+    def __init__(
+        self,
+        sampling: Optional[Dict[str, float]] = None,
+        default_rate: float = 1.0,
+        rate_limit: int = 0
+    ):
+        """
+        初始化过滤器
+
+        Args:
+            sampling: 消息类型到采样率（0-1）的映射
+            default_rate: 未配置消息类型的默认采样率
+            rate_limit: 每种消息类型每秒最多输出的条数（0 表示不限制）
+        """
+        super().__init__()
+        self.sampling = sampling or {}
+        self.default_rate = default_rate
+        self.rate_limit = rate_limit
+
+        self._lock = threading.Lock()
+        self._seen: Dict[str, int] = {}
+        # 消息类型 -> [窗口起始秒, 窗口内已输出条数, 被丢弃条数]
+        self._windows: Dict[str, list] = {}
+
+    def _sampled(self, key: str) -> bool:
+        """按计数确定性采样（采样率 0.1 表示每 10 条保留 1 条）"""
+        rate = self.sampling.get(key, self.default_rate)
+        if rate >= 1:
+            return True
+        if rate <= 0:
+            return False
+
+        count = self._seen.get(key, 0)
+        self._seen[key] = count + 1
+        return count % max(1, round(1 / rate)) == 0
+
+    def _within_rate_limit(self, key: str, record: logging.LogRecord) -> bool:
+        """检查消息类型在当前秒内是否超出限流"""
+        if self.rate_limit <= 0:
+            return True
+
+        now = int(time.monotonic())
+        window = self._windows.get(key)
+
+        if window is None or window[0] != now:
+            suppressed = window[2] if window else 0
+            self._windows[key] = [now, 1, 0]
+            if suppressed:
+                record.suppressed = suppressed
+            return True
+
+        if window[1] >= self.rate_limit:
+            window[2] += 1
+            return False
+
+        window[1] += 1
+        return True
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """
+        判断是否输出该日志
+
+        Args:
+            record: 日志记录
+
+        Returns:
+            是否输出
+        """
+        if record.levelno >= logging.WARNING:
+            return True
+
+        key = _message_type(record)
+
+        with self._lock:
+            return self._sampled(key) and self._within_rate_limit(key, record)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    队列处理器：采样过滤后只在调用线程中合并消息与参数，时间格式化、JSON 序列化和文件 I/O 都在后台线程完成
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        入队前合并消息与参数（参数可能是之后会被修改的可变对象，不能留到后台线程再格式化）
+
+        Args:
+            record: 日志记录
+
+        Returns:
+            消息已合并的日志记录副本（同一进程内的队列不需要序列化）
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def stop_logging():
+    """停止后台日志线程并刷新所有待写入的日志"""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def configure_logging(
+    level: str = 'INFO',
+    log_format: str = '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    log_file: str = '',
+    json_format: bool = False,
+    max_bytes: int = 0,
+    backup_count: int = 5,
+    sampling: Optional[Dict[str, float]] = None,
+    default_sample_rate: float = 1.0,
+    rate_limit: int = 0
+):
+    """
+    配置根日志器：采样限流后入队，由后台线程格式化并写入文件或控制台
+
+    Args:
+        level: 日志级别
+        log_format: 文本日志格式
+        log_file: 日志文件路径（为空时输出到控制台）
+        json_format: 是否输出 JSON 结构化日志
+        max_bytes: 单个日志文件最大字节数（0 表示不轮转）
+        backup_count: 保留的轮转文件数量
+        sampling: 消息类型到采样率的映射
+        default_sample_rate: 默认采样率
+        rate_limit: 每种消息类型每秒最多输出的条数（0 表示不限制）
+    """
+    global _listener
+
+    stop_logging()
+
+    if log_file and max_bytes > 0:
+        target = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+        )
+    elif log_file:
+        target = logging.FileHandler(log_file, mode='a', encoding='utf-8')
+    else:
+        target = logging.StreamHandler()
+
+    target.setFormatter(JsonFormatter() if json_format else logging.Formatter(log_format))
+
+    queue_handler = DeferredQueueHandler(queue.SimpleQueue())
+    queue_handler.addFilter(SamplingFilter(sampling, default_sample_rate, rate_limit))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(getattr(logging, level.upper(), logging.INFO))
+
+    _listener = logging.handlers.QueueListener(queue_handler.queue, target, respect_handler_level=True)
+    _listener.start()
+
+
+atexit.register(stop_logging)
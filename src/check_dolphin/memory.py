@@ -0,0 +1,260 @@
+"""
+Memory Budgets and Diagnostics
+常驻进程的内存预算（按条目数淘汰最久未更新的记录）和内存诊断（RSS、各结构大小、tracemalloc 分配热点）
+"""
+
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows 没有 resource 模块
+    resource = None
+
+
+logger = logging.getLogger(__name__)
+
+
+class BoundedDict(OrderedDict):
+    """有条目数上限的字典（写入时把条目移到末尾，超过上限时淘汰最久未更新的条目）"""
+
+    def __init__(self, max_entries: int = 0, *args, **kwargs):
+        """
+        初始化有上限的字典
+
+        Args:
+            max_entries: 最大条目数（0 表示不限制）
+        """
+        self.max_entries = max_entries
+        self.evictions = 0
+        super().__init__(*args, **kwargs)
+
+    def __setitem__(self, key, value):
+        if key in self:
+            self.move_to_end(key)
+        super().__setitem__(key, value)
+
+        if self.max_entries:
+            while len(self) > self.max_entries:
+                self.popitem(last=False)
+                self.evictions += 1
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def copy(self) -> 'BoundedDict':
+        return self.__class__(self.max_entries, self)
+
+    def add(self, key):
+        """作为有上限的集合使用时添加元素"""
+        self[key] = None
+
+    def __reduce__(self):
+        return self.__class__, (self.max_entries, list(self.items()))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self)!r})"
+
+
+def deep_sizeof(obj: Any, seen: Optional[set] = None) -> int:
+    """
+    估算对象及其包含的容器和元素占用的字节数（共享对象只计算一次）
+
+    Args:
+        obj: 对象
+        seen: 已计算过的对象 ID（递归使用）
+
+    Returns:
+        字节数
+    """
+    seen = set() if seen is None else seen
+    stack = [obj]
+    size = 0
+
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+
+    return size
+
+
+def current_rss() -> Optional[int]:
+    """
+    获取当前进程的常驻内存（字节）
+
+    Returns:
+        RSS 字节数（Linux 读取 /proc，其他平台返回峰值 RSS），无法获取时返回 None
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+
+    if resource is None:
+        return None
+
+    # ru_maxrss 在 macOS 上是字节，在其他平台上是 KB
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class MemoryDiagnostics:
+    """内存诊断：汇总 RSS、已注册结构的条目数/大小/淘汰数和 tracemalloc 分配热点"""
+
+    def __init__(self, top: int = 10):
+        """
+        初始化内存诊断
+
+        Args:
+            top: 输出的分配热点数量
+        """
+        self.top = top
+        self._structures: Dict[str, Callable[[], Any]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, getter: Callable[[], Any]):
+        """
+        注册需要统计大小的结构
+
+        Args:
+            name: 结构名称
+            getter: 返回结构对象的函数（对象可能在运行中被替换，每次统计时重新获取）
+        """
+        self._structures[name] = getter
+
+    def register_all(self, structures: Dict[str, Callable[[], Any]]):
+        """批量注册结构"""
+        self._structures.update(structures)
+
+    @staticmethod
+    def start_tracing(frames: int = 1):
+        """
+        开始跟踪内存分配（有额外开销，只在排查泄漏时开启）
+
+        Args:
+            frames: 每次分配保存的调用栈帧数
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            logger.info("tracemalloc started with %d frame(s)", frames)
+
+    def structure_sizes(self) -> Dict[str, Dict]:
+        """
+        统计已注册结构的大小
+
+        Returns:
+            结构名称 -> {'entries', 'bytes', 'budget', 'evictions'}
+        """
+        sizes = {}
+        for name, getter in list(self._structures.items()):
+            obj = getter()
+            if obj is None:
+                continue
+
+            # 结构可能被其他线程同时修改，复制一份再统计
+            for _ in range(3):
+                try:
+                    copied = dict(obj) if isinstance(obj, dict) else list(obj)
+                    break
+                except RuntimeError:
+                    continue
+            else:
+                copied = {}
+
+            sizes[name] = {
+                'entries': len(copied),
+                'bytes': deep_sizeof(copied),
+                'budget': getattr(obj, 'max_entries', None) or None,
+                'evictions': getattr(obj, 'evictions', 0)
+            }
+
+        return sizes
+
+    def top_allocations(self, limit: Optional[int] = None) -> List[Dict]:
+        """
+        获取 tracemalloc 统计的分配热点（未开启跟踪时返回空列表）
+
+        Args:
+            limit: 数量（默认使用 top）
+
+        Returns:
+            [{'location', 'size', 'count'}]
+        """
+        if not tracemalloc.is_tracing():
+            return []
+
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>')
+        ))
+        return [
+            {'location': str(stat.traceback), 'size': stat.size, 'count': stat.count}
+            for stat in snapshot.statistics('lineno')[:limit or self.top]
+        ]
+
+    def snapshot(self) -> Dict:
+        """
+        生成内存诊断快照
+
+        Returns:
+            诊断字典
+        """
+        with self._lock:
+            result = {
+                'timestamp': time.time(),
+                'rss_bytes': current_rss(),
+                'structures': self.structure_sizes(),
+                'tracing': tracemalloc.is_tracing(),
+                'top_allocations': self.top_allocations()
+            }
+            if tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                result['traced_bytes'] = current
+                result['traced_peak_bytes'] = peak
+
+        return result
+
+    def dump(self):
+        """把内存诊断快照写入日志"""
+        snapshot = self.snapshot()
+        logger.info(
+            "Memory diagnostics: rss=%s bytes, structures=%s",
+            snapshot['rss_bytes'], snapshot['structures'],
+            extra={'event': 'memory_diagnostics'}
+        )
+        for stat in snapshot['top_allocations']:
+            logger.info("Top allocation: %s - %d bytes in %d blocks", stat['location'], stat['size'], stat['count'])
+
+    def install_signal_handler(self, signum: Optional[int] = None):
+        """
+        安装信号处理函数，收到信号时在后台线程中输出诊断（默认 SIGUSR1，Windows 不支持）
+
+        Args:
+            signum: 信号编号
+        """
+        signum = signum if signum is not None else getattr(signal, 'SIGUSR1', None)
+        if signum is None:
+            return
+
+        def handle_signal(signum, frame):
+            threading.Thread(target=self.dump, name='memory-diagnostics', daemon=True).start()
+
+        signal.signal(signum, handle_signal)
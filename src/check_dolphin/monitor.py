@@ -4,11 +4,24 @@ Workflow Monitor
 """
 
 import logging
+import random
+import threading
 import time
-from typing import List, Dict, Optional, Set
+from typing import Any, Callable, List, Dict, Optional
 from datetime import datetime, timedelta
 
+from .admission import AdmissionController
 from .api_client import DolphinSchedulerClient
+from .backfill import BackfillScanner
+from .checkpoint import CheckpointStore
+from .classifier import FailureClassifier
+from .dependencies import DependencyResolver
+from .memory import BoundedDict
+from .notifier import Notifier
+from .outcomes import OutcomeTracker
+from .policy import PolicyEngine
+from .priority import PriorityModel, RetryQueue
+from .subworkflows import SubWorkflowInspector
 
 
 logger = logging.getLogger(__name__)
@@ -40,12 +53,41 @@ class WorkflowMonitor:
     # 任务失败状态集合
     TASK_FAILED_STATES = {TASK_STATE_FAILURE, TASK_STATE_STOP, TASK_STATE_KILL}
 
+    # 重试执行类型：完整重跑 / 只重跑失败任务
+    EXECUTE_REPEAT_RUNNING = 'REPEAT_RUNNING'
+    EXECUTE_FAILURE_TASK = 'START_FAILURE_TASK_PROCESS'
+
+    # 恢复模式
+    RECOVERY_FULL = 'full'
+    RECOVERY_FAILED_TASKS = 'failed_tasks'
+    RECOVERY_AUTO = 'auto'
+    RECOVERY_MODES = (RECOVERY_FULL, RECOVERY_FAILED_TASKS, RECOVERY_AUTO)
+
+    # 用于计算工作流实例指纹的字段
+    FINGERPRINT_FIELDS = ('state', 'runTimes', 'startTime', 'endTime', 'restartTime')
+
     def __init__(
         self,
         client: DolphinSchedulerClient,
         max_retry_count: int = 3,
         retry_interval: int = 60,
-        check_interval: int = 300
+        check_interval: int = 300,
+        checkpoint_path: Optional[str] = None,
+        state_path: Optional[str] = None,
+        ramp_up_window: int = 0,
+        recovery: Optional[Dict] = None,
+        dependency_aware: bool = False,
+        dependency_max_hold: float = 3600,
+        priority: Optional[Dict] = None,
+        max_retries_per_cycle: int = 0,
+        admission: Optional[AdmissionController] = None,
+        classifier: Optional[FailureClassifier] = None,
+        notifier: Optional[Notifier] = None,
+        outcomes: Optional[OutcomeTracker] = None,
+        backfill: Optional[BackfillScanner] = None,
+        sub_workflows: Optional[SubWorkflowInspector] = None,
+        policies: Optional[Dict] = None,
+        max_tracked_instances: int = 50000
     ):
         """
         初始化监控器
@@ -55,14 +97,77 @@ class WorkflowMonitor:
             max_retry_count: 最大重试次数
             retry_interval: 重试间隔（秒）
             check_interval: 检查间隔（秒）
+            checkpoint_path: 检查点文件路径（可选，用于停止后恢复进度）
+            state_path: 缓存状态文件路径（可选，用于重启后热启动）
+            ramp_up_window: 首轮检查分散执行的时间窗口（秒，0 表示不分散）
+            recovery: 恢复策略配置（mode、auto_threshold 以及按 projects/workflows 覆盖的模式）
+            dependency_aware: 是否按工作流依赖关系排序重试，并暂缓上游未成功的下游工作流
+            dependency_max_hold: 已重试的上游一直没有成功时下游最长暂缓的时间（秒，0 表示不限制）
+            priority: 重试优先级配置（可选，配置后按优先级从高到低重试）
+            max_retries_per_cycle: 每轮检查最多执行的重试次数（0 表示不限制）
+            admission: 重试准入控制器（可选，集群繁忙时推迟重试）
+            classifier: 失败分类器（可选，跳过永久性失败）
+            notifier: 通知器（可选，发送重试、重试用尽、永久性失败和检查超时事件）
+            outcomes: 重试结果跟踪器（可选，统计重试成功率，跳过成功率过低的工作流）
+            backfill: 回溯扫描器（可选，指定开始和结束日期时按时间片并发扫描）
+            sub_workflows: 子工作流检查器（可选，递归验证 SUB_PROCESS 任务的子工作流）
+            policies: 按项目和工作流名称配置的重试策略（可选，覆盖最大重试次数和恢复模式等）
+            max_tracked_instances: 按实例记录的结构（重试次数、判定缓存等）各自的最大条目数，
+                超过时淘汰最久未更新的实例（0 表示不限制，应大于扫描范围内失败实例的数量）
         """
         self.client = client
         self.max_retry_count = max_retry_count
         self.retry_interval = retry_interval
         self.check_interval = check_interval
-
-        # 记录已重试的实例及其重试次数
-        self.retry_records: Dict[int, int] = {}
+        self.checkpoint = CheckpointStore(checkpoint_path) if checkpoint_path else None
+        self.state_store = CheckpointStore(state_path) if state_path else None
+        self.ramp_up_window = ramp_up_window
+        self.recovery = recovery or {}
+        self._validate_recovery(self.recovery)
+        self.max_tracked_instances = max_tracked_instances
+        self.dependencies = DependencyResolver(
+            client, cache_size=max_tracked_instances, max_hold=dependency_max_hold
+        ) if dependency_aware else None
+        self.priority = PriorityModel(priority) if priority else None
+        self.max_retries_per_cycle = max_retries_per_cycle
+        self.admission = admission
+        self.classifier = classifier
+        self.notifier = notifier
+        self.outcomes = outcomes
+        self.backfill = backfill
+        self.sub_workflows = sub_workflows
+        self.policies = PolicyEngine(policies, cache_size=max_tracked_instances) if policies else None
+
+        # 记录已重试的实例及其重试次数、最近一次重试的时间
+        self.retry_records: Dict[int, int] = BoundedDict(max_tracked_instances)
+        self.last_retry_at: Dict[int, float] = BoundedDict(max_tracked_instances)
+        # 只重跑失败任务相比完整重跑累计节省的任务小时数
+        self.saved_task_hours = 0.0
+        # 被识别为永久性失败而跳过的实例 ID -> 原因
+        self.permanent_failures: Dict[int, str] = BoundedDict(max_tracked_instances)
+        # 已发送过通知的 (事件类型, 实例 ID)，同一实例的同类事件只通知一次
+        self._notified: BoundedDict = BoundedDict(max_tracked_instances)
+
+        # 热启动缓存：项目名称 -> 项目代码、实例 ID -> 判定结果、项目代码 -> 最近一次扫描时间
+        self.project_code_cache: Dict[str, int] = {}
+        self.verdict_cache: Dict[int, Dict] = BoundedDict(max_tracked_instances)
+        self.watermarks: Dict[int, float] = {}
+
+        # 停止请求（SIGTERM 等），用于打断等待
+        self.shutdown_event = threading.Event()
+
+        # 当前监控进度（用于检查点）
+        self._state_lock = threading.Lock()
+        self._project_codes: List[int] = []
+        self._project_index = 0
+        self._pending: List[Dict] = []
+        # 因集群繁忙被推迟的重试
+        self._deferred: List[Dict] = []
+
+        # 本轮检查的结果（每个项目的失败数量、每个实例的处理结果）和最近一轮完成的检查摘要
+        self._cycle_failed: Dict[int, int] = {}
+        self._cycle_results: List[Dict] = []
+        self.last_cycle: Dict = {}
 
     def get_failed_workflows(
         self,
@@ -96,7 +201,10 @@ class WorkflowMonitor:
             if workflows:
                 failed_workflows.extend(workflows)
 
-        logger.info(f"Found {len(failed_workflows)} failed workflows in project {project_code}")
+        logger.info(
+            "Found %d failed workflows in project %s", len(failed_workflows), project_code,
+            extra={'event': 'failed_workflows_found'}
+        )
         return failed_workflows
 
     def check_task_retry_exhausted(self, task: Dict) -> bool:
@@ -143,12 +251,32 @@ class WorkflowMonitor:
         )
 
         if not tasks:
-            logger.warning(f"No tasks found for workflow instance {workflow_instance_id}")
+            logger.warning("No tasks found for workflow instance %s", workflow_instance_id)
             return False, "No tasks found in workflow"
 
+        return self.evaluate_tasks(workflow_instance_id, tasks)
+
+    def evaluate_tasks(
+        self,
+        workflow_instance_id: int,
+        tasks: List[Dict],
+        allow_succeeded: bool = False
+    ) -> tuple[bool, str]:
+        """
+        根据已获取的任务实例列表判断工作流是否可以重试
+
+        Args:
+            workflow_instance_id: 工作流实例 ID
+            tasks: 任务实例列表（非空）
+            allow_succeeded: 是否允许存在成功的任务（只重跑失败任务时为 True）
+
+        Returns:
+            (是否可以重试, 原因说明)
+        """
         # 统计任务状态
         total_tasks = len(tasks)
         failed_tasks = 0
+        succeeded_tasks = 0
         running_tasks = 0
         retry_not_exhausted_tasks = []
 
@@ -175,60 +303,404 @@ class WorkflowMonitor:
             elif task_state == self.TASK_STATE_RUNNING:
                 running_tasks += 1
 
+            elif task_state == self.TASK_STATE_SUCCESS:
+                succeeded_tasks += 1
+
         logger.info(
-            f"Workflow {workflow_instance_id} task status: "
-            f"total={total_tasks}, failed={failed_tasks}, running={running_tasks}"
+            "Workflow %s task status: total=%d, failed=%d, running=%d",
+            workflow_instance_id, total_tasks, failed_tasks, running_tasks,
+            extra={'event': 'workflow_task_status'}
         )
 
         # 如果有任务还在运行中，不能重试
         if running_tasks > 0:
             reason = f"Workflow has {running_tasks} tasks still running"
-            logger.info(f"Cannot retry workflow {workflow_instance_id}: {reason}")
+            logger.info(
+                "Cannot retry workflow %s: %s", workflow_instance_id, reason,
+                extra={'event': 'workflow_validation_failed'}
+            )
             return False, reason
 
         # 如果有任务重试次数未用完，不能重试
         if retry_not_exhausted_tasks:
-            reason = (
-                f"Some tasks have not exhausted their retry attempts: "
-                f"{', '.join([f\"{t['name']}({t['retry_times']}/{t['max_retry_times']})\" for t in retry_not_exhausted_tasks])}"
+            task_details = ', '.join(
+                f"{t['name']}({t['retry_times']}/{t['max_retry_times']})"
+                for t in retry_not_exhausted_tasks
+            )
+            reason = f"Some tasks have not exhausted their retry attempts: {task_details}"
+            logger.info(
+                "Cannot retry workflow %s: %s", workflow_instance_id, reason,
+                extra={'event': 'workflow_validation_failed'}
             )
-            logger.info(f"Cannot retry workflow {workflow_instance_id}: {reason}")
             return False, reason
 
+        # 只重跑失败任务时，成功的任务会被保留
+        if allow_succeeded and failed_tasks > 0 and failed_tasks + succeeded_tasks == total_tasks:
+            logger.info(
+                "Workflow %s validation passed: %d failed tasks exhausted retries, %d succeeded tasks kept",
+                workflow_instance_id, failed_tasks, succeeded_tasks,
+                extra={'event': 'workflow_validation_passed'}
+            )
+            return True, (
+                f"{failed_tasks} failed tasks exhausted their retry attempts, "
+                f"{succeeded_tasks} tasks succeeded"
+            )
+
         # 如果不是所有任务都失败了，不能重试
         if failed_tasks < total_tasks:
             reason = f"Not all tasks have failed (failed: {failed_tasks}/{total_tasks})"
-            logger.info(f"Cannot retry workflow {workflow_instance_id}: {reason}")
+            logger.info(
+                "Cannot retry workflow %s: %s", workflow_instance_id, reason,
+                extra={'event': 'workflow_validation_failed'}
+            )
             return False, reason
 
         # 所有检查通过，可以重试
         logger.info(
-            f"Workflow {workflow_instance_id} validation passed: "
-            f"all {total_tasks} tasks have failed and exhausted retries"
+            "Workflow %s validation passed: all %d tasks have failed and exhausted retries",
+            workflow_instance_id, total_tasks,
+            extra={'event': 'workflow_validation_passed'}
         )
         return True, "All tasks have failed and exhausted their retry attempts"
 
-    def should_retry(self, instance_id: int) -> bool:
+    def evaluate_child_tasks(
+        self,
+        workflow_instance_id: int,
+        child_tasks: List[Dict],
+        problems: List[str],
+        parent_reason: str
+    ) -> tuple[bool, str]:
+        """
+        根据子工作流中的任务判断父工作流是否可以重试
+
+        子工作流中允许存在成功的任务，但不能有运行中的任务，失败的任务必须已经用完重试次数。
+
+        Args:
+            workflow_instance_id: 父工作流实例 ID
+            child_tasks: 子工作流任务列表
+            problems: 无法展开的 SUB_PROCESS 任务说明
+            parent_reason: 父工作流任务的验证结果说明
+
+        Returns:
+            (是否可以重试, 原因说明)
+        """
+        if problems:
+            reason = '; '.join(problems)
+        else:
+            running = [t['name'] for t in child_tasks if t.get('state') == self.TASK_STATE_RUNNING]
+            not_exhausted = [
+                f"{t['name']}({t.get('retryTimes', 0)}/{t.get('maxRetryTimes', 0)})"
+                for t in child_tasks
+                if t.get('state') in self.TASK_FAILED_STATES and not self.check_task_retry_exhausted(t)
+            ]
+
+            if running:
+                reason = f"Sub-workflow tasks still running: {', '.join(running)}"
+            elif not_exhausted:
+                reason = f"Some sub-workflow tasks have not exhausted their retry attempts: {', '.join(not_exhausted)}"
+            else:
+                if child_tasks:
+                    parent_reason = f"{parent_reason} (including {len(child_tasks)} sub-workflow tasks)"
+                return True, parent_reason
+
+        logger.info(
+            "Cannot retry workflow %s: %s", workflow_instance_id, reason,
+            extra={'event': 'workflow_validation_failed'}
+        )
+        return False, reason
+
+    def should_retry(self, instance_id: int, max_retry_count: Optional[int] = None) -> bool:
         """
         判断是否应该重试（基于监控器的重试次数限制）
 
         Args:
             instance_id: 工作流实例 ID
+            max_retry_count: 最大重试次数（可选，默认使用监控器的配置）
 
         Returns:
             是否应该重试
         """
+        if max_retry_count is None:
+            max_retry_count = self.max_retry_count
         retry_count = self.retry_records.get(instance_id, 0)
 
-        if retry_count >= self.max_retry_count:
+        if retry_count >= max_retry_count:
             logger.warning(
-                f"Workflow instance {instance_id} has reached max retry count "
-                f"({self.max_retry_count}), skipping"
+                "Workflow instance %s has reached max retry count (%d), skipping",
+                instance_id, max_retry_count
             )
             return False
 
         return True
 
+    def policy_for(self, project_code: int, workflow_name: str) -> Dict:
+        """
+        获取工作流的有效重试策略（未配置的字段使用监控器的全局配置）
+
+        Args:
+            project_code: 项目代码
+            workflow_name: 工作流名称
+
+        Returns:
+            策略字典（max_retries、backoff、recovery、quiet_hours、exclude、rule）
+        """
+        policy = {
+            'max_retries': self.max_retry_count,
+            'backoff': 0,
+            'recovery': None,
+            'quiet_hours': None,
+            'exclude': False,
+            'rule': None
+        }
+        if self.policies:
+            policy.update(self.policies.resolve(project_code, workflow_name))
+
+        return policy
+
+    def _backoff_remaining(self, instance_id: int, policy: Dict) -> float:
+        """
+        计算距离下一次允许重试还需等待的秒数（每次重试后退避时间翻倍）
+
+        Args:
+            instance_id: 工作流实例 ID
+            policy: 重试策略
+
+        Returns:
+            剩余等待秒数（0 表示可以重试）
+        """
+        retry_count = self.retry_records.get(instance_id, 0)
+        last_retry_at = self.last_retry_at.get(instance_id)
+        if not policy['backoff'] or not retry_count or last_retry_at is None:
+            return 0.0
+
+        delay = float(policy['backoff']) * 2 ** (retry_count - 1)
+        return max(0.0, last_retry_at + delay - time.time())
+
+    @classmethod
+    def _validate_recovery(cls, recovery: Dict):
+        """
+        校验恢复模式配置
+
+        Args:
+            recovery: 恢复模式配置（mode、projects、workflows）
+
+        Raises:
+            ValueError: 存在未知的恢复模式
+        """
+        modes = [('recovery.mode', recovery.get('mode', cls.RECOVERY_FULL))]
+        for section in ('projects', 'workflows'):
+            modes.extend(
+                (f"recovery.{section}.{key}", mode) for key, mode in (recovery.get(section) or {}).items()
+            )
+
+        for label, mode in modes:
+            if mode not in cls.RECOVERY_MODES:
+                raise ValueError(
+                    f"Invalid recovery mode {mode!r} in {label} (expected one of {', '.join(cls.RECOVERY_MODES)})"
+                )
+
+    def recovery_mode_for(self, project_code: int, workflow_name: str) -> str:
+        """
+        获取工作流的恢复模式（工作流名称配置优先于项目配置）
+
+        Args:
+            project_code: 项目代码
+            workflow_name: 工作流名称
+
+        Returns:
+            恢复模式（full / failed_tasks / auto）
+        """
+        policy_mode = self.policy_for(project_code, workflow_name)['recovery']
+        if policy_mode:
+            return policy_mode
+
+        workflows = self.recovery.get('workflows') or {}
+        if workflow_name in workflows:
+            return workflows[workflow_name]
+
+        projects = self.recovery.get('projects') or {}
+        for key in (project_code, str(project_code)):
+            if key in projects:
+                return projects[key]
+
+        return self.recovery.get('mode', self.RECOVERY_FULL)
+
+    @staticmethod
+    def _task_hours(task: Dict) -> float:
+        """
+        计算任务实例的运行时长（小时）
+
+        Args:
+            task: 任务实例信息
+
+        Returns:
+            运行时长，缺少时间信息时返回 0
+        """
+        try:
+            start = datetime.strptime(task['startTime'], '%Y-%m-%d %H:%M:%S')
+            end = datetime.strptime(task['endTime'], '%Y-%m-%d %H:%M:%S')
+        except (KeyError, TypeError, ValueError):
+            return 0.0
+
+        return max(0.0, (end - start).total_seconds() / 3600)
+
+    def choose_recovery(self, tasks: List[Dict], mode: str) -> Dict:
+        """
+        根据恢复模式和任务状态选择执行方式
+
+        Args:
+            tasks: 任务实例列表
+            mode: 恢复模式（full / failed_tasks / auto）
+
+        Returns:
+            {'execute_type': 执行类型, 'saved_task_hours': 相比完整重跑节省的任务小时数}
+        """
+        succeeded = [task for task in tasks if task.get('state') == self.TASK_STATE_SUCCESS]
+
+        if mode == self.RECOVERY_FAILED_TASKS:
+            use_failed_tasks = bool(succeeded)
+        elif mode == self.RECOVERY_AUTO:
+            threshold = self.recovery.get('auto_threshold', 0.5)
+            use_failed_tasks = bool(succeeded) and len(succeeded) / len(tasks) >= threshold
+        else:
+            use_failed_tasks = False
+
+        if not use_failed_tasks:
+            return {'execute_type': self.EXECUTE_REPEAT_RUNNING, 'saved_task_hours': 0.0}
+
+        return {
+            'execute_type': self.EXECUTE_FAILURE_TASK,
+            'saved_task_hours': round(sum(self._task_hours(task) for task in succeeded), 3)
+        }
+
+    def recovery_for(self, instance_id: int) -> Dict:
+        """
+        获取实例最近一次判定时选择的执行方式
+
+        Args:
+            instance_id: 工作流实例 ID
+
+        Returns:
+            {'execute_type': 执行类型, 'saved_task_hours': 节省的任务小时数}
+        """
+        cached = self.verdict_cache.get(instance_id) or {}
+        return cached.get('recovery') or {'execute_type': self.EXECUTE_REPEAT_RUNNING, 'saved_task_hours': 0.0}
+
+    def workflow_fingerprint(self, workflow: Dict) -> str:
+        """
+        计算工作流实例的指纹（实例重新运行或状态变化时指纹随之变化）
+
+        Args:
+            workflow: 工作流实例信息
+
+        Returns:
+            指纹字符串
+        """
+        return '|'.join(str(workflow.get(field, '')) for field in self.FINGERPRINT_FIELDS)
+
+    def evaluate_retry(
+        self,
+        project_code: int,
+        workflow: Dict,
+        validate_tasks: bool = True
+    ) -> tuple[bool, str]:
+        """
+        判断工作流是否满足重试条件（不执行重试，无副作用）
+
+        Args:
+            project_code: 项目代码
+            workflow: 工作流实例信息
+            validate_tasks: 是否验证任务状态（默认为True）
+
+        Returns:
+            (是否可以重试, 原因说明)
+        """
+        instance_id = workflow.get('id')
+
+        if not instance_id:
+            logger.error("Workflow instance ID not found")
+            return False, "Workflow instance ID not found"
+
+        policy = self.policy_for(project_code, workflow.get('name', ''))
+        if policy['exclude']:
+            return False, f"Excluded by retry policy rule #{policy['rule']}"
+
+        # 检查重试次数限制（重试策略优先于监控器的全局配置）
+        if not self.should_retry(instance_id, policy['max_retries']):
+            return False, f"Reached max retry count ({policy['max_retries']})"
+
+        if PolicyEngine.in_quiet_hours(policy['quiet_hours'], datetime.now()):
+            return False, f"Within quiet hours ({policy['quiet_hours']})"
+
+        backoff_remaining = self._backoff_remaining(instance_id, policy)
+        if backoff_remaining > 0:
+            return False, f"Backing off for another {backoff_remaining:.0f} seconds"
+
+        # 历史重试成功率过低的工作流不再重试
+        if self.outcomes:
+            worth, worth_reason = self.outcomes.worth_retrying(workflow.get('name', ''))
+            if not worth:
+                return False, worth_reason
+
+        if not validate_tasks:
+            return True, "Task validation skipped"
+
+        mode = self.recovery_mode_for(project_code, workflow.get('name', ''))
+
+        # 工作流指纹未变化时任务状态也不会变化，直接复用上次的判定结果
+        fingerprint = self.workflow_fingerprint(workflow)
+        cached = self.verdict_cache.get(instance_id)
+        if cached and cached['fingerprint'] == fingerprint and cached.get('mode') == mode:
+            return cached['can_retry'], cached['reason']
+
+        # 验证任务状态（确保所有任务都失败且重试次数用完）
+        tasks = self.client.get_task_instances(
+            project_code=project_code,
+            process_instance_id=instance_id
+        )
+
+        if not tasks:
+            # 获取失败或暂无任务时不缓存判定结果
+            logger.warning("No tasks found for workflow instance %s", instance_id)
+            return False, "No tasks found in workflow"
+
+        recovery = self.choose_recovery(tasks, mode)
+        # 只有只重跑失败任务时才允许存在成功的任务，完整重跑会把成功的任务再执行一遍
+        can_retry, reason = self.evaluate_tasks(
+            instance_id,
+            tasks,
+            allow_succeeded=recovery['execute_type'] == self.EXECUTE_FAILURE_TASK
+        )
+
+        # 递归检查子工作流中的任务，整体给出一个判定结果
+        child_tasks: List[Dict] = []
+        problems: List[str] = []
+        if can_retry and self.sub_workflows:
+            child_tasks, problems = self.sub_workflows.collect(project_code, tasks)
+            can_retry, reason = self.evaluate_child_tasks(instance_id, child_tasks, problems, reason)
+
+        # 根据失败任务（包括子工作流中的失败任务）的日志识别永久性失败（重试也不会成功）
+        if can_retry and self.classifier:
+            permanent_reason = self.classifier.find_permanent_failure(
+                tasks + child_tasks, self.TASK_FAILED_STATES, project_code
+            )
+            if permanent_reason:
+                can_retry, reason = False, f"Permanent failure: {permanent_reason}"
+                with self._state_lock:
+                    self.permanent_failures[instance_id] = permanent_reason
+
+        # 子工作流的状态变化不会改变父工作流的指纹，展开过子工作流的判定结果不复用（只保留执行方式）
+        if child_tasks or problems:
+            fingerprint = None
+        self.verdict_cache[instance_id] = {
+            'fingerprint': fingerprint,
+            'mode': mode,
+            'can_retry': can_retry,
+            'reason': reason,
+            'recovery': recovery
+        }
+        return can_retry, reason
+
     def retry_failed_workflow(
         self,
         project_code: int,
@@ -250,49 +722,508 @@ class WorkflowMonitor:
         workflow_name = workflow.get('name', 'Unknown')
         state = workflow.get('state', 'Unknown')
 
-        if not instance_id:
-            logger.error("Workflow instance ID not found")
-            return False
+        can_retry, reason = self.evaluate_retry(
+            project_code=project_code,
+            workflow=workflow,
+            validate_tasks=validate_tasks
+        )
 
-        # 检查监控器的重试次数限制
-        if not self.should_retry(instance_id):
+        if not can_retry:
+            if instance_id:
+                logger.warning(
+                    "Skip retry for workflow %s (ID: %s): %s", workflow_name, instance_id, reason,
+                    extra={'event': 'workflow_retry_skipped'}
+                )
+                self._record_result(project_code, workflow, 'skipped', reason)
+                if instance_id in self.permanent_failures:
+                    self._notify_once(Notifier.EVENT_PERMANENT_FAILURE, project_code, workflow, reason)
+                elif self.retry_records.get(instance_id, 0) >= self.policy_for(
+                    project_code, workflow_name
+                )['max_retries']:
+                    self._notify_once(Notifier.EVENT_RETRY_EXHAUSTED, project_code, workflow, reason)
             return False
 
-        # 验证任务状态（确保所有任务都失败且重试次数用完）
-        if validate_tasks:
-            can_retry, reason = self.validate_workflow_tasks(
-                project_code=project_code,
-                workflow_instance_id=instance_id
-            )
-
-            if not can_retry:
-                logger.warning(
-                    f"Skip retry for workflow {workflow_name} (ID: {instance_id}): {reason}"
+        # 集群繁忙时推迟重试，集群恢复后自动继续
+        if self.admission:
+            admitted, admission_reason = self.admission.admit()
+            if not admitted:
+                logger.info(
+                    "Deferring retry for workflow %s (ID: %s): %s", workflow_name, instance_id, admission_reason,
+                    extra={'event': 'workflow_retry_deferred'}
                 )
+                with self._state_lock:
+                    self._deferred.append({'project_code': project_code, 'workflow': workflow})
+                self._record_result(project_code, workflow, 'deferred', admission_reason)
                 return False
 
+        recovery = self.recovery_for(instance_id)
+
         logger.info(
-            f"Retrying workflow: {workflow_name} (ID: {instance_id}, State: {state})"
+            "Retrying workflow: %s (ID: %s, State: %s, Execute type: %s)",
+            workflow_name, instance_id, state, recovery['execute_type'],
+            extra={'event': 'workflow_retry_issued'}
         )
 
         # 执行重试
         success = self.client.retry_workflow_instance(
             project_code=project_code,
-            instance_id=instance_id
+            instance_id=instance_id,
+            execute_type=recovery['execute_type']
         )
 
         if success:
             # 更新重试记录
-            self.retry_records[instance_id] = self.retry_records.get(instance_id, 0) + 1
+            with self._state_lock:
+                self.retry_records[instance_id] = self.retry_records.get(instance_id, 0) + 1
+                self.last_retry_at[instance_id] = time.time()
+                self.saved_task_hours += recovery['saved_task_hours']
+                retry_count = self.retry_records[instance_id]
+            if self.admission:
+                self.admission.record_retry()
+            if self.outcomes:
+                self.outcomes.track(project_code, workflow)
             logger.info(
-                f"Successfully retried workflow {instance_id}, "
-                f"retry count: {self.retry_records[instance_id]}"
+                "Successfully retried workflow %s, retry count: %d",
+                instance_id, retry_count,
+                extra={'event': 'workflow_retry_succeeded'}
             )
+            self._record_result(project_code, workflow, 'retried', reason)
+            if self.notifier:
+                self.notifier.notify(
+                    Notifier.EVENT_RETRY_ISSUED,
+                    project_code=project_code,
+                    instance_id=instance_id,
+                    name=workflow_name,
+                    retry_count=retry_count,
+                    execute_type=recovery['execute_type']
+                )
         else:
-            logger.error(f"Failed to retry workflow {instance_id}")
+            logger.error("Failed to retry workflow %s", instance_id)
+            self._record_result(project_code, workflow, 'error', "Retry request failed")
 
         return success
 
+    def _record_result(self, project_code: int, workflow: Dict, outcome: str, reason: str):
+        """
+        记录本轮检查中一个实例的处理结果
+
+        Args:
+            project_code: 项目代码
+            workflow: 工作流实例信息
+            outcome: 处理结果（retried / skipped / held / deferred / error / manual）
+            reason: 原因说明
+        """
+        with self._state_lock:
+            self._cycle_results.append({
+                'project_code': project_code,
+                'instance_id': workflow.get('id'),
+                'name': workflow.get('name', 'Unknown'),
+                'outcome': outcome,
+                'reason': reason,
+                'time': time.time()
+            })
+
+    def manual_retry(self, project_code: int, instance_id: int, failed_tasks: bool = False) -> bool:
+        """
+        手动重试工作流实例（不做任务验证，计入重试记录）
+
+        Args:
+            project_code: 项目代码
+            instance_id: 工作流实例 ID
+            failed_tasks: 是否只重跑失败的任务
+
+        Returns:
+            是否重试成功
+        """
+        execute_type = self.EXECUTE_FAILURE_TASK if failed_tasks else self.EXECUTE_REPEAT_RUNNING
+        success = self.client.retry_workflow_instance(
+            project_code=project_code,
+            instance_id=instance_id,
+            execute_type=execute_type
+        )
+
+        workflow = {'id': instance_id, 'name': 'Unknown'}
+        if success:
+            with self._state_lock:
+                self.retry_records[instance_id] = self.retry_records.get(instance_id, 0) + 1
+                self.last_retry_at[instance_id] = time.time()
+            logger.info(
+                "Manually retried workflow %s (Execute type: %s)", instance_id, execute_type,
+                extra={'event': 'workflow_retry_manual'}
+            )
+            self._record_result(project_code, workflow, 'manual', execute_type)
+        else:
+            logger.error("Failed to manually retry workflow %s", instance_id)
+
+        return success
+
+    def _notify_once(self, event: str, project_code: int, workflow: Dict, reason: str):
+        """
+        发送实例级事件通知（同一实例的同类事件只发送一次）
+
+        Args:
+            event: 事件类型
+            project_code: 项目代码
+            workflow: 工作流实例信息
+            reason: 原因说明
+        """
+        key = (event, workflow.get('id'))
+        if not self.notifier or key in self._notified:
+            return
+
+        self._notified.add(key)
+        self.notifier.notify(
+            event,
+            project_code=project_code,
+            instance_id=workflow.get('id'),
+            name=workflow.get('name', 'Unknown'),
+            reason=reason
+        )
+
+    def request_shutdown(self):
+        """请求停止监控（可在信号处理函数中调用），会立即打断正在进行的等待"""
+        self.shutdown_event.set()
+
+    def _sleep(self, seconds: float) -> bool:
+        """
+        可被停止请求打断的等待
+
+        Args:
+            seconds: 等待秒数
+
+        Returns:
+            是否收到停止请求
+        """
+        return self.shutdown_event.wait(seconds) if seconds > 0 else self.shutdown_event.is_set()
+
+    def save_checkpoint(self):
+        """保存当前进度（当前项目、待处理队列和重试次数）到检查点文件"""
+        if not self.checkpoint:
+            return
+
+        with self._state_lock:
+            state = {
+                'project_codes': list(self._project_codes),
+                'project_index': self._project_index,
+                'pending': list(self._pending) + list(self._deferred),
+                'retry_records': dict(self.retry_records),
+                'last_retry_at': dict(self.last_retry_at)
+            }
+
+        self.checkpoint.save(state)
+
+    def restore_retry_records(self) -> Optional[Dict]:
+        """
+        从检查点恢复重试次数和上次重试时间（不恢复扫描进度，生成重试计划时也会调用）
+
+        Returns:
+            检查点状态，没有检查点时返回 None
+        """
+        state = self.checkpoint.load() if self.checkpoint else None
+        if not state:
+            return None
+
+        # JSON 的键是字符串，恢复为实例 ID
+        with self._state_lock:
+            for instance_id, count in state.get('retry_records', {}).items():
+                self.retry_records[int(instance_id)] = max(self.retry_records.get(int(instance_id), 0), count)
+            for instance_id, retried_at in state.get('last_retry_at', {}).items():
+                self.last_retry_at[int(instance_id)] = max(self.last_retry_at.get(int(instance_id), 0), retried_at)
+
+        return state
+
+    def _restore_checkpoint(self, project_codes: List[int]) -> bool:
+        """
+        从检查点恢复进度
+
+        Args:
+            project_codes: 本次监控的项目代码列表
+
+        Returns:
+            是否恢复了未完成的项目进度
+        """
+        state = self.restore_retry_records()
+        if not state:
+            return False
+
+        saved_codes = state.get('project_codes', [])
+        if sorted(saved_codes) != sorted(project_codes) or not (state.get('pending') or state.get('project_index')):
+            logger.info("Restored retry records for %d instances from checkpoint", len(self.retry_records))
+            return False
+
+        # 按检查点中的项目顺序继续：先扫描剩余项目，再处理待重试队列
+        self._project_codes = list(saved_codes)
+        self._project_index = state.get('project_index', 0)
+        self._pending = list(state.get('pending', []))
+        logger.info(
+            "Resuming from checkpoint: %d/%d projects scanned, %d pending workflows",
+            self._project_index, len(self._project_codes), len(self._pending)
+        )
+        return True
+
+    def save_state(self):
+        """保存热启动缓存（项目代码、工作流指纹和判定结果、扫描水位）"""
+        if not self.state_store:
+            return
+
+        state = {
+            'project_codes': dict(self.project_code_cache),
+            'verdicts': dict(self.verdict_cache),
+            'watermarks': dict(self.watermarks)
+        }
+        if self.outcomes:
+            state['outcomes'] = self.outcomes.export_state()
+
+        self.state_store.save(state)
+
+    def load_state(self) -> bool:
+        """
+        加载上次退出时保存的缓存
+
+        Returns:
+            是否加载成功
+        """
+        state = self.state_store.load() if self.state_store else None
+        if not state:
+            return False
+
+        # JSON 的键是字符串，恢复为整数代码/ID
+        self.project_code_cache.update(state.get('project_codes', {}))
+        self.verdict_cache.update({int(k): v for k, v in state.get('verdicts', {}).items()})
+        self.watermarks.update({int(k): v for k, v in state.get('watermarks', {}).items()})
+        if self.outcomes and state.get('outcomes'):
+            self.outcomes.restore_state(state['outcomes'])
+
+        logger.info(
+            "Warm start: loaded %d project codes, %d verdicts, %d watermarks",
+            len(self.project_code_cache), len(self.verdict_cache), len(self.watermarks)
+        )
+        return True
+
+    def resolve_project_codes(self, project_names: List[str]) -> List[int]:
+        """
+        将项目名称解析为项目代码（优先使用缓存）
+
+        Args:
+            project_names: 项目名称列表
+
+        Returns:
+            项目代码列表（无法解析的名称会被忽略）
+        """
+        missing = [name for name in project_names if name not in self.project_code_cache]
+
+        page_no = 1
+        page_size = 100
+        while missing:
+            projects = self.client.get_projects(page_no=page_no, page_size=page_size)
+            for project in projects or []:
+                if project.get('name') in missing:
+                    self.project_code_cache[project['name']] = project['code']
+                    missing.remove(project['name'])
+
+            if not projects or len(projects) < page_size:
+                break
+            page_no += 1
+
+        for name in missing:
+            logger.warning("Project %s not found", name)
+
+        return [self.project_code_cache[name] for name in project_names if name in self.project_code_cache]
+
+    def _ramp_up_order(self, project_codes: List[int]) -> List[int]:
+        """
+        首轮检查的项目顺序：从未扫描或最久未扫描的项目优先
+
+        Args:
+            project_codes: 项目代码列表
+
+        Returns:
+            排序后的项目代码列表
+        """
+        return sorted(project_codes, key=lambda code: self.watermarks.get(code, 0))
+
+    def order_candidates(self, candidates: List[Dict]) -> tuple[List[Dict], Dict[int, str]]:
+        """
+        确定本轮候选工作流的重试顺序
+
+        Args:
+            candidates: 候选列表，元素为 {'project_code': 项目代码, 'workflow': 工作流实例}
+
+        Returns:
+            (排序后的候选列表, 实例 ID -> 暂缓原因)
+        """
+        held: Dict[int, str] = {}
+        if self.dependencies:
+            candidates, held = self.dependencies.order(candidates)
+
+        if not self.priority:
+            return list(candidates), held
+
+        # 按优先级出队，优先级相同时保持依赖顺序
+        queue = RetryQueue()
+        for candidate in candidates:
+            candidate['priority'] = self.priority.priority(candidate['project_code'], candidate['workflow'])
+            queue.push(candidate['priority'], candidate)
+
+        return queue.drain(), held
+
+    def _scan_projects(self, start_date: Optional[str], end_date: Optional[str], ramp_up_step: float):
+        """
+        扫描剩余项目，把失败的工作流加入待处理队列
+
+        Args:
+            start_date: 开始日期（可选）
+            end_date: 结束日期（可选）
+            ramp_up_step: 项目之间的等待时间（秒，首轮分散执行时使用）
+        """
+        # 大时间范围：按时间片并发扫描剩余项目（进度由回溯扫描器自己的检查点保存）
+        if self.backfill and start_date and end_date and self._project_index < len(self._project_codes):
+            candidates = self.backfill.scan(
+                self._project_codes[self._project_index:],
+                start_date,
+                end_date,
+                stop_event=self.shutdown_event
+            )
+            if self.shutdown_event.is_set():
+                return
+
+            now = time.time()
+            # 有时间片扫描失败的项目不更新水位线
+            incomplete = {time_slice['project_code'] for time_slice in self.backfill.failed_slices()}
+            with self._state_lock:
+                for candidate in candidates:
+                    project_code = candidate['project_code']
+                    self._cycle_failed[project_code] = self._cycle_failed.get(project_code, 0) + 1
+                self._pending.extend(candidates)
+                for project_code in self._project_codes[self._project_index:]:
+                    if project_code not in incomplete:
+                        self.watermarks[project_code] = now
+                self._project_index = len(self._project_codes)
+            return
+
+        while self._project_index < len(self._project_codes) and not self.shutdown_event.is_set():
+            project_code = self._project_codes[self._project_index]
+
+            try:
+                failed_workflows = self.get_failed_workflows(
+                    project_code=project_code,
+                    start_date=start_date,
+                    end_date=end_date
+                )
+                self.watermarks[project_code] = time.time()
+
+                with self._state_lock:
+                    self._cycle_failed[project_code] = len(failed_workflows)
+                    self._pending.extend(
+                        {'project_code': project_code, 'workflow': workflow}
+                        for workflow in failed_workflows
+                    )
+
+            except Exception as e:
+                logger.error("Error monitoring project %s: %s", project_code, e)
+
+            with self._state_lock:
+                self._project_index += 1
+
+            if ramp_up_step and self._project_index < len(self._project_codes):
+                self._sleep(ramp_up_step)
+
+    def _retry_pending(self, held: Dict[int, str], retried_count: int) -> int:
+        """
+        依次处理待处理队列中的工作流
+
+        Args:
+            held: 需要暂缓重试的实例 ID -> 原因
+            retried_count: 本轮已经执行的重试次数
+
+        Returns:
+            本轮累计执行的重试次数
+        """
+        while self._pending and not self.shutdown_event.is_set():
+            if self.max_retries_per_cycle and retried_count >= self.max_retries_per_cycle:
+                logger.info(
+                    "Reached max retries per cycle (%d), deferring %d workflows to next cycle",
+                    self.max_retries_per_cycle, len(self._pending) + len(self._deferred)
+                )
+                with self._state_lock:
+                    self._pending = []
+                    self._deferred = []
+                break
+
+            candidate = self._pending[0]
+            project_code = candidate['project_code']
+            workflow = candidate['workflow']
+            retried = False
+
+            if workflow.get('id') in held:
+                logger.info(
+                    "Holding retry for workflow %s (ID: %s): %s",
+                    workflow.get('name', 'Unknown'), workflow.get('id'), held[workflow.get('id')],
+                    extra={'event': 'workflow_retry_held'}
+                )
+                self._record_result(project_code, workflow, 'held', held[workflow.get('id')])
+            else:
+                try:
+                    retried = self.retry_failed_workflow(project_code, workflow)
+                except Exception as e:
+                    logger.error(
+                        "Error retrying workflow %s: %s", workflow.get('id'), e
+                    )
+
+            with self._state_lock:
+                self._pending.pop(0)
+
+            if retried:
+                retried_count += 1
+                if self.dependencies:
+                    self.dependencies.note_retry(project_code, workflow)
+
+                # 每次重试后保存检查点，避免重启后重复重试
+                self.save_checkpoint()
+
+                # 重试之间添加间隔
+                self._sleep(self.retry_interval)
+
+        return retried_count
+
+    def _process_pending(self):
+        """
+        按顺序处理待处理队列中的工作流
+
+        暂缓的下游工作流和超出本轮重试上限的工作流留到下一轮；因集群繁忙被推迟的重试
+        会在集群恢复后自动继续，等待超过 admission.max_wait 时留到下一轮。
+        """
+        # 排序可能需要请求 API（工作流定义、上游实例状态），在锁外对副本排序，
+        # 避免慢请求阻塞读取队列快照和保存检查点的线程
+        with self._state_lock:
+            snapshot = [dict(candidate) for candidate in self._pending]
+        ordered, held = self.order_candidates(snapshot)
+        with self._state_lock:
+            self._pending = ordered
+
+        retried_count = self._retry_pending(held, 0)
+        waited = 0.0
+
+        while self._deferred and not self.shutdown_event.is_set():
+            if waited >= self.admission.max_wait:
+                logger.info(
+                    "Cluster still busy after %d seconds, deferring %d retries to next cycle",
+                    waited, len(self._deferred)
+                )
+                with self._state_lock:
+                    self._deferred = []
+                break
+
+            if self._sleep(self.admission.poll_interval):
+                break
+            waited += self.admission.poll_interval
+
+            admitted, _ = self.admission.admit()
+            if admitted:
+                with self._state_lock:
+                    self._pending, self._deferred = self._deferred, []
+                retried_count = self._retry_pending(held, retried_count)
+
     def monitor_and_retry(
         self,
         project_codes: List[int],
@@ -301,7 +1232,9 @@ class WorkflowMonitor:
         continuous: bool = False
     ):
         """
-        监控并重试失败的工作流
+        监控并重试失败的工作流（收到停止请求时保存检查点并尽快返回）
+
+        每轮检查先扫描所有项目，再按依赖关系排序后依次重试。
 
         Args:
             project_codes: 项目代码列表
@@ -309,52 +1242,217 @@ class WorkflowMonitor:
             end_date: 结束日期（可选）
             continuous: 是否持续监控
         """
-        logger.info(f"Starting workflow monitoring for projects: {project_codes}")
-
-        while True:
-            for project_code in project_codes:
-                try:
-                    # 获取失败的工作流
-                    failed_workflows = self.get_failed_workflows(
-                        project_code=project_code,
-                        start_date=start_date,
-                        end_date=end_date
+        logger.info("Starting workflow monitoring for projects: %s", project_codes)
+
+        self._project_index = 0
+        self._pending = []
+        self._deferred = []
+        resumed = self._restore_checkpoint(project_codes)
+
+        # 首轮检查分散到 ramp_up_window 内，避免多个副本同时冲击 API
+        ramp_up_step = 0
+        if not resumed:
+            if self.ramp_up_window > 0 and len(project_codes) > 1:
+                self._project_codes = self._ramp_up_order(project_codes)
+                ramp_up_step = self.ramp_up_window / len(project_codes)
+                self._sleep(random.uniform(0, ramp_up_step))
+            else:
+                self._project_codes = list(project_codes)
+
+        try:
+            while not self.shutdown_event.is_set():
+                cycle_started = time.monotonic()
+                cycle_started_at = time.time()
+                with self._state_lock:
+                    self._cycle_failed = {}
+                    self._cycle_results = []
+
+                # 检查之前发起的重试是否已经成功
+                if self.outcomes:
+                    try:
+                        self.outcomes.poll()
+                    except Exception as e:
+                        logger.error("Error polling retry outcomes: %s", e)
+
+                self._scan_projects(start_date, end_date, ramp_up_step)
+                cycle_instances = {candidate['workflow'].get('id') for candidate in self._pending}
+
+                if not self.shutdown_event.is_set():
+                    self._process_pending()
+
+                if self.shutdown_event.is_set():
+                    logger.info("Shutdown requested, saving checkpoint")
+                    self.save_checkpoint()
+                    break
+
+                # 一轮检查的耗时超过检查间隔时，下一轮会被推迟
+                cycle_seconds = time.monotonic() - cycle_started
+                if continuous and cycle_seconds > self.check_interval:
+                    logger.warning(
+                        "Monitoring cycle took %.0f seconds, longer than check interval (%d seconds)",
+                        cycle_seconds, self.check_interval,
+                        extra={'event': 'monitor_cycle_overrun'}
                     )
+                    if self.notifier:
+                        self.notifier.notify(
+                            Notifier.EVENT_CYCLE_OVERRUN,
+                            cycle_seconds=round(cycle_seconds, 1),
+                            check_interval=self.check_interval
+                        )
+
+                self._finish_cycle(cycle_started_at, cycle_seconds)
+
+                # 一轮完整检查结束：清理不再失败的实例的判定缓存，恢复正常项目顺序
+                for instance_id in set(self.verdict_cache) - cycle_instances:
+                    del self.verdict_cache[instance_id]
+
+                ramp_up_step = 0
+                with self._state_lock:
+                    self._project_codes = list(project_codes)
+                    self._project_index = 0
+                self.save_checkpoint()
+                self.save_state()
+
+                # 如果不是持续监控，退出循环
+                if not continuous:
+                    break
+
+                # 等待下一次检查
+                logger.info("Waiting %d seconds before next check...", self.check_interval)
+                if self._sleep(self.check_interval):
+                    logger.info("Shutdown requested during wait, stopping")
+                    break
+        finally:
+            self.save_state()
+
+    def _finish_cycle(self, started_at: float, duration: float):
+        """
+        保存最近一轮完成的检查摘要
 
-                    # 重试失败的工作流
-                    for workflow in failed_workflows:
-                        try:
-                            self.retry_failed_workflow(project_code, workflow)
+        Args:
+            started_at: 开始时间戳
+            duration: 耗时（秒）
+        """
+        with self._state_lock:
+            outcomes: Dict[str, int] = {}
+            for result in self._cycle_results:
+                outcomes[result['outcome']] = outcomes.get(result['outcome'], 0) + 1
+
+            self.last_cycle = {
+                'started_at': started_at,
+                'finished_at': time.time(),
+                'duration': round(duration, 3),
+                'failed_workflows': dict(self._cycle_failed),
+                'outcomes': outcomes,
+                'results': list(self._cycle_results)
+            }
 
-                            # 重试之间添加间隔
-                            if self.retry_interval > 0:
-                                time.sleep(self.retry_interval)
+    def get_status_snapshot(self) -> Dict:
+        """
+        根据内存中的状态生成各项目的状态摘要（不访问 API）
 
-                        except Exception as e:
-                            logger.error(
-                                f"Error retrying workflow {workflow.get('id')}: {str(e)}"
-                            )
+        Returns:
+            项目代码 -> {'failed', 'retried', 'skipped', 'held', 'last_scan'}
+        """
+        with self._state_lock:
+            cycle = self.last_cycle
+            project_codes = list(self._project_codes) or list(cycle.get('failed_workflows', {}))
+
+        snapshot = {}
+        for project_code in project_codes:
+            results = [r for r in cycle.get('results', []) if r['project_code'] == project_code]
+            snapshot[project_code] = {
+                'failed': cycle.get('failed_workflows', {}).get(project_code, 0),
+                'retried': sum(1 for r in results if r['outcome'] == 'retried'),
+                'skipped': sum(1 for r in results if r['outcome'] == 'skipped'),
+                'held': sum(1 for r in results if r['outcome'] in ('held', 'deferred')),
+                'last_scan': self.watermarks.get(project_code)
+            }
 
-                except Exception as e:
-                    logger.error(f"Error monitoring project {project_code}: {str(e)}")
+        return snapshot
 
-            # 如果不是持续监控，退出循环
-            if not continuous:
-                break
+    def get_queue_snapshot(self) -> List[Dict]:
+        """
+        获取当前的待处理队列（包括因集群繁忙被推迟的重试）
+
+        Returns:
+            队列列表，元素为 {'project_code', 'instance_id', 'name', 'priority', 'deferred'}
+        """
+        with self._state_lock:
+            entries = [(c, False) for c in self._pending] + [(c, True) for c in self._deferred]
+
+        return [
+            {
+                'project_code': candidate['project_code'],
+                'instance_id': candidate['workflow'].get('id'),
+                'name': candidate['workflow'].get('name', 'Unknown'),
+                'priority': candidate.get('priority'),
+                'deferred': deferred
+            }
+            for candidate, deferred in entries
+        ]
 
-            # 等待下一次检查
-            logger.info(f"Waiting {self.check_interval} seconds before next check...")
-            time.sleep(self.check_interval)
+    def memory_structures(self) -> Dict[str, Callable[[], Any]]:
+        """
+        列出监控器及其组件中常驻内存的结构（用于内存诊断）
 
-    def get_workflow_status_summary(self, project_code: int) -> Dict[str, int]:
+        Returns:
+            结构名称 -> 返回结构对象的函数
+        """
+        structures = {
+            'monitor.retry_records': lambda: self.retry_records,
+            'monitor.last_retry_at': lambda: self.last_retry_at,
+            'monitor.permanent_failures': lambda: self.permanent_failures,
+            'monitor.notified': lambda: self._notified,
+            'monitor.verdict_cache': lambda: self.verdict_cache,
+            'monitor.project_code_cache': lambda: self.project_code_cache,
+            'monitor.watermarks': lambda: self.watermarks,
+            'monitor.pending': lambda: self._pending,
+            'monitor.deferred': lambda: self._deferred,
+            'monitor.last_cycle_results': lambda: self.last_cycle.get('results', [])
+        }
+
+        client_structures = getattr(self.client, 'memory_structures', None)
+        if callable(client_structures):
+            structures.update(client_structures())
+        if self.dependencies:
+            structures['dependencies.upstreams'] = lambda: self.dependencies._upstreams
+            structures['dependencies.retried'] = lambda: self.dependencies._retried
+        if self.policies:
+            structures['policies.cache'] = lambda: self.policies._cache
+        if self.classifier:
+            structures['classifier.cache'] = lambda: self.classifier._cache
+        if self.sub_workflows:
+            structures['sub_workflows.child_ids'] = lambda: self.sub_workflows._child_ids
+        if self.outcomes:
+            structures['outcomes.pending'] = lambda: self.outcomes.pending
+            structures['outcomes.workflows'] = lambda: self.outcomes.workflows
+
+        return structures
+
+    def get_workflow_status_summary(
+        self,
+        project_code: int,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        page_size: int = 100,
+        max_pages: Optional[int] = None
+    ) -> Dict[str, int]:
         """
-        获取工作流状态摘要
+        获取工作流状态摘要（逐页统计所有实例）
 
         Args:
             project_code: 项目代码
+            start_date: 开始日期（可选）
+            end_date: 结束日期（可选）
+            page_size: 每页大小
+            max_pages: 最多统计的页数（可选，默认不限制）
 
         Returns:
             状态摘要字典
+
+        Raises:
+            RuntimeError: 某一页请求失败（不返回不完整的统计）
         """
         summary = {
             'total': 0,
@@ -364,14 +1462,15 @@ class WorkflowMonitor:
             'other': 0
         }
 
-        workflows = self.client.get_workflow_instances(
+        workflows = self.client.iter_workflow_instances(
             project_code=project_code,
-            page_size=100
+            page_size=page_size,
+            max_pages=max_pages,
+            strict=True,
+            start_date=start_date,
+            end_date=end_date
         )
 
-        if not workflows:
-            return summary
-
         for workflow in workflows:
             state = workflow.get('state', '')
             summary['total'] += 1
@@ -394,20 +1493,35 @@ class WorkflowMonitor:
         Returns:
             重试统计字典
         """
-        if not self.retry_records:
-            return {
+        # HTTP API 在其他线程中读取，在锁内复制，返回的结果不会随后续重试变化
+        with self._state_lock:
+            retry_records = dict(self.retry_records)
+            saved_task_hours = self.saved_task_hours
+            permanent_failures = len(self.permanent_failures)
+
+        if not retry_records:
+            stats = {
                 'total_retried': 0,
                 'max_retries': 0,
-                'avg_retries': 0
+                'avg_retries': 0,
+                'saved_task_hours': 0,
+                'permanent_failures': permanent_failures
+            }
+        else:
+            total_retried = len(retry_records)
+            max_retries = max(retry_records.values())
+            avg_retries = sum(retry_records.values()) / total_retried
+
+            stats = {
+                'total_retried': total_retried,
+                'max_retries': max_retries,
+                'avg_retries': round(avg_retries, 2),
+                'saved_task_hours': round(saved_task_hours, 3),
+                'permanent_failures': permanent_failures,
+                'retry_details': retry_records
             }
 
-        total_retried = len(self.retry_records)
-        max_retries = max(self.retry_records.values())
-        avg_retries = sum(self.retry_records.values()) / total_retried
+        if self.outcomes:
+            stats['outcomes'] = self.outcomes.statistics()
 
-        return {
-            'total_retried': total_retried,
-            'max_retries': max_retries,
-            'avg_retries': round(avg_retries, 2),
-            'retry_details': self.retry_records
-        }
+        return stats
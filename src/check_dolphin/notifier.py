@@ -0,0 +1,231 @@
+"""
+Notification Pipeline
+通过后台队列异步发送通知，按时间窗口合并为摘要消息，发送失败时自动重试
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import requests
+
+
+logger = logging.getLogger(__name__)
+
+
+class Notifier:
+    """批量异步通知器（同一时间窗口内的事件合并为一条摘要消息）"""
+
+    EVENT_RETRY_ISSUED = 'retry_issued'
+    EVENT_RETRY_EXHAUSTED = 'retry_exhausted'
+    EVENT_PERMANENT_FAILURE = 'permanent_failure'
+    EVENT_CYCLE_OVERRUN = 'cycle_overrun'
+
+    EVENT_TITLES = {
+        EVENT_RETRY_ISSUED: 'Retries issued',
+        EVENT_RETRY_EXHAUSTED: 'Retries exhausted',
+        EVENT_PERMANENT_FAILURE: 'Permanent failures',
+        EVENT_CYCLE_OVERRUN: 'Cycle overruns'
+    }
+
+    def __init__(
+        self,
+        webhook_url: str,
+        window: float = 60,
+        events: Optional[List[str]] = None,
+        max_items: int = 20,
+        max_attempts: int = 3,
+        backoff: float = 2,
+        timeout: int = 10,
+        queue_size: int = 10000
+    ):
+        """
+        初始化通知器
+
+        Args:
+            webhook_url: Webhook 地址（POST JSON）
+            window: 摘要时间窗口（秒），窗口内的事件合并为一条消息
+            events: 需要通知的事件类型列表（可选，默认全部）
+            max_items: 每条摘要消息中最多列出的事件明细数量
+            max_attempts: 发送失败时的最大尝试次数
+            backoff: 重试等待的初始时间（秒），每次翻倍
+            timeout: 请求超时时间（秒）
+            queue_size: 事件队列容量，队列满时丢弃新事件
+        """
+        self.webhook_url = webhook_url
+        self.window = window
+        self.events = set(events) if events else None
+        self.max_items = max_items
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.timeout = timeout
+
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stats = {'events': 0, 'dropped': 0, 'messages_sent': 0, 'messages_failed': 0}
+
+    def start(self):
+        """启动后台发送线程"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='notifier', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10):
+        """
+        停止后台线程（尚未发送的事件立即合并发送）
+
+        Args:
+            timeout: 等待发送完成的最长时间（秒）
+        """
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def notify(self, event: str, **fields):
+        """
+        提交事件（不阻塞调用方）
+
+        Args:
+            event: 事件类型
+            **fields: 事件明细（工作流名称、实例 ID、原因等）
+        """
+        if self.events is not None and event not in self.events:
+            return
+
+        try:
+            self._queue.put_nowait({'event': event, 'time': time.time(), **fields})
+        except queue.Full:
+            with self._lock:
+                self._stats['dropped'] += 1
+            return
+
+        with self._lock:
+            self._stats['events'] += 1
+
+    def _collect(self) -> List[Dict]:
+        """
+        等待第一个事件，然后收集同一时间窗口内的所有事件
+
+        Returns:
+            事件列表（停止时可能为空）
+        """
+        batch = []
+
+        while not batch:
+            try:
+                batch.append(self._queue.get(timeout=0.2))
+            except queue.Empty:
+                if self._stop_event.is_set():
+                    return batch
+
+        deadline = time.monotonic() + self.window
+        while not self._stop_event.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=min(remaining, 0.2)))
+            except queue.Empty:
+                continue
+
+        # 停止或窗口结束时，取出队列中剩余的事件
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                return batch
+
+    def build_digest(self, batch: List[Dict]) -> Dict:
+        """
+        把一批事件合并为一条摘要消息
+
+        Args:
+            batch: 事件列表
+
+        Returns:
+            消息体
+        """
+        counts = Counter(item['event'] for item in batch)
+        started = datetime.fromtimestamp(min(item['time'] for item in batch))
+        ended = datetime.fromtimestamp(max(item['time'] for item in batch))
+
+        lines = [
+            f"check-dolphin: {len(batch)} events "
+            f"({started.strftime('%Y-%m-%d %H:%M:%S')} - {ended.strftime('%H:%M:%S')})"
+        ]
+        for event, count in counts.most_common():
+            lines.append(f"- {self.EVENT_TITLES.get(event, event)}: {count}")
+
+        for item in batch[:self.max_items]:
+            details = ', '.join(
+                f"{key}={value}" for key, value in item.items() if key not in ('event', 'time')
+            )
+            lines.append(f"  [{item['event']}] {details}")
+        if len(batch) > self.max_items:
+            lines.append(f"  ... and {len(batch) - self.max_items} more")
+
+        return {
+            'text': '\n'.join(lines),
+            'counts': dict(counts),
+            'events': batch[:self.max_items]
+        }
+
+    def _deliver(self, payload: Dict) -> bool:
+        """
+        发送消息（失败时按指数退避重试）
+
+        Args:
+            payload: 消息体
+
+        Returns:
+            是否发送成功
+        """
+        delay = self.backoff
+
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                response = requests.post(self.webhook_url, json=payload, timeout=self.timeout)
+                response.raise_for_status()
+                return True
+            except requests.exceptions.RequestException as e:
+                logger.warning(
+                    "Notification delivery failed (attempt %d/%d): %s", attempt, self.max_attempts, e
+                )
+
+            if attempt < self.max_attempts:
+                time.sleep(delay)
+                delay *= 2
+
+        return False
+
+    def _run(self):
+        """后台线程：按时间窗口收集事件并发送摘要"""
+        while True:
+            batch = self._collect()
+            if batch:
+                delivered = self._deliver(self.build_digest(batch))
+                with self._lock:
+                    self._stats['messages_sent' if delivered else 'messages_failed'] += 1
+
+            if self._stop_event.is_set() and self._queue.empty():
+                return
+
+    def get_stats(self) -> Dict:
+        """
+        获取通知统计
+
+        Returns:
+            统计字典
+        """
+        with self._lock:
+            return dict(self._stats)
@@ -0,0 +1,320 @@
+"""
+Retry Outcome Tracking
+跟踪已发起重试的结果（按项目批量轮询，轮询间隔逐步拉长），统计恢复耗时和各工作流的重试成功率
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .api_client import DolphinSchedulerClient
+from .memory import BoundedDict
+
+
+logger = logging.getLogger(__name__)
+
+
+class OutcomeTracker:
+    """重试结果跟踪器"""
+
+    STATE_SUCCESS = 'SUCCESS'
+    FAILED_STATES = {'FAILURE', 'STOP', 'KILL'}
+
+    def __init__(
+        self,
+        client: DolphinSchedulerClient,
+        poll_interval: float = 60,
+        max_poll_interval: float = 1800,
+        backoff: float = 2,
+        batch_size: int = 100,
+        min_attempts: int = 3,
+        min_success_rate: float = 0,
+        half_life: float = 86400,
+        max_entries: int = 50000
+    ):
+        """
+        初始化重试结果跟踪器
+
+        Args:
+            client: DolphinScheduler API 客户端
+            poll_interval: 重试后首次检查结果的等待时间（秒）
+            max_poll_interval: 轮询间隔上限（秒）
+            backoff: 每次检查仍在运行时轮询间隔的增长倍数
+            batch_size: 每个项目批量查询的最近实例数量
+            min_attempts: 判断重试是否值得之前至少需要的重试结果数量
+            min_success_rate: 重试成功率下限（0-1，低于此值的工作流不再重试，0 表示不限制）
+            half_life: 判断成功率时历史结果权重减半的时间（秒，0 表示不衰减）；被跳过的工作流没有新的结果，
+                旧结果衰减到不足 min_attempts 次后会重新尝试重试
+            max_entries: 待确认重试和工作流统计各自的最大条目数（超过时淘汰最久未更新的，0 表示不限制）
+        """
+        self.client = client
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.backoff = backoff
+        self.batch_size = batch_size
+        self.min_attempts = min_attempts
+        self.min_success_rate = min_success_rate
+        self.half_life = half_life
+
+        # 实例 ID -> 待确认的重试
+        self.pending: Dict[int, Dict] = BoundedDict(max_entries)
+        # 工作流名称 -> {'attempts', 'successes', 'recovery_seconds',
+        #               'recent_attempts', 'recent_successes', 'updated_at'（按半衰期衰减的统计）}
+        self.workflows: Dict[str, Dict] = BoundedDict(max_entries)
+        # 监控线程写入，HTTP API 线程读取统计
+        self._lock = threading.Lock()
+
+    def track(self, project_code: int, workflow: Dict, now: Optional[float] = None):
+        """
+        开始跟踪一次已发起的重试
+
+        Args:
+            project_code: 项目代码
+            workflow: 工作流实例信息
+            now: 当前时间戳（可选）
+        """
+        now = now if now is not None else time.time()
+
+        with self._lock:
+            # 上次重试的结果尚未确认就再次失败
+            if workflow.get('id') in self.pending:
+                self._record(workflow.get('id'), False, now)
+
+            self.pending[workflow.get('id')] = {
+                'project_code': project_code,
+                'name': workflow.get('name', 'Unknown'),
+                'issued_at': now,
+                'interval': self.poll_interval,
+                'next_poll': now + self.poll_interval
+            }
+
+    def _record(self, instance_id: int, succeeded: bool, now: float):
+        """
+        记录一次重试结果（调用方需持有 _lock）
+
+        Args:
+            instance_id: 工作流实例 ID
+            succeeded: 是否成功
+            now: 当前时间戳
+        """
+        entry = self.pending.pop(instance_id)
+        stats = self.workflows.setdefault(
+            entry['name'], {'attempts': 0, 'successes': 0, 'recovery_seconds': 0.0}
+        )
+        recent_attempts, recent_successes = self._recent(stats, now)
+        stats['recent_attempts'] = recent_attempts + 1
+        stats['recent_successes'] = recent_successes + (1 if succeeded else 0)
+        stats['updated_at'] = now
+        stats['attempts'] += 1
+
+        if succeeded:
+            recovery_seconds = now - entry['issued_at']
+            stats['successes'] += 1
+            stats['recovery_seconds'] += recovery_seconds
+            logger.info(
+                "Retried workflow %s (ID: %s) recovered after %.0f seconds",
+                entry['name'], instance_id, recovery_seconds,
+                extra={'event': 'workflow_retry_recovered'}
+            )
+        else:
+            logger.warning(
+                "Retried workflow %s (ID: %s) failed again", entry['name'], instance_id,
+                extra={'event': 'workflow_retry_failed_again'}
+            )
+
+    def _fetch_states(self, project_code: int, instance_ids: List[int]) -> Dict[int, str]:
+        """
+        批量获取一个项目中实例的当前状态（最近实例列表中没有的再逐个查询）
+
+        Args:
+            project_code: 项目代码
+            instance_ids: 实例 ID 列表
+
+        Returns:
+            实例 ID -> 状态
+        """
+        wanted = set(instance_ids)
+        states = {}
+
+        for workflow in self.client.get_workflow_instances(
+            project_code=project_code, page_size=self.batch_size
+        ) or []:
+            if workflow.get('id') in wanted:
+                states[workflow['id']] = workflow.get('state')
+
+        for instance_id in wanted - set(states):
+            instance = self.client.get_workflow_instance(project_code=project_code, instance_id=instance_id)
+            if instance:
+                states[instance_id] = instance.get('state')
+
+        return states
+
+    def poll(self, now: Optional[float] = None) -> int:
+        """
+        检查到期的重试结果（每个项目一次批量查询，仍在运行的实例拉长下次轮询间隔）
+
+        Args:
+            now: 当前时间戳（可选）
+
+        Returns:
+            本次确认结果的数量
+        """
+        now = now if now is not None else time.time()
+
+        due: Dict[int, List[int]] = {}
+        with self._lock:
+            for instance_id, entry in self.pending.items():
+                if entry['next_poll'] <= now:
+                    due.setdefault(entry['project_code'], []).append(instance_id)
+
+        resolved = 0
+        for project_code, instance_ids in due.items():
+            # 查询状态时不持有锁
+            states = self._fetch_states(project_code, instance_ids)
+
+            with self._lock:
+                for instance_id in instance_ids:
+                    if instance_id not in self.pending:
+                        continue
+
+                    state = states.get(instance_id)
+                    if state == self.STATE_SUCCESS:
+                        self._record(instance_id, True, now)
+                        resolved += 1
+                    elif state in self.FAILED_STATES:
+                        self._record(instance_id, False, now)
+                        resolved += 1
+                    else:
+                        entry = self.pending[instance_id]
+                        entry['interval'] = min(entry['interval'] * self.backoff, self.max_poll_interval)
+                        entry['next_poll'] = now + entry['interval']
+
+        return resolved
+
+    def success_rate(self, workflow_name: str) -> Optional[float]:
+        """
+        获取工作流的重试成功率
+
+        Args:
+            workflow_name: 工作流名称
+
+        Returns:
+            成功率，没有重试结果时返回 None
+        """
+        stats = self.workflows.get(workflow_name)
+        if not stats or not stats['attempts']:
+            return None
+
+        return stats['successes'] / stats['attempts']
+
+    def _recent(self, stats: Dict, now: float) -> Tuple[float, float]:
+        """
+        获取按半衰期衰减到当前时间的 (重试次数, 成功次数)
+
+        Args:
+            stats: 工作流统计
+            now: 当前时间戳
+
+        Returns:
+            (衰减后的重试次数, 衰减后的成功次数)
+        """
+        attempts = stats.get('recent_attempts', stats['attempts'])
+        successes = stats.get('recent_successes', stats['successes'])
+        updated_at = stats.get('updated_at')
+
+        if self.half_life and updated_at is not None and now > updated_at:
+            factor = 0.5 ** ((now - updated_at) / self.half_life)
+            attempts *= factor
+            successes *= factor
+
+        return attempts, successes
+
+    def worth_retrying(self, workflow_name: str, now: Optional[float] = None) -> Tuple[bool, str]:
+        """
+        根据近期的重试成功率判断是否值得重试（历史结果按半衰期衰减，过低的成功率不会永久阻止重试）
+
+        Args:
+            workflow_name: 工作流名称
+            now: 当前时间戳（可选）
+
+        Returns:
+            (是否值得重试, 原因说明)
+        """
+        if not self.min_success_rate:
+            return True, "Success rate check disabled"
+
+        stats = self.workflows.get(workflow_name)
+        if not stats:
+            return True, "Not enough retry history"
+
+        attempts, successes = self._recent(stats, now if now is not None else time.time())
+        if attempts < self.min_attempts:
+            return True, "Not enough recent retry history"
+
+        rate = successes / attempts
+        if rate < self.min_success_rate:
+            return False, (
+                f"Retry success rate {rate:.0%} over {attempts:.1f} recent retries "
+                f"is below {self.min_success_rate:.0%}"
+            )
+
+        return True, f"Retry success rate {rate:.0%}"
+
+    def statistics(self) -> Dict:
+        """
+        获取重试结果统计
+
+        Returns:
+            统计字典
+        """
+        with self._lock:
+            pending = len(self.pending)
+            workflows = {name: dict(stats) for name, stats in self.workflows.items()}
+
+        attempts = sum(stats['attempts'] for stats in workflows.values())
+        successes = sum(stats['successes'] for stats in workflows.values())
+        recovery_seconds = sum(stats['recovery_seconds'] for stats in workflows.values())
+
+        return {
+            'pending': pending,
+            'succeeded': successes,
+            'failed': attempts - successes,
+            'success_rate': round(successes / attempts, 3) if attempts else None,
+            'avg_recovery_seconds': round(recovery_seconds / successes, 1) if successes else None,
+            'workflows': {
+                name: {
+                    'attempts': stats['attempts'],
+                    'success_rate': round(stats['successes'] / stats['attempts'], 3),
+                    'avg_recovery_seconds': (
+                        round(stats['recovery_seconds'] / stats['successes'], 1) if stats['successes'] else None
+                    )
+                }
+                for name, stats in workflows.items()
+            }
+        }
+
+    def export_state(self) -> Dict:
+        """导出需要持久化的状态（用于热启动）"""
+        with self._lock:
+            return {
+                'pending': {k: dict(v) for k, v in self.pending.items()},
+                'workflows': {k: dict(v) for k, v in self.workflows.items()}
+            }
+
+    def restore_state(self, state: Dict):
+        """
+        恢复持久化的状态
+
+        Args:
+            state: export_state 导出的状态
+        """
+        with self._lock:
+            # JSON 的键是字符串，恢复为整数实例 ID
+            self.pending.update({int(k): v for k, v in (state.get('pending') or {}).items()})
+
+            # 旧版本保存的统计没有衰减时间，从恢复时开始衰减
+            now = time.time()
+            for name, stats in (state.get('workflows') or {}).items():
+                stats.setdefault('updated_at', now)
+                self.workflows[name] = stats
@@ -0,0 +1,243 @@
+"""
+Retry Planner
+在不产生副作用的情况下计算重试计划（dry-run）
+"""
+
+import csv
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, TextIO
+
+from .monitor import WorkflowMonitor
+
+
+logger = logging.getLogger(__name__)
+
+
+class RetryPlanner:
+    """重试计划生成器（只读取数据，从不调用 executors/execute）"""
+
+    # 计划输出字段
+    PLAN_FIELDS = [
+        'project_code',
+        'instance_id',
+        'name',
+        'state',
+        'priority',
+        'verdict',
+        'reason',
+        'execute_type',
+        'saved_task_hours',
+        'api_calls'
+    ]
+
+    VERDICT_RETRY = 'retry'
+    VERDICT_SKIP = 'skip'
+
+    def __init__(self, monitor: WorkflowMonitor, max_workers: int = 8):
+        """
+        初始化计划生成器
+
+        Args:
+            monitor: 工作流监控器（复用其验证逻辑和重试记录）
+            max_workers: 并发请求的最大线程数
+        """
+        self.monitor = monitor
+        self.max_workers = max(1, max_workers)
+
+    def _estimate_api_calls(self, can_retry: bool, validate_tasks: bool) -> int:
+        """
+        估算真实执行时单个实例需要的 API 调用次数
+
+        Args:
+            can_retry: 是否会被重试
+            validate_tasks: 是否验证任务状态
+
+        Returns:
+            API 调用次数
+        """
+        # 任务验证需要一次任务列表查询，重试需要一次 executors/execute 调用
+        return (1 if validate_tasks else 0) + (1 if can_retry else 0)
+
+    def _plan_workflow(
+        self,
+        candidate: Dict,
+        validate_tasks: bool,
+        held_reason: Optional[str] = None
+    ) -> Dict:
+        """
+        为单个工作流实例生成计划条目
+
+        Args:
+            candidate: 候选工作流（{'project_code', 'workflow', 可选的 'priority'}）
+            validate_tasks: 是否验证任务状态
+            held_reason: 因依赖关系暂缓重试的原因（可选）
+
+        Returns:
+            计划条目
+        """
+        project_code = candidate['project_code']
+        workflow = candidate['workflow']
+
+        if held_reason:
+            # 暂缓的工作流本轮不会被验证和重试
+            can_retry, reason, validate_tasks = False, held_reason, False
+        else:
+            try:
+                can_retry, reason = self.monitor.evaluate_retry(
+                    project_code=project_code,
+                    workflow=workflow,
+                    validate_tasks=validate_tasks
+                )
+            except Exception as e:
+                can_retry, reason = False, f"Evaluation error: {str(e)}"
+
+        recovery = self.monitor.recovery_for(workflow.get('id')) if can_retry else {}
+
+        return {
+            'project_code': project_code,
+            'instance_id': workflow.get('id'),
+            'name': workflow.get('name', 'Unknown'),
+            'state': workflow.get('state', 'Unknown'),
+            'priority': candidate.get('priority', ''),
+            'verdict': self.VERDICT_RETRY if can_retry else self.VERDICT_SKIP,
+            'reason': reason,
+            'execute_type': recovery.get('execute_type', ''),
+            'saved_task_hours': recovery.get('saved_task_hours', 0.0),
+            'api_calls': self._estimate_api_calls(can_retry, validate_tasks)
+        }
+
+    def scan_candidates(
+        self,
+        project_codes: List[int],
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        并发扫描所有项目的失败工作流
+
+        Args:
+            project_codes: 项目代码列表
+            start_date: 开始日期（可选）
+            end_date: 结束日期（可选）
+
+        Returns:
+            候选列表，元素为 {'project_code': 项目代码, 'workflow': 工作流实例}
+        """
+        # 大时间范围使用时间分片回溯扫描
+        if self.monitor.backfill and start_date and end_date:
+            return self.monitor.backfill.scan(project_codes, start_date, end_date)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            scan_futures = [
+                executor.submit(
+                    self.monitor.get_failed_workflows,
+                    project_code=project_code,
+                    start_date=start_date,
+                    end_date=end_date
+                )
+                for project_code in project_codes
+            ]
+
+            candidates = []
+            for project_code, future in zip(project_codes, scan_futures):
+                try:
+                    workflows = future.result()
+                except Exception as e:
+                    logger.error("Error scanning project %s: %s", project_code, e)
+                    continue
+
+                candidates.extend(
+                    {'project_code': project_code, 'workflow': workflow}
+                    for workflow in workflows
+                )
+
+        return candidates
+
+    def build_plan(
+        self,
+        project_codes: List[int],
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        validate_tasks: bool = True
+    ) -> List[Dict]:
+        """
+        并发获取候选工作流并批量评估，生成重试计划
+
+        Args:
+            project_codes: 项目代码列表
+            start_date: 开始日期（可选）
+            end_date: 结束日期（可选）
+            validate_tasks: 是否验证任务状态
+
+        Returns:
+            计划条目列表（顺序与 monitor_and_retry 的处理顺序一致）
+        """
+        # 第一阶段：并发扫描所有项目的失败工作流
+        candidates = self.scan_candidates(project_codes, start_date, end_date)
+
+        # 按监控器的重试顺序排列，暂缓的下游工作流不会被重试
+        candidates, held = self.monitor.order_candidates(candidates)
+
+        # 第二阶段：并发验证所有候选实例
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            plan_futures = [
+                executor.submit(
+                    self._plan_workflow,
+                    candidate,
+                    validate_tasks,
+                    held.get(candidate['workflow'].get('id'))
+                )
+                for candidate in candidates
+            ]
+
+            plan = [future.result() for future in plan_futures]
+
+        logger.info(
+            "Retry plan built: %d candidates, %d to retry",
+            len(plan), sum(1 for entry in plan if entry['verdict'] == self.VERDICT_RETRY)
+        )
+        return plan
+
+    def summarize(self, plan: List[Dict], project_count: int) -> Dict:
+        """
+        汇总重试计划
+
+        Args:
+            plan: 计划条目列表
+            project_count: 扫描的项目数量
+
+        Returns:
+            汇总字典
+        """
+        scan_calls = project_count * len(self.monitor.FAILED_STATES)
+        to_retry = sum(1 for entry in plan if entry['verdict'] == self.VERDICT_RETRY)
+
+        return {
+            'candidates': len(plan),
+            'retry': to_retry,
+            'skip': len(plan) - to_retry,
+            'saved_task_hours': round(sum(entry['saved_task_hours'] for entry in plan), 3),
+            'api_calls': scan_calls + sum(entry['api_calls'] for entry in plan)
+        }
+
+    def write_plan(self, plan: List[Dict], output: TextIO, fmt: str = 'json', summary: Optional[Dict] = None):
+        """
+        输出机器可读的重试计划
+
+        Args:
+            plan: 计划条目列表
+            output: 输出流
+            fmt: 输出格式（json 或 csv）
+            summary: 汇总信息（仅 json 格式输出）
+        """
+        if fmt == 'csv':
+            writer = csv.DictWriter(output, fieldnames=self.PLAN_FIELDS)
+            writer.writeheader()
+            writer.writerows(plan)
+        elif fmt == 'json':
+            json.dump({'summary': summary or {}, 'plan': plan}, output, indent=2, ensure_ascii=False)
+            output.write('\n')
+        else:
+            raise ValueError(f"Unsupported plan format: {fmt}")
@@ -0,0 +1,313 @@
+"""
+Retry Policy
+按项目和工作流名称配置的重试策略（加载时编译为精确名称哈希表、前缀树和预编译正则表达式）
+"""
+
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .memory import BoundedDict
+
+
+class PolicyEngine:
+    """重试策略引擎（匹配优先级：精确名称 > 最长前缀 > 正则表达式，同类规则中指定项目的优先）"""
+
+    FIELDS = ('max_retries', 'backoff', 'recovery', 'quiet_hours', 'exclude')
+    MATCH_TYPES = ('name', 'prefix', 'regex')
+    # 与 WorkflowMonitor 的恢复模式一致
+    RECOVERY_MODES = ('full', 'failed_tasks', 'auto')
+
+    # 前缀树节点中保存规则序号的键
+    _RULE_KEY = '\0'
+
+    def __init__(self, config: Optional[Dict] = None, cache_size: int = 10000):
+        """
+        初始化并编译策略
+
+        Args:
+            config: 策略配置，支持以下字段：
+                default: 默认策略（max_retries、backoff、recovery、quiet_hours、exclude）
+                rules: [{name/prefix/regex: 匹配条件, project: 项目代码（可选）, 以及策略字段}]
+            cache_size: 解析结果缓存的最大条目数（0 表示不限制）
+
+        Raises:
+            ValueError: 规则配置无效
+        """
+        config = config or {}
+        self.default = self._policy_fields(config.get('default') or {}, 'default')
+        self.rules: List[Dict] = list(config.get('rules') or [])
+
+        # 项目代码（None 表示所有项目）-> 索引
+        self._exact: Dict[Tuple[Optional[str], str], int] = {}
+        self._tries: Dict[Optional[str], Dict] = {}
+        # 正则表达式：按配置顺序排列的 (编译结果, 规则序号)，规则序号为 None 表示合并的正则表达式
+        self._regex: Dict[Optional[str], List[Tuple[Any, Optional[int]]]] = {}
+        self._policies: List[Dict] = []
+        # (项目代码, 工作流名称) -> 解析结果
+        self._cache: Dict[Tuple[str, str], Dict] = BoundedDict(cache_size)
+
+        self._compile()
+
+    @classmethod
+    def _policy_fields(cls, rule: Dict, label: str) -> Dict:
+        """
+        提取并校验规则中的策略字段
+
+        Args:
+            rule: 规则配置
+            label: 规则说明（用于错误信息）
+
+        Returns:
+            策略字段字典
+        """
+        fields = {key: rule[key] for key in cls.FIELDS if key in rule}
+
+        # YAML 中的 true/false 也是 int 的子类，需要单独排除
+        max_retries = fields.get('max_retries')
+        if max_retries is not None and (
+            isinstance(max_retries, bool) or not isinstance(max_retries, int) or max_retries < 0
+        ):
+            raise ValueError(f"Invalid max_retries in policy {label}: {max_retries!r}")
+
+        backoff = fields.get('backoff')
+        if backoff is not None and (
+            isinstance(backoff, bool) or not isinstance(backoff, (int, float)) or backoff < 0
+        ):
+            raise ValueError(f"Invalid backoff in policy {label}: {backoff!r}")
+
+        if fields.get('recovery') is not None and fields['recovery'] not in cls.RECOVERY_MODES:
+            raise ValueError(f"Invalid recovery in policy {label}: {fields['recovery']!r}")
+
+        if fields.get('quiet_hours'):
+            try:
+                cls.parse_quiet_hours(fields['quiet_hours'])
+            except ValueError:
+                raise ValueError(f"Invalid quiet_hours in policy {label}: {fields['quiet_hours']!r}")
+
+        return fields
+
+    @staticmethod
+    def parse_quiet_hours(spec: str) -> Tuple[int, int]:
+        """
+        解析静默时段（HH:MM-HH:MM，可以跨越午夜）
+
+        Args:
+            spec: 静默时段
+
+        Returns:
+            (开始分钟数, 结束分钟数)
+        """
+        start, end = spec.split('-')
+        minutes = []
+        for part in (start, end):
+            hour, minute = (int(value) for value in part.strip().split(':'))
+            if not (0 <= hour < 24 and 0 <= minute < 60):
+                raise ValueError(spec)
+            minutes.append(hour * 60 + minute)
+
+        return minutes[0], minutes[1]
+
+    @classmethod
+    def in_quiet_hours(cls, spec: Optional[str], now: datetime) -> bool:
+        """
+        判断当前时间是否处于静默时段
+
+        Args:
+            spec: 静默时段（HH:MM-HH:MM）
+            now: 当前时间
+
+        Returns:
+            是否处于静默时段
+        """
+        if not spec:
+            return False
+
+        start, end = cls.parse_quiet_hours(spec)
+        current = now.hour * 60 + now.minute
+
+        if start <= end:
+            return start <= current < end
+        return current >= start or current < end
+
+    def _compile(self):
+        """把规则编译为精确名称哈希表、前缀树和合并的正则表达式"""
+        regex_parts: Dict[Optional[str], List[Tuple[int, str, 're.Pattern']]] = {}
+
+        for index, rule in enumerate(self.rules):
+            kinds = [kind for kind in self.MATCH_TYPES if rule.get(kind)]
+            if len(kinds) != 1:
+                raise ValueError(f"Policy rule #{index} must define exactly one of name, prefix or regex")
+
+            kind = kinds[0]
+            pattern = str(rule[kind])
+            project = str(rule['project']) if rule.get('project') is not None else None
+            self._policies.append(self._policy_fields(rule, f"rule #{index}"))
+
+            if kind == 'name':
+                self._exact.setdefault((project, pattern), index)
+            elif kind == 'prefix':
+                node = self._tries.setdefault(project, {})
+                for char in pattern:
+                    node = node.setdefault(char, {})
+                node.setdefault(self._RULE_KEY, index)
+            else:
+                try:
+                    compiled = re.compile(pattern)
+                except re.error as e:
+                    raise ValueError(f"Invalid regex in policy rule #{index}: {e}")
+                regex_parts.setdefault(project, []).append((index, pattern, compiled))
+
+        for project, parts in regex_parts.items():
+            self._regex[project] = self._compile_regex(parts)
+
+    @staticmethod
+    def _combinable(pattern: str, compiled: 're.Pattern') -> bool:
+        """判断正则表达式能否与其他规则合并"""
+        # 有分组的可能包含反向引用，合并后分组编号会变化；开头的全局标志（如 (?i)）不能出现在合并后的中间位置
+        if compiled.groups:
+            return False
+        try:
+            re.compile(f'(?:{pattern})')
+        except re.error:
+            return False
+        return True
+
+    def _compile_regex(self, parts: List[Tuple[int, str, 're.Pattern']]) -> List[Tuple[Any, Optional[int]]]:
+        """
+        把同一项目的正则表达式按配置顺序编译：相邻的可合并规则合并为一个，通过命名分组找到命中的规则，
+        不能合并的规则单独匹配
+
+        Args:
+            parts: [(规则序号, 正则表达式, 单独编译的结果)]
+
+        Returns:
+            按配置顺序排列的 (编译结果, 规则序号)，规则序号为 None 表示合并的正则表达式
+        """
+        matchers: List[Tuple[Any, Optional[int]]] = []
+        group: List[Tuple[int, str]] = []
+
+        def flush():
+            if not group:
+                return
+            combined = '|'.join(f'(?P<r{index}>{pattern})' for index, pattern in group)
+            try:
+                matchers.append((re.compile(f'(?:{combined})'), None))
+            except re.error as e:
+                raise ValueError(f"Invalid regex in policy rules #{group[0][0]}-#{group[-1][0]}: {e}")
+            group.clear()
+
+        for index, pattern, compiled in parts:
+            if self._combinable(pattern, compiled):
+                group.append((index, pattern))
+            else:
+                flush()
+                matchers.append((compiled, index))
+        flush()
+
+        return matchers
+
+    def _match_prefix(self, project: Optional[str], name: str) -> Optional[int]:
+        """在前缀树中查找最长匹配前缀的规则"""
+        node = self._tries.get(project)
+        found = None
+
+        for char in name:
+            if node is None:
+                break
+            if self._RULE_KEY in node:
+                found = node[self._RULE_KEY]
+            node = node.get(char)
+
+        if node is not None and self._RULE_KEY in node:
+            found = node[self._RULE_KEY]
+
+        return found
+
+    def _match_regex(self, project: Optional[str], name: str) -> Optional[int]:
+        """按配置顺序查找第一个完整匹配的正则表达式规则"""
+        for compiled, index in self._regex.get(project, ()):
+            match = compiled.fullmatch(name)
+            if match:
+                return int(match.lastgroup[1:]) if index is None else index
+
+        return None
+
+    def match(self, project_code: int, workflow_name: str) -> Tuple[Optional[int], Optional[str]]:
+        """
+        查找匹配工作流的规则
+
+        Args:
+            project_code: 项目代码
+            workflow_name: 工作流名称
+
+        Returns:
+            (规则序号, 匹配方式)，没有匹配时返回 (None, None)
+        """
+        scopes = (str(project_code), None)
+
+        for scope in scopes:
+            index = self._exact.get((scope, workflow_name))
+            if index is not None:
+                return index, 'name'
+
+        for scope in scopes:
+            index = self._match_prefix(scope, workflow_name)
+            if index is not None:
+                return index, 'prefix'
+
+        for scope in scopes:
+            index = self._match_regex(scope, workflow_name)
+            if index is not None:
+                return index, 'regex'
+
+        return None, None
+
+    def resolve(self, project_code: int, workflow_name: str) -> Dict:
+        """
+        解析工作流的有效策略（结果按项目和名称缓存）
+
+        Args:
+            project_code: 项目代码
+            workflow_name: 工作流名称
+
+        Returns:
+            策略字典（默认策略与命中规则合并，'rule' 为命中的规则序号）
+        """
+        key = (str(project_code), workflow_name)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        index, _ = self.match(project_code, workflow_name)
+        policy = dict(self.default)
+        if index is not None:
+            policy.update(self._policies[index])
+        policy['rule'] = index
+
+        self._cache[key] = policy
+        return policy
+
+    def explain(self, project_code: int, workflow_name: str) -> Dict:
+        """
+        说明工作流命中的规则及最终生效的策略
+
+        Args:
+            project_code: 项目代码
+            workflow_name: 工作流名称
+
+        Returns:
+            说明字典
+        """
+        index, kind = self.match(project_code, workflow_name)
+        policy = dict(self.resolve(project_code, workflow_name))
+        policy.pop('rule', None)
+
+        return {
+            'project_code': project_code,
+            'workflow': workflow_name,
+            'rule_index': index,
+            'match_type': kind,
+            'rule': self.rules[index] if index is not None else None,
+            'policy': policy
+        }
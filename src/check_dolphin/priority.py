@@ -0,0 +1,180 @@
+"""
+Retry Priority
+基于权重、SLA 截止时间和重跑成本的重试优先级模型与优先队列
+"""
+
+import heapq
+import itertools
+from datetime import datetime
+from fnmatch import fnmatchcase
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class PriorityModel:
+    """重试优先级模型（优先级越高越先重试）"""
+
+    def __init__(self, config: Optional[Dict] = None):
+        """
+        初始化优先级模型
+
+        Args:
+            config: 优先级配置，支持以下字段：
+                default_weight: 默认权重
+                projects: 项目代码 -> 权重
+                workflows: [{pattern: 工作流名称通配符, weight: 权重, sla: 'HH:MM' 每日截止时间}]
+                sla_weight: SLA 临近时最多增加的优先级
+                sla_horizon: 截止时间前多少秒开始提升优先级
+                cost_weight: 每小时预计运行时长降低的优先级
+
+        Raises:
+            ValueError: SLA 截止时间格式无效
+        """
+        config = config or {}
+        self.default_weight = float(config.get('default_weight', 1))
+        self.projects = {str(code): float(weight) for code, weight in (config.get('projects') or {}).items()}
+        self.workflows = list(config.get('workflows') or [])
+        # 规则序号 -> 解析后的 SLA 截止时间 (时, 分)
+        self._slas = {
+            index: self.parse_sla(rule['sla'], f"priority.workflows #{index}")
+            for index, rule in enumerate(self.workflows) if rule.get('sla') not in (None, '')
+        }
+        self.sla_weight = float(config.get('sla_weight', 10))
+        self.sla_horizon = float(config.get('sla_horizon', 4 * 3600))
+        self.cost_weight = float(config.get('cost_weight', 0))
+
+    @staticmethod
+    def parse_sla(sla: Any, label: str) -> Tuple[int, int]:
+        """
+        解析 SLA 每日截止时间
+
+        Args:
+            sla: 每日截止时间（'HH:MM' 字符串）
+            label: 规则说明（用于错误信息）
+
+        Returns:
+            (时, 分)
+
+        Raises:
+            ValueError: 格式无效
+        """
+        # YAML 会把不加引号的 18:30 解析为六十进制整数 1110
+        if not isinstance(sla, str):
+            raise ValueError(f"Invalid sla in {label}: {sla!r} (quote it as 'HH:MM')")
+
+        try:
+            hour, minute = (int(part) for part in sla.split(':'))
+        except ValueError:
+            raise ValueError(f"Invalid sla in {label}: {sla!r} (expected 'HH:MM')")
+        if not (0 <= hour < 24 and 0 <= minute < 60):
+            raise ValueError(f"Invalid sla in {label}: {sla!r} (expected 'HH:MM')")
+
+        return hour, minute
+
+    def _match_rule(self, workflow_name: str) -> Tuple[Optional[int], Optional[Dict]]:
+        """返回第一个匹配工作流名称的规则（规则序号, 规则）"""
+        for index, rule in enumerate(self.workflows):
+            if fnmatchcase(workflow_name, rule.get('pattern', '')):
+                return index, rule
+
+        return None, None
+
+    def _sla_boost(self, sla: Tuple[int, int], now: datetime) -> float:
+        """
+        计算 SLA 截止时间带来的优先级提升（越接近截止时间越高，超时后为最大值）
+
+        Args:
+            sla: 每日截止时间 (时, 分)
+            now: 当前时间
+
+        Returns:
+            优先级提升值
+        """
+        hour, minute = sla
+        deadline = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        remaining = (deadline - now).total_seconds()
+
+        if remaining <= 0:
+            return self.sla_weight
+        if remaining >= self.sla_horizon:
+            return 0.0
+
+        return self.sla_weight * (1 - remaining / self.sla_horizon)
+
+    @staticmethod
+    def _duration_hours(workflow: Dict) -> float:
+        """根据工作流实例的开始和结束时间估算重跑时长（小时）"""
+        try:
+            start = datetime.strptime(workflow['startTime'], '%Y-%m-%d %H:%M:%S')
+            end = datetime.strptime(workflow['endTime'], '%Y-%m-%d %H:%M:%S')
+        except (KeyError, TypeError, ValueError):
+            return 0.0
+
+        return max(0.0, (end - start).total_seconds() / 3600)
+
+    def priority(self, project_code: int, workflow: Dict, now: Optional[datetime] = None) -> float:
+        """
+        计算工作流实例的重试优先级
+
+        Args:
+            project_code: 项目代码
+            workflow: 工作流实例信息
+            now: 当前时间（可选，默认为当前本地时间）
+
+        Returns:
+            优先级
+        """
+        now = now or datetime.now()
+        index, rule = self._match_rule(workflow.get('name', ''))
+
+        if rule and 'weight' in rule:
+            weight = float(rule['weight'])
+        else:
+            weight = self.projects.get(str(project_code), self.default_weight)
+
+        if index in self._slas:
+            weight += self._sla_boost(self._slas[index], now)
+
+        if self.cost_weight:
+            weight -= self.cost_weight * self._duration_hours(workflow)
+
+        return round(weight, 3)
+
+
+class RetryQueue:
+    """基于堆的重试优先队列（优先级相同时保持入队顺序）"""
+
+    def __init__(self):
+        """初始化空队列"""
+        self._heap: List[Tuple[float, int, Any]] = []
+        self._counter = itertools.count()
+
+    def push(self, priority: float, item: Any):
+        """
+        入队
+
+        Args:
+            priority: 优先级（越高越先出队）
+            item: 队列元素
+        """
+        heapq.heappush(self._heap, (-priority, next(self._counter), item))
+
+    def pop(self) -> Any:
+        """
+        取出优先级最高的元素
+
+        Returns:
+            队列元素
+        """
+        return heapq.heappop(self._heap)[2]
+
+    def drain(self) -> List[Any]:
+        """
+        按优先级顺序取出所有元素
+
+        Returns:
+            队列元素列表
+        """
+        return [self.pop() for _ in range(len(self._heap))]
+
+    def __len__(self) -> int:
+        return len(self._heap)
@@ -0,0 +1,309 @@
+"""
+Status Board
+并发获取多个项目的工作流状态摘要，按完成顺序流式输出（table/csv/json），watch 模式下只重绘变化的行
+"""
+
+import csv
+import json
+import logging
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, TextIO
+
+from .monitor import WorkflowMonitor
+
+
+logger = logging.getLogger(__name__)
+
+
+class StatusBoard:
+    """多项目状态摘要的并发获取"""
+
+    def __init__(
+        self,
+        monitor: WorkflowMonitor,
+        max_workers: int = 8,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        max_pages: Optional[int] = None
+    ):
+        """
+        初始化状态面板
+
+        Args:
+            monitor: 工作流监控器（复用其状态统计逻辑）
+            max_workers: 并发请求的最大线程数
+            start_date: 开始日期（可选）
+            end_date: 结束日期（可选）
+            max_pages: 每个项目最多统计的页数（可选，默认获取全部分页）
+        """
+        self.monitor = monitor
+        self.max_workers = max(1, max_workers)
+        self.start_date = start_date
+        self.end_date = end_date
+        self.max_pages = max_pages
+
+    def discover_project_codes(self, page_size: int = 100) -> List[int]:
+        """
+        获取所有可访问的项目代码
+
+        Args:
+            page_size: 每页大小
+
+        Returns:
+            项目代码列表
+        """
+        codes = []
+        page_no = 1
+        while True:
+            projects = self.monitor.client.get_projects(page_no=page_no, page_size=page_size)
+            codes.extend(project['code'] for project in projects or [] if 'code' in project)
+            if not projects or len(projects) < page_size:
+                return codes
+            page_no += 1
+
+    def _fetch_one(self, project_code: int) -> Dict:
+        """获取一个项目的状态摘要行"""
+        try:
+            summary = self.monitor.get_workflow_status_summary(
+                project_code,
+                start_date=self.start_date,
+                end_date=self.end_date,
+                max_pages=self.max_pages
+            )
+            return dict({'project_code': project_code}, **summary)
+        except Exception as e:
+            logger.error("Failed to get status of project %s: %s", project_code, e)
+            return {'project_code': project_code, 'error': str(e)}
+
+    def fetch(self, project_codes: List[int]) -> Iterator[Dict]:
+        """
+        并发获取所有项目的状态摘要，按完成顺序逐个返回
+
+        Args:
+            project_codes: 项目代码列表
+
+        Returns:
+            状态摘要行迭代器（{'project_code', 'total', 'success', 'failure', 'running', 'other'}，
+            失败时为 {'project_code', 'error'}）
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._fetch_one, code) for code in project_codes]
+            for future in as_completed(futures):
+                row = future.result()
+                row['fetched_at'] = datetime.now().isoformat(timespec='seconds')
+                yield row
+
+
+class StatusWriter:
+    """状态摘要行的流式输出"""
+
+    FIELDS = ['project_code', 'total', 'success', 'failure', 'running', 'other', 'error', 'fetched_at']
+    # 比较行是否变化时忽略的字段
+    VOLATILE_FIELDS = ('fetched_at',)
+
+    def __init__(self, output: TextIO, fmt: str = 'table', interactive: Optional[bool] = None):
+        """
+        初始化输出
+
+        Args:
+            output: 输出流
+            fmt: 输出格式（table、csv 或 json，json 为每行一个对象的 JSON Lines）
+            interactive: 是否为终端（table 格式的 watch 模式在终端中原地重绘变化的行，默认自动检测）
+        """
+        if fmt not in ('table', 'csv', 'json'):
+            raise ValueError(f"Unsupported status format: {fmt}")
+
+        self.output = output
+        self.fmt = fmt
+        self.interactive = output.isatty() if interactive is None else interactive
+
+        self._csv = csv.DictWriter(output, fieldnames=self.FIELDS, extrasaction='ignore') if fmt == 'csv' else None
+        self._header_written = False
+        # watch 模式：项目代码 -> 上次输出的行、屏幕上的行号
+        self._last: Dict[int, Dict] = {}
+        self._positions: Dict[int, int] = {}
+
+    def _format_table_row(self, row: Dict) -> str:
+        """格式化表格行"""
+        if row.get('error'):
+            return f"{row['project_code']:>15}  error: {row['error']}"
+        if 'total' not in row:
+            return f"{row['project_code']:>15}  ..."
+        return (
+            f"{row['project_code']:>15}  {row['total']:>8}  {row['success']:>8}  {row['failure']:>8}  "
+            f"{row['running']:>8}  {row['other']:>8}"
+        )
+
+    def write_header(self):
+        """输出表头（json 格式没有表头）"""
+        if self._header_written:
+            return
+        self._header_written = True
+
+        if self.fmt == 'table':
+            self.output.write(
+                f"{'PROJECT':>15}  {'TOTAL':>8}  {'SUCCESS':>8}  {'FAILURE':>8}  {'RUNNING':>8}  {'OTHER':>8}\n"
+            )
+        elif self.fmt == 'csv':
+            self._csv.writeheader()
+        self.output.flush()
+
+    def write_row(self, row: Dict):
+        """
+        追加输出一行
+
+        Args:
+            row: 状态摘要行
+        """
+        self.write_header()
+
+        if self.fmt == 'table':
+            self.output.write(self._format_table_row(row) + '\n')
+        elif self.fmt == 'csv':
+            self._csv.writerow(row)
+        else:
+            self.output.write(json.dumps(row, ensure_ascii=False) + '\n')
+        self.output.flush()
+
+    def write_total(self, rows: List[Dict]):
+        """
+        输出汇总行（仅 table 格式）
+
+        Args:
+            rows: 所有状态摘要行
+        """
+        if self.fmt != 'table':
+            return
+
+        fields = ('total', 'success', 'failure', 'running', 'other')
+        totals = {field: sum(row.get(field, 0) for row in rows) for field in fields}
+        self.output.write(self._format_table_row(dict(totals, project_code='TOTAL')) + '\n')
+        self.output.flush()
+
+    def _changed(self, row: Dict) -> bool:
+        """判断行与上次输出相比是否有变化"""
+        previous = self._last.get(row['project_code'])
+        if previous is None:
+            return True
+        return any(
+            previous.get(field) != row.get(field)
+            for field in self.FIELDS if field not in self.VOLATILE_FIELDS
+        )
+
+    def start_board(self, project_codes: List[int]):
+        """
+        watch 模式下在终端中画出所有项目的占位行（之后只原地更新变化的行）
+
+        Args:
+            project_codes: 项目代码列表（决定行的顺序）
+        """
+        if not (self.fmt == 'table' and self.interactive) or self._positions:
+            return
+
+        # 表头、所有项目行和状态行超出终端高度时，光标无法上移到已滚出屏幕的行，改为追加输出变化的行
+        terminal_lines = shutil.get_terminal_size().lines
+        if len(project_codes) + 2 > terminal_lines:
+            logger.info(
+                "Status board needs %d lines but the terminal has %d, appending changed rows instead",
+                len(project_codes) + 2, terminal_lines
+            )
+            return
+
+        self.write_header()
+        for position, code in enumerate(project_codes):
+            self._positions[code] = position
+            self.output.write(self._format_table_row({'project_code': code}) + '\n')
+        # 最后一行是刷新状态
+        self.output.write('\n')
+        self.output.flush()
+
+    def update(self, row: Dict) -> bool:
+        """
+        watch 模式下输出一行的变化（终端中原地重绘，其他情况下只追加变化的行）
+
+        Args:
+            row: 状态摘要行
+
+        Returns:
+            是否有变化并已输出
+        """
+        if not self._changed(row):
+            return False
+        self._last[row['project_code']] = row
+
+        position = self._positions.get(row['project_code'])
+        if position is None:
+            self.write_row(row)
+            return True
+
+        # 光标在状态行之后：上移到目标行，清除并重写后移回原处
+        distance = len(self._positions) + 1 - position
+        self.output.write(f"\x1b[{distance}A\r\x1b[2K{self._format_table_row(row)}\x1b[{distance}B\r")
+        self.output.flush()
+        return True
+
+    def write_status(self, message: str):
+        """
+        watch 模式下在终端中更新最后一行的刷新状态
+
+        Args:
+            message: 状态信息
+        """
+        if not self._positions:
+            return
+
+        self.output.write(f"\x1b[1A\r\x1b[2K{message}\n")
+        self.output.flush()
+
+
+def run_status(
+    board: StatusBoard,
+    writer: StatusWriter,
+    project_codes: List[int],
+    watch: float = 0,
+    stop_event=None
+) -> List[Dict]:
+    """
+    获取并输出状态摘要（watch 大于 0 时按间隔持续刷新，只输出变化的行）
+
+    Args:
+        board: 状态面板
+        writer: 输出
+        project_codes: 项目代码列表
+        watch: 刷新间隔（秒，0 表示只输出一次）
+        stop_event: 停止请求（可选，用于结束 watch 模式）
+
+    Returns:
+        最后一轮的状态摘要行
+    """
+    if not watch:
+        rows = []
+        writer.write_header()
+        for row in board.fetch(project_codes):
+            writer.write_row(row)
+            rows.append(row)
+        writer.write_total(rows)
+        return rows
+
+    writer.start_board(project_codes)
+    while True:
+        started = time.monotonic()
+        rows = []
+        changed = 0
+        for row in board.fetch(project_codes):
+            rows.append(row)
+            changed += writer.update(row)
+
+        writer.write_status(
+            f"Updated {datetime.now():%H:%M:%S}: {changed} changed, "
+            f"{time.monotonic() - started:.1f}s, refreshing every {watch:g}s (Ctrl+C to stop)"
+        )
+
+        if stop_event is not None:
+            if stop_event.wait(watch):
+                return rows
+        else:
+            time.sleep(watch)
@@ -0,0 +1,143 @@
+"""
+Sub-workflow Inspection
+递归获取 SUB_PROCESS 任务对应的子工作流实例及其任务（按层并发获取，限制深度并复用已获取的子工作流）
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .api_client import DolphinSchedulerClient
+
+
+logger = logging.getLogger(__name__)
+
+
+class SubWorkflowInspector:
+    """子工作流检查器"""
+
+    TASK_TYPE_SUB_PROCESS = 'SUB_PROCESS'
+    # 成功的子工作流不需要展开检查
+    TASK_STATE_SUCCESS = 'SUCCESS'
+
+    def __init__(
+        self,
+        client: DolphinSchedulerClient,
+        max_depth: int = 3,
+        max_workers: int = 8,
+        cache_size: int = 10000
+    ):
+        """
+        初始化子工作流检查器
+
+        Args:
+            client: DolphinScheduler API 客户端
+            max_depth: 最大展开深度（1 表示只展开直接子工作流）
+            max_workers: 每层并发请求数
+            cache_size: 子工作流实例 ID 缓存的最大条目数
+        """
+        self.client = client
+        self.max_depth = max_depth
+        self.max_workers = max_workers
+        self.cache_size = cache_size
+
+        # SUB_PROCESS 任务实例 ID -> 子工作流实例 ID（对应关系不会变化，可以长期缓存）
+        self._child_ids: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def _child_instance_id(self, project_code: int, task_id: int) -> Optional[int]:
+        """
+        获取 SUB_PROCESS 任务对应的子工作流实例 ID（带缓存）
+
+        Args:
+            project_code: 项目代码
+            task_id: SUB_PROCESS 任务实例 ID
+
+        Returns:
+            子工作流实例 ID，获取失败时返回 None
+        """
+        with self._lock:
+            if task_id in self._child_ids:
+                return self._child_ids[task_id]
+
+        child_id = self.client.get_sub_process_instance_id(project_code=project_code, task_instance_id=task_id)
+        if child_id is not None:
+            with self._lock:
+                if len(self._child_ids) >= self.cache_size:
+                    self._child_ids.pop(next(iter(self._child_ids)))
+                self._child_ids[task_id] = child_id
+
+        return child_id
+
+    def _expand(self, project_code: int, task: Dict) -> Tuple[Optional[int], List[Dict]]:
+        """
+        获取一个 SUB_PROCESS 任务的子工作流实例 ID 和任务列表
+
+        Args:
+            project_code: 项目代码
+            task: SUB_PROCESS 任务实例
+
+        Returns:
+            (子工作流实例 ID, 子工作流任务列表)
+        """
+        child_id = self._child_instance_id(project_code, task.get('id'))
+        if child_id is None:
+            return None, []
+
+        tasks = self.client.get_task_instances(project_code=project_code, process_instance_id=child_id)
+        return child_id, tasks or []
+
+    def collect(self, project_code: int, tasks: List[Dict]) -> Tuple[List[Dict], List[str]]:
+        """
+        按层展开未成功的 SUB_PROCESS 任务，收集所有子工作流中的任务
+
+        同一层的子工作流并发获取，嵌套层数只影响往返轮数；同一个子工作流实例只获取一次。
+
+        Args:
+            project_code: 项目代码
+            tasks: 父工作流的任务实例列表
+
+        Returns:
+            (子工作流任务列表（名称带上父任务路径）, 无法展开的 SUB_PROCESS 任务说明)
+        """
+        collected: List[Dict] = []
+        problems: List[str] = []
+        seen = set()
+        level = list(tasks)
+
+        for _ in range(self.max_depth):
+            targets = [
+                task for task in level
+                if task.get('taskType') == self.TASK_TYPE_SUB_PROCESS
+                and task.get('state') != self.TASK_STATE_SUCCESS
+            ]
+            if not targets:
+                return collected, problems
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = list(executor.map(lambda task: self._expand(project_code, task), targets))
+
+            level = []
+            for task, (child_id, child_tasks) in zip(targets, results):
+                if child_id is None:
+                    problems.append(f"Sub-workflow of task {task.get('name', 'Unknown')} not found")
+                    continue
+                if child_id in seen:
+                    continue
+                seen.add(child_id)
+
+                # 子工作流任务名称带上父任务路径（例如 stage/inner/load）
+                for child_task in child_tasks:
+                    item = dict(child_task, name=f"{task.get('name', 'Unknown')}/{child_task.get('name', 'Unknown')}")
+                    collected.append(item)
+                    level.append(item)
+
+        # 超过最大深度后仍有未展开的子工作流
+        for task in level:
+            if task.get('taskType') == self.TASK_TYPE_SUB_PROCESS and task.get('state') != self.TASK_STATE_SUCCESS:
+                logger.warning(
+                    "Sub-workflow task %s exceeds max depth %d, not inspected", task.get('name'), self.max_depth
+                )
+
+        return collected, problems
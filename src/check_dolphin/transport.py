@@ -0,0 +1,203 @@
+"""
+Record and Replay Transport
+录制真实会话的 API 请求/响应及耗时（gzip 压缩的 JSON Lines 归档，令牌已脱敏），并离线按原速、倍速或无延迟回放
+"""
+
+import gzip
+import json
+import logging
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+logger = logging.getLogger(__name__)
+
+# 脱敏后的占位符
+SCRUBBED = '***'
+# 需要保存的响应头（其余响应头可能包含 Cookie 等敏感信息，不录制）
+RECORDED_HEADERS = ('Content-Type', 'Content-Length', 'ETag', 'Last-Modified')
+
+
+def _request_key(method: str, path: str, params: Optional[Dict], body: Optional[Dict]) -> str:
+    """生成用于匹配录制记录的请求键（方法、路径、排序后的查询参数和请求体）"""
+    return json.dumps(
+        [method.upper(), path, sorted((params or {}).items()), body],
+        sort_keys=True, ensure_ascii=False, default=str
+    )
+
+
+class RecordingTransport:
+    """录制传输：转发请求到 requests，并把请求/响应和耗时追加到归档中"""
+
+    def __init__(self, path: str, secrets: Iterable[str] = ()):
+        """
+        初始化录制传输
+
+        Args:
+            path: 归档文件路径（gzip 压缩的 JSON Lines）
+            secrets: 需要脱敏的字符串（例如 API 令牌），出现在记录中的任何位置都会被替换
+        """
+        self.path = path
+        self.secrets = [secret for secret in secrets if secret]
+        self.recorded = 0
+
+        self._started = time.monotonic()
+        self._file = gzip.open(path, 'wt', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def _scrub(self, text: str) -> str:
+        """替换文本中的敏感字符串"""
+        for secret in self.secrets:
+            text = text.replace(secret, SCRUBBED)
+        return text
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        发送请求并录制（参数与 requests.request 相同，请求头不录制）
+
+        Returns:
+            响应对象
+        """
+        offset = time.monotonic() - self._started
+        started = time.perf_counter()
+        response = requests.request(method=method, url=url, **kwargs)
+        elapsed = time.perf_counter() - started
+
+        entry = {
+            'method': method.upper(),
+            'path': urlparse(url).path,
+            'params': kwargs.get('params'),
+            'json': kwargs.get('json'),
+            'status': response.status_code,
+            'headers': {
+                name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers
+            },
+            'body': response.content.decode('utf-8', errors='replace'),
+            'offset': round(offset, 4),
+            'elapsed': round(elapsed, 4)
+        }
+        line = self._scrub(json.dumps(entry, ensure_ascii=False, default=str))
+
+        with self._lock:
+            if self._file:
+                self._file.write(line + '\n')
+                self.recorded += 1
+
+        return response
+
+    def close(self):
+        """关闭归档（gzip 流需要关闭后才完整）"""
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+                logger.info("Recorded %d API requests to %s", self.recorded, self.path)
+
+
+class ReplayTransport:
+    """回放传输：从归档中查找匹配的响应，按录制的耗时（可按倍速缩放）延迟后返回"""
+
+    def __init__(self, path: str, speed: float = 1.0):
+        """
+        初始化回放传输
+
+        Args:
+            path: 录制的归档文件路径
+            speed: 回放速度倍数（1 为录制时的原速，2 为两倍速，0 表示不延迟）
+        """
+        self.path = path
+        self.speed = speed
+        self.entries = self.load(path)
+
+        # 同一请求按录制顺序依次返回，用完后重复返回最后一次的响应
+        self._exact: Dict[str, Deque[Dict]] = {}
+        # 查询参数不同（例如按当前时间计算的日期）时退回到按方法和路径匹配
+        self._by_path: Dict[Tuple[str, str], Deque[Dict]] = {}
+        for entry in self.entries:
+            key = _request_key(entry['method'], entry['path'], entry.get('params'), entry.get('json'))
+            self._exact.setdefault(key, deque()).append(entry)
+            self._by_path.setdefault((entry['method'], entry['path']), deque()).append(entry)
+
+        self.stats = {'replayed': 0, 'fallback': 0, 'missing': 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def load(path: str) -> List[Dict]:
+        """
+        读取归档
+
+        Args:
+            path: 归档文件路径
+
+        Returns:
+            录制记录列表
+        """
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    @staticmethod
+    def _next(queue: Optional[Deque[Dict]]) -> Optional[Dict]:
+        """取出队列中的下一条记录（最后一条保留以便重复返回）"""
+        if not queue:
+            return None
+        return queue.popleft() if len(queue) > 1 else queue[0]
+
+    def _find(self, method: str, url: str, params: Optional[Dict], body: Optional[Dict]) -> Optional[Dict]:
+        """查找与请求匹配的录制记录"""
+        path = urlparse(url).path
+        # 录制时查询参数和请求体经过 JSON 序列化，回放时按同样的方式规范化后再匹配
+        params = json.loads(json.dumps(params, default=str)) if params else params
+        body = json.loads(json.dumps(body, default=str)) if body else body
+
+        with self._lock:
+            entry = self._next(self._exact.get(_request_key(method, path, params, body)))
+            if entry:
+                self.stats['replayed'] += 1
+                return entry
+
+            entry = self._next(self._by_path.get((method.upper(), path)))
+            if entry:
+                self.stats['replayed'] += 1
+                self.stats['fallback'] += 1
+                return entry
+
+            self.stats['missing'] += 1
+            return None
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        返回录制的响应（参数与 requests.request 相同）
+
+        Returns:
+            响应对象，归档中没有对应的请求时返回 404
+        """
+        entry = self._find(method, url, kwargs.get('params'), kwargs.get('json'))
+
+        response = requests.Response()
+        response.url = url
+        response.encoding = 'utf-8'
+
+        if entry is None:
+            logger.warning("No recorded response for %s %s", method.upper(), url)
+            response.status_code = 404
+            response.reason = 'Not Recorded'
+            response._content = b''
+            return response
+
+        if self.speed > 0:
+            time.sleep(entry['elapsed'] / self.speed)
+
+        response.status_code = entry['status']
+        response.headers = CaseInsensitiveDict(entry.get('headers') or {})
+        response._content = entry['body'].encode('utf-8')
+        return response
+
+    def close(self):
+        """输出回放统计"""
+        logger.info("Replayed API traffic from %s: %s", self.path, self.stats)
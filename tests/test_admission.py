@@ -0,0 +1,70 @@
+"""
+Tests for retry admission control
+"""
+
+import unittest
+from unittest.mock import Mock
+
+from check_dolphin.admission import AdmissionController
+from check_dolphin.monitor import WorkflowMonitor
+
+
+class TestAdmissionController(unittest.TestCase):
+    """Test cluster-capacity-aware admission"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.client = Mock()
+        self.client.get_worker_servers.return_value = [
+            {'host': 'w1', 'resInfo': '{"cpuUsage": 0.95, "memoryUsage": 0.4, "loadAverage": 3}'},
+            {'host': 'w2', 'resInfo': '{"cpuUsage": 0.85, "memoryUsage": 0.5, "loadAverage": 2}'}
+        ]
+        self.client.get_master_servers.return_value = []
+        self.client.get_workflow_instance_count.return_value = 3
+
+    def test_busy_workers_block_retries(self):
+        """Test average worker CPU above the limit denies admission"""
+        controller = AdmissionController(self.client, max_cpu_usage=0.8)
+
+        admitted, reason = controller.admit()
+
+        self.assertFalse(admitted)
+        self.assertIn('worker cpu_usage', reason)
+
+    def test_load_is_cached_and_counts_issued_retries(self):
+        """Test cluster load is cached and issued retries count as running"""
+        controller = AdmissionController(
+            self.client, project_codes=[1], max_cpu_usage=0, max_memory_usage=0,
+            max_running_instances=4, cache_ttl=60
+        )
+
+        self.assertTrue(controller.admit()[0])
+        controller.record_retry()
+        self.assertFalse(controller.admit()[0])
+        self.assertEqual(self.client.get_worker_servers.call_count, 1)
+
+    def test_deferred_retries_drain_when_capacity_returns(self):
+        """Test the monitor retries deferred workflows once the cluster recovers"""
+        self.client.retry_workflow_instance.return_value = True
+        self.client.get_task_instances.return_value = [
+            {'id': 1, 'name': 't', 'state': 'FAILURE', 'maxRetryTimes': 0, 'retryTimes': 0}
+        ]
+        self.client.get_workflow_instances.side_effect = (
+            lambda project_code, state_type, **kwargs:
+            [{'id': 5, 'name': 'wf', 'state': 'FAILURE'}] if state_type == 'FAILURE' else []
+        )
+        # 第一次查询时集群繁忙，之后恢复
+        cpu_usage = iter([0.99])
+        self.client.get_worker_servers.side_effect = (
+            lambda: [{'resInfo': {'cpuUsage': next(cpu_usage, 0.10)}}]
+        )
+
+        controller = AdmissionController(self.client, max_cpu_usage=0.8, cache_ttl=0, poll_interval=0.01)
+        monitor = WorkflowMonitor(client=self.client, retry_interval=0, admission=controller)
+        monitor.monitor_and_retry([1])
+
+        self.client.retry_workflow_instance.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
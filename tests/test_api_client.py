@@ -2,11 +2,25 @@
 Tests for API client
 """
 
+import json
+import threading
+import time
 import unittest
 from unittest.mock import Mock, patch
 from check_dolphin.api_client import DolphinSchedulerClient
 
 
+def make_response(payload, status_code=200, headers=None):
+    """Build a mock HTTP response carrying a JSON payload"""
+    response = Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.content = json.dumps(payload).encode('utf-8') if payload is not None else b''
+    response.json.return_value = payload
+    response.raise_for_status.return_value = None
+    return response
+
+
 class TestDolphinSchedulerClient(unittest.TestCase):
     """Test DolphinScheduler API client"""
 
@@ -26,8 +40,7 @@ class TestDolphinSchedulerClient(unittest.TestCase):
     @patch('requests.request')
     def test_get_projects_success(self, mock_request):
         """Test get projects with successful response"""
-        mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_request.return_value = make_response({
             'success': True,
             'data': {
                 'totalList': [
@@ -35,9 +48,7 @@ class TestDolphinSchedulerClient(unittest.TestCase):
                     {'code': 456, 'name': 'Project 2'}
                 ]
             }
-        }
-        mock_response.raise_for_status.return_value = None
-        mock_request.return_value = mock_response
+        })
 
         projects = self.client.get_projects()
 
@@ -45,6 +56,58 @@ class TestDolphinSchedulerClient(unittest.TestCase):
         self.assertEqual(projects[0]['code'], 123)
         self.assertEqual(projects[1]['name'], 'Project 2')
 
+    @patch('requests.request')
+    def test_conditional_request_reuses_cached_data(self, mock_request):
+        """Test a 304 response returns the cached body and counts saved bytes"""
+        payload = {'success': True, 'data': {'totalList': [{'code': 1, 'name': 'p'}]}}
+        mock_request.side_effect = [
+            make_response(payload, headers={'ETag': '"v1"', 'Content-Length': '20'}),
+            make_response(None, status_code=304)
+        ]
+
+        first = self.client.get_projects()
+        second = self.client.get_projects()
+
+        self.assertEqual(first, second)
+        self.assertEqual(mock_request.call_args.kwargs['headers']['If-None-Match'], '"v1"')
+
+        stats = self.client.get_transfer_stats()['endpoints']['/projects']
+        self.assertEqual(stats['requests'], 2)
+        self.assertEqual(stats['not_modified'], 1)
+        self.assertEqual(stats['wire_bytes'], 20)
+        self.assertGreater(stats['bytes_saved'], 0)
+
+    @patch('requests.request')
+    def test_concurrent_identical_gets_are_coalesced(self, mock_request):
+        """Test identical in-flight GETs share one request and one result"""
+        release = threading.Event()
+        payload = {'success': True, 'data': [{'id': 1, 'name': 't', 'state': 'FAILURE'}]}
+
+        def slow_request(**kwargs):
+            release.wait(5)
+            return make_response(payload)
+
+        mock_request.side_effect = slow_request
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(
+                self.client.get_task_instances(project_code=1, process_instance_id=9)
+            ))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        # 等待所有线程进入请求后再放行
+        while self.client.get_coalescing_stats()['requests'] < 5:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(self.client.get_coalescing_stats()['coalesced'], 4)
+
 
 if __name__ == '__main__':
     unittest.main()
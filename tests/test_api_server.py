@@ -0,0 +1,99 @@
+"""
+Tests for local HTTP API
+"""
+
+import json
+import unittest
+import urllib.error
+import urllib.request
+from unittest.mock import Mock
+
+from check_dolphin.api_server import MonitorAPIServer
+from check_dolphin.monitor import WorkflowMonitor
+
+
+class TestMonitorAPIServer(unittest.TestCase):
+    """Test serving monitor state over HTTP"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.client = Mock()
+        self.client.get_workflow_instances.side_effect = (
+            lambda project_code, state_type, **kwargs: [
+                {'id': 5, 'name': 'wf', 'state': 'FAILURE'}
+            ] if state_type == 'FAILURE' else []
+        )
+        self.client.get_task_instances.return_value = [
+            {'id': 1, 'name': 't', 'state': 'FAILURE', 'maxRetryTimes': 0, 'retryTimes': 0}
+        ]
+        self.client.retry_workflow_instance.return_value = True
+
+        self.monitor = WorkflowMonitor(client=self.client, retry_interval=0)
+        self.server = MonitorAPIServer(self.monitor, port=0, token='secret')
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        self.base_url = f'http://{self.server.address}'
+
+    def _request(self, path, body=None, token=None, content_type='application/json', base_url=None):
+        request = urllib.request.Request((base_url or self.base_url) + path)
+        if body is not None:
+            request.data = json.dumps(body).encode('utf-8')
+            request.add_header('Content-Type', content_type)
+        if token:
+            request.add_header('X-Auth-Token', token)
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return json.loads(response.read())
+
+    def test_reads_are_served_from_memory(self):
+        """Test status, stats and last cycle come from the monitor without API calls"""
+        self.monitor.monitor_and_retry([1])
+        self.client.reset_mock()
+
+        self.assertEqual(self._request('/status')['1']['retried'], 1)
+        self.assertEqual(self._request('/stats')['total_retried'], 1)
+        self.assertEqual(self._request('/cycle')['outcomes'], {'retried': 1})
+        self.assertEqual(self._request('/queue'), [])
+        self.client.get_workflow_instances.assert_not_called()
+
+    def test_manual_retry_requires_token(self):
+        """Test POST /retry checks the token and records the retry"""
+        with self.assertRaises(urllib.error.HTTPError) as error:
+            self._request('/retry', {'project_code': 1, 'instance_id': 9})
+        self.assertEqual(error.exception.code, 401)
+
+        result = self._request('/retry', {'project_code': 1, 'instance_id': 9, 'failed_tasks': True}, token='secret')
+
+        self.assertEqual(result, {'retried': 9, 'retry_count': 1})
+        self.assertEqual(
+            self.client.retry_workflow_instance.call_args.kwargs['execute_type'], 'START_FAILURE_TASK_PROCESS'
+        )
+
+    def test_manual_retry_requires_json_and_configured_token(self):
+        """Test POST rejects form requests and is disabled without a token"""
+        with self.assertRaises(urllib.error.HTTPError) as error:
+            self._request(
+                '/retry', {'project_code': 1, 'instance_id': 9},
+                token='secret', content_type='application/x-www-form-urlencoded'
+            )
+        self.assertEqual(error.exception.code, 415)
+
+        server = MonitorAPIServer(self.monitor, port=0)
+        server.start()
+        self.addCleanup(server.stop)
+        with self.assertRaises(urllib.error.HTTPError) as error:
+            self._request('/retry', {'project_code': 1, 'instance_id': 9}, base_url=f'http://{server.address}')
+        self.assertEqual(error.exception.code, 403)
+
+        self.client.retry_workflow_instance.assert_not_called()
+
+    def test_stats_are_copies(self):
+        """Test statistics do not expose the live retry records"""
+        self.monitor.monitor_and_retry([1])
+        stats = self.monitor.get_retry_statistics()
+
+        self.monitor.retry_records[6] = 1
+        self.assertEqual(stats['retry_details'], {5: 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+Tests for time-sliced backfill scanning
+"""
+
+import os
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+
+from check_dolphin.backfill import BackfillScanner
+from check_dolphin.checkpoint import CheckpointStore
+
+
+class FakeClient:
+    """按开始时间过滤并分页返回工作流实例的假客户端"""
+
+    def __init__(self, instances):
+        self.instances = instances
+        self.calls = 0
+        self.requested = []
+        # 覆盖这个时间的时间片查询失败
+        self.failing_time = None
+        self.lock = threading.Lock()
+
+    def get_workflow_instance_page(self, project_code, page_no, page_size, state_type, start_date, end_date):
+        with self.lock:
+            self.calls += 1
+            self.requested.append((start_date, end_date))
+        if self.failing_time and start_date <= self.failing_time <= end_date:
+            raise ConnectionError('connection reset')
+        matched = [
+            item for item in self.instances
+            if item['state'] == state_type and start_date <= item['startTime'] <= end_date
+        ]
+        return {'items': matched[(page_no - 1) * page_size:page_no * page_size], 'total': len(matched)}
+
+
+class TestBackfillScanner(unittest.TestCase):
+    """Test adaptive slicing and resumable checkpoints"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.checkpoint_path = os.path.join(self.tmpdir.name, 'backfill.json')
+
+        # 30 天内每天 1 个失败实例，第 10 天集中失败 60 个
+        base = datetime(2025, 11, 1, 1, 0, 0)
+        instances = [
+            {'id': day, 'state': 'FAILURE', 'startTime': (base + timedelta(days=day)).strftime('%Y-%m-%d %H:%M:%S')}
+            for day in range(30)
+        ]
+        instances += [
+            {'id': 1000 + i, 'state': 'STOP',
+             'startTime': (base + timedelta(days=10, minutes=10 * i)).strftime('%Y-%m-%d %H:%M:%S')}
+            for i in range(60)
+        ]
+        self.client = FakeClient(instances)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _scanner(self, **kwargs):
+        return BackfillScanner(
+            self.client, slice_hours=24, page_size=10, max_pages=2, max_workers=4,
+            checkpoint_path=self.checkpoint_path, **kwargs
+        )
+
+    def test_dense_slices_are_split_without_truncation(self):
+        """Test every failed instance is found even in a dense slice"""
+        scanner = self._scanner()
+
+        found = scanner.scan([1], '2025-11-01', '2025-12-01')
+
+        self.assertEqual(len(found), 90)
+        self.assertEqual(scanner.progress()['percent'], 100.0)
+        self.assertFalse(os.path.exists(self.checkpoint_path))
+
+    def test_interrupted_backfill_resumes(self):
+        """Test a stopped backfill continues from its slice checkpoint"""
+        first = self._scanner()
+        first._reset()
+        first._cursors = {1: {'cursor': BackfillScanner.parse_date('2025-11-15'), 'size': 86400}}
+        first._found = {0: {'project_code': 1, 'workflow': {'id': 0}}}
+        first._save_checkpoint([1], '2025-11-01', '2025-12-01')
+
+        self.assertTrue(CheckpointStore(self.checkpoint_path).load())
+        found = self._scanner().scan([1], '2025-11-01', '2025-12-01')
+
+        # 前半个月只从检查点恢复，不再扫描
+        self.assertEqual(sorted(c['workflow']['id'] for c in found), [0] + list(range(14, 30)))
+
+    def test_failed_slices_stay_in_checkpoint(self):
+        """Test abandoned slices are reported, not counted as covered, and rescanned on the next run"""
+        self.client.failing_time = '2025-11-05 01:00:00'
+        scanner = self._scanner()
+
+        found = scanner.scan([1], '2025-11-01', '2025-12-01')
+
+        self.assertNotIn(4, [c['workflow']['id'] for c in found])
+        failed_slices = scanner.failed_slices()
+        self.assertEqual(len(failed_slices), 1)
+        self.assertLess(scanner.progress()['percent'], 100.0)
+        self.assertTrue(CheckpointStore(self.checkpoint_path).load())
+
+        self.client.failing_time = None
+        self.client.requested = []
+        scanner = self._scanner()
+        found = scanner.scan([1], '2025-11-01', '2025-12-01')
+
+        self.assertEqual(len(found), 90)
+        self.assertEqual(scanner.failed_slices(), [])
+        self.assertEqual(scanner.progress()['percent'], 100.0)
+        self.assertFalse(os.path.exists(self.checkpoint_path))
+        # 只重新扫描放弃的时间片
+        failed = failed_slices[0]
+        self.assertTrue(all(
+            failed['start_date'] <= start and end <= failed['end_date'] for start, end in self.client.requested
+        ))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Tests for failure classifier
+"""
+
+import unittest
+from unittest.mock import Mock
+
+from check_dolphin.classifier import FailureClassifier
+from check_dolphin.monitor import WorkflowMonitor
+
+
+class TestFailureClassifier(unittest.TestCase):
+    """Test log-based failure classification"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.client = Mock()
+        self.client.retry_workflow_instance.return_value = True
+        self.client.get_task_instances.return_value = [
+            {'id': 5, 'name': 'load', 'state': 'FAILURE', 'maxRetryTimes': 0, 'retryTimes': 0}
+        ]
+        self.workflow = {'id': 9, 'name': 'nightly_etl', 'state': 'FAILURE'}
+
+    def test_log_tail_is_read_in_bounded_chunks(self):
+        """Test only the real end of the log is read, however long the log is"""
+        lines = [f'line {i}' for i in range(25)]
+        requested = []
+
+        def get_task_log(task_instance_id, skip_line_num, limit, project_code=None):
+            requested.append(limit)
+            return '\n'.join(lines[skip_line_num:skip_line_num + limit])
+
+        self.client.get_task_log.side_effect = get_task_log
+        classifier = FailureClassifier(self.client, tail_lines=3, chunk_lines=10)
+
+        self.assertEqual(classifier.fetch_log_tail(5), 'line 22\nline 23\nline 24')
+        # 除了开头和末尾的 tail_lines 行，其余请求都只探测两行
+        self.assertEqual(sum(requested), 3 + 3 + 2 * (len(requested) - 2))
+
+        lines = lines[:2]
+        self.assertEqual(classifier.fetch_log_tail(6), 'line 0\nline 1')
+
+    def test_log_tail_with_blank_lines(self):
+        """Test blank lines inside the log are not mistaken for the end of the log"""
+        # 每隔一行是空行，并且有连续的空行（单独读取一个空行时返回空内容）
+        lines = ['' if i % 2 or 30 <= i < 37 else f'line {i}' for i in range(47)] + ['ERROR: syntax error', 'done']
+
+        self.client.get_task_log.side_effect = (
+            lambda task_instance_id, skip_line_num, limit, project_code=None:
+            '\n'.join(lines[skip_line_num:skip_line_num + limit])
+        )
+        classifier = FailureClassifier(self.client, tail_lines=4, chunk_lines=3)
+
+        self.assertEqual(classifier.fetch_log_tail(5), '\nline 46\nERROR: syntax error\ndone')
+
+        lines = ['line 0', '', '', 'line 3']
+        self.assertEqual(classifier.fetch_log_tail(6), 'line 0\n\n\nline 3')
+
+    def test_transient_pattern_wins(self):
+        """Test transient evidence keeps a failure retryable"""
+        classifier = FailureClassifier(self.client)
+
+        self.assertEqual(classifier.classify_log('ERROR: syntax error near SELECT')[0], 'permanent')
+        self.assertEqual(
+            classifier.classify_log('Table not found\nConnection refused')[0],
+            'transient'
+        )
+        self.assertEqual(classifier.classify_log('exit code 1')[0], 'unknown')
+
+    def test_permanent_failure_skips_retry(self):
+        """Test a permanent failure is marked, skipped and its log fetched once"""
+        self.client.get_task_log.side_effect = (
+            lambda task_instance_id, skip_line_num, limit, project_code=None:
+            'ParseException line 3:7 cannot recognize input' if skip_line_num == 0 else ''
+        )
+        classifier = FailureClassifier(self.client)
+        monitor = WorkflowMonitor(client=self.client, classifier=classifier)
+
+        self.assertFalse(monitor.retry_failed_workflow(1, self.workflow))
+        self.client.retry_workflow_instance.assert_not_called()
+        self.assertIn(9, monitor.permanent_failures)
+
+        fetched = self.client.get_task_log.call_count
+        classifier.find_permanent_failure(self.client.get_task_instances.return_value, {'FAILURE'})
+        self.assertEqual(self.client.get_task_log.call_count, fetched)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+"""
+Tests for the token-aware client pool
+"""
+
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from check_dolphin.classifier import FailureClassifier
+from check_dolphin.cli import create_client
+from check_dolphin.client_pool import ClientPool, RateLimiter
+from check_dolphin.config import Config
+from tests.test_api_client import make_response
+
+
+BASE_URL = "http://localhost:12345/dolphinscheduler"
+
+
+class TestClientPool(unittest.TestCase):
+    """Test per-project credential routing"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.pool = ClientPool.from_config(
+            base_url=BASE_URL,
+            token='default-token',
+            credentials=[
+                {'name': 'tenant_a', 'token': 'token-a', 'projects': [1], 'rate_limit': 100},
+                {'name': 'tenant_b', 'token': 'token-b', 'projects': [2]}
+            ],
+            conditional_requests=False
+        )
+        self.sent = []
+
+        def fake_request(method, url, headers, **kwargs):
+            self.sent.append((url, headers['token']))
+            if url.endswith('/projects'):
+                projects = {
+                    'default-token': [{'code': 1}],
+                    'token-a': [{'code': 1}],
+                    'token-b': [{'code': 2}, {'code': 3}]
+                }[headers['token']]
+                return make_response({'success': True, 'data': {'totalList': projects}})
+            return make_response({'success': True, 'data': {'total': 7, 'totalList': []}})
+
+        patcher = patch('requests.Session.request', side_effect=fake_request)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_requests_use_the_project_credential(self):
+        """Test keyword and positional project codes route to the mapped token"""
+        self.pool.get_workflow_instances(project_code=1, page_size=10)
+        self.pool.get_workflow_instance_count(2)
+        self.pool.get_workflow_instance_count(99)
+        self.pool.get_worker_servers()
+        self.pool.get_task_log(5, project_code=2)
+
+        self.assertEqual(
+            [token for _, token in self.sent],
+            ['token-a', 'token-b', 'default-token', 'default-token', 'token-b']
+        )
+        self.assertIsNotNone(self.pool.clients['tenant_a'].rate_limiter)
+        self.assertIsNone(self.pool.clients['tenant_b'].rate_limiter)
+        self.assertIsNot(self.pool.clients['tenant_a'].session, self.pool.clients['tenant_b'].session)
+
+    def test_discovered_projects_route_to_visible_credential(self):
+        """Test project discovery merges all credentials and routes unmapped projects"""
+        projects = self.pool.get_projects()
+
+        self.assertEqual(sorted(project['code'] for project in projects), [1, 2, 3])
+        self.assertIs(self.pool.client_for(3), self.pool.clients['tenant_b'])
+        self.assertIs(self.pool.client_for(1), self.pool.clients['tenant_a'])
+        self.assertEqual(set(self.pool.get_coalescing_stats()), {'default', 'tenant_a', 'tenant_b'})
+
+    def test_classifier_reads_logs_with_the_project_credential(self):
+        """Test failure classification fetches task logs with the token of the task's project"""
+        classifier = FailureClassifier(self.pool)
+
+        classifier.find_permanent_failure([{'id': 5, 'name': 'load', 'state': 'FAILURE'}], {'FAILURE'}, 1)
+
+        self.assertTrue(self.sent)
+        self.assertEqual({token for _, token in self.sent}, {'token-a'})
+
+    def test_credential_without_token_is_rejected(self):
+        """Test a credential without token or token_env raises ValueError"""
+        with self.assertRaises(ValueError):
+            ClientPool.from_config(BASE_URL, 'default-token', [{'name': 'x', 'token_env': 'MISSING_TOKEN_ENV'}])
+
+    def test_cli_exits_cleanly_on_invalid_credentials(self):
+        """Test the CLI reports a credential without a token instead of raising"""
+        config = Config()
+        config.config['dolphinscheduler']['credentials'] = [{'name': 'x', 'token_env': 'MISSING_TOKEN_ENV'}]
+
+        with self.assertLogs('check_dolphin.cli', level='ERROR'), self.assertRaises(SystemExit):
+            create_client(config)
+
+    def test_example_config_has_no_credentials(self):
+        """Test the generated example config works without extra token variables"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'config.yaml')
+            Config().save_example_config(path)
+            config = Config(path)
+
+        self.assertEqual(config.get('dolphinscheduler.credentials'), [])
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test the per-credential rate budget"""
+
+    def test_acquire_waits_when_budget_is_spent(self):
+        """Test requests beyond the burst are spaced at the configured rate"""
+        limiter = RateLimiter(rate=50, burst=1)
+
+        started = time.perf_counter()
+        for _ in range(5):
+            limiter.acquire()
+        elapsed = time.perf_counter() - started
+
+        self.assertGreaterEqual(elapsed, 0.07)
+        self.assertEqual(limiter.get_stats()['waits'], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
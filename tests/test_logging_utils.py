@@ -0,0 +1,74 @@
+"""
+Tests for logging utilities
+"""
+
+import json
+import logging
+import queue
+import unittest
+
+from check_dolphin.logging_utils import DeferredQueueHandler, JsonFormatter, SamplingFilter
+
+
+def _record(msg, level=logging.INFO, event=None, args=()):
+    record = logging.LogRecord('test', level, __file__, 1, msg, args, None)
+    if event:
+        record.event = event
+    return record
+
+
+class TestSamplingFilter(unittest.TestCase):
+    """Test per-message-type sampling and rate limiting"""
+
+    def test_sampling_by_event(self):
+        """Test sampled message types keep one record out of N"""
+        log_filter = SamplingFilter(sampling={'noisy': 0.25})
+
+        kept = sum(log_filter.filter(_record('msg %s', event='noisy', args=(i,))) for i in range(8))
+        other = sum(log_filter.filter(_record('other %s', args=(i,))) for i in range(8))
+
+        self.assertEqual(kept, 2)
+        self.assertEqual(other, 8)
+
+    def test_rate_limit_never_drops_warnings(self):
+        """Test rate limiting applies to INFO but not WARNING"""
+        log_filter = SamplingFilter(rate_limit=3)
+
+        infos = sum(log_filter.filter(_record('info')) for _ in range(10))
+        warnings = sum(log_filter.filter(_record('warn', level=logging.WARNING)) for _ in range(10))
+
+        self.assertLessEqual(infos, 6)
+        self.assertEqual(warnings, 10)
+
+
+class TestJsonFormatter(unittest.TestCase):
+    """Test structured JSON output"""
+
+    def test_format_includes_extra_fields(self):
+        """Test lazy args are merged and extra fields are emitted"""
+        line = JsonFormatter().format(_record('Workflow %s failed', event='wf', args=(42,)))
+        entry = json.loads(line)
+
+        self.assertEqual(entry['message'], 'Workflow 42 failed')
+        self.assertEqual(entry['event'], 'wf')
+        self.assertEqual(entry['level'], 'INFO')
+
+
+class TestDeferredQueueHandler(unittest.TestCase):
+    """Test records are queued with their message already merged"""
+
+    def test_mutable_args_are_formatted_at_enqueue(self):
+        """Test changing an argument after logging does not change the queued message"""
+        handler = DeferredQueueHandler(queue.SimpleQueue())
+        pending = [1, 2]
+
+        handler.handle(_record('pending %s', args=(pending,)))
+        pending.append(3)
+
+        queued = handler.queue.get_nowait()
+        self.assertEqual(queued.getMessage(), 'pending [1, 2]')
+        self.assertEqual(logging.Formatter('%(message)s').format(queued), 'pending [1, 2]')
+
+
+if __name__ == '__main__':
+    unittest.main()
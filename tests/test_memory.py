@@ -0,0 +1,167 @@
+"""
+Tests for memory budgets, diagnostics and long-running memory stability
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import tracemalloc
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from check_dolphin.api_client import DolphinSchedulerClient
+from check_dolphin.memory import BoundedDict, MemoryDiagnostics, current_rss
+from check_dolphin.monitor import WorkflowMonitor
+
+
+class _FakeDolphinScheduler(ThreadingHTTPServer):
+    """本地模拟的 DolphinScheduler：每次查询失败实例都返回一批新的实例"""
+
+    def __init__(self, per_cycle=10):
+        self.per_cycle = per_cycle
+        self.next_id = 1
+        self.lock = threading.Lock()
+        super().__init__(('127.0.0.1', 0), _FakeHandler)
+
+    @property
+    def base_url(self):
+        return f'http://127.0.0.1:{self.server_port}/dolphinscheduler'
+
+
+class _FakeHandler(BaseHTTPRequestHandler):
+
+    def _send(self, data, etag=None):
+        body = json.dumps({'success': True, 'data': data}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        tasks = re.search(r'/process-instances/(\d+)/tasks', self.path)
+        if tasks:
+            task = {
+                'id': int(tasks.group(1)) * 10, 'name': 'load', 'state': 'FAILURE',
+                'retryTimes': 0, 'maxRetryTimes': 0, 'log': 'x' * 512
+            }
+            self._send([task], etag=f'"{tasks.group(1)}"')
+            return
+
+        if 'stateType=FAILURE' in self.path:
+            with self.server.lock:
+                first = self.server.next_id
+                self.server.next_id += self.server.per_cycle
+            workflows = [
+                {'id': instance_id, 'name': f'wf_{instance_id}', 'state': 'FAILURE'}
+                for instance_id in range(first, first + self.server.per_cycle)
+            ]
+            self._send({'totalList': workflows, 'total': len(workflows)})
+            return
+
+        self._send({'totalList': [], 'total': 0})
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        self._send(True)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestBoundedDict(unittest.TestCase):
+    """Test entry budgets with eviction"""
+
+    def test_evicts_least_recently_updated(self):
+        """Test the oldest untouched entry is evicted once the budget is exceeded"""
+        records = BoundedDict(3)
+        for key in (1, 2, 3):
+            records[key] = 0
+        records[1] = 5
+        records[4] = 0
+        records.update({5: 0})
+
+        self.assertEqual(list(records), [1, 4, 5])
+        self.assertEqual(records.evictions, 2)
+        self.assertEqual(records.copy().max_entries, 3)
+        self.assertEqual(json.loads(json.dumps(records)), {'1': 5, '4': 0, '5': 0})
+
+    def test_diagnostics_report_structure_sizes(self):
+        """Test the diagnostics snapshot covers registered structures and allocations"""
+        monitor = WorkflowMonitor(client=DolphinSchedulerClient('http://localhost', 't'), max_tracked_instances=2)
+        for instance_id in range(5):
+            monitor.retry_records[instance_id] = 1
+
+        diagnostics = MemoryDiagnostics(top=3)
+        diagnostics.register_all(monitor.memory_structures())
+
+        tracing = tracemalloc.is_tracing()
+        diagnostics.start_tracing()
+        try:
+            snapshot = diagnostics.snapshot()
+        finally:
+            if not tracing:
+                tracemalloc.stop()
+
+        retry_records = snapshot['structures']['monitor.retry_records']
+        self.assertEqual(retry_records['entries'], 2)
+        self.assertEqual(retry_records['budget'], 2)
+        self.assertEqual(retry_records['evictions'], 3)
+        self.assertGreater(retry_records['bytes'], 0)
+        self.assertIn('client.validators', snapshot['structures'])
+        self.assertLessEqual(len(snapshot['top_allocations']), 3)
+        self.assertTrue(snapshot['top_allocations'])
+
+
+class TestSoak(unittest.TestCase):
+    """Run many monitoring cycles against a local fake server and check memory stays flat"""
+
+    # 默认只运行少量周期；设置 CHECK_DOLPHIN_SOAK_CYCLES 模拟数周的运行（5 分钟间隔一周为 2016 个周期）
+    CYCLES = int(os.getenv('CHECK_DOLPHIN_SOAK_CYCLES', '30'))
+
+    def test_soak_memory_stays_flat(self):
+        """Test structures stay within budget and traced memory does not grow with cycles"""
+        server = _FakeDolphinScheduler(per_cycle=5)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        # 测试框架会在内存中保存日志记录，长时间运行时关闭日志
+        logging.disable(logging.CRITICAL)
+        self.addCleanup(logging.disable, logging.NOTSET)
+
+        client = DolphinSchedulerClient(
+            base_url=server.base_url, token='t', coalesce_requests=False, max_cached_responses=25
+        )
+        monitor = WorkflowMonitor(client=client, retry_interval=0, max_tracked_instances=25)
+
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+            self.addCleanup(tracemalloc.stop)
+
+        warm_up = max(self.CYCLES // 3, 10)
+        baseline_traced = baseline_rss = None
+        for cycle in range(warm_up + self.CYCLES):
+            monitor.monitor_and_retry(project_codes=[1])
+            if cycle + 1 == warm_up:
+                baseline_traced = tracemalloc.get_traced_memory()[0]
+                baseline_rss = current_rss()
+
+        traced_growth = tracemalloc.get_traced_memory()[0] - baseline_traced
+
+        self.assertEqual(len(monitor.retry_records), 25)
+        self.assertEqual(len(monitor.verdict_cache), 5)
+        self.assertLessEqual(len(client._validators), 25)
+        self.assertGreater(monitor.retry_records.evictions, 0)
+        self.assertLess(traced_growth, 128 * 1024)
+        if baseline_rss:
+            self.assertLess(current_rss() - baseline_rss, 16 * 1024 * 1024)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,278 @@
+"""
+Tests for workflow monitor
+"""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+
+from check_dolphin.checkpoint import CheckpointStore
+from check_dolphin.dependencies import DependencyResolver
+from check_dolphin.monitor import WorkflowMonitor
+
+
+class TestMonitorShutdown(unittest.TestCase):
+    """Test graceful shutdown and checkpoint resume"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.checkpoint_path = os.path.join(self.tmpdir.name, 'checkpoint.json')
+
+        self.client = Mock()
+        self.client.get_workflow_instances.side_effect = (
+            lambda project_code, state_type, **kwargs: [
+                {'id': project_code * 10 + i, 'name': f'wf_{i}', 'state': 'FAILURE'}
+                for i in range(3)
+            ] if state_type == 'FAILURE' else []
+        )
+        self.client.get_task_instances.return_value = [
+            {'id': 1, 'name': 't', 'state': 'FAILURE', 'maxRetryTimes': 0, 'retryTimes': 0}
+        ]
+        self.client.retry_workflow_instance.return_value = True
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _monitor(self, **kwargs):
+        return WorkflowMonitor(
+            client=self.client,
+            checkpoint_path=self.checkpoint_path,
+            **kwargs
+        )
+
+    def test_shutdown_interrupts_sleep(self):
+        """Test a shutdown request ends the check interval wait immediately"""
+        monitor = self._monitor(retry_interval=0, check_interval=3600)
+        threading.Timer(0.1, monitor.request_shutdown).start()
+
+        started = time.monotonic()
+        monitor.monitor_and_retry([1], continuous=True)
+
+        self.assertLess(time.monotonic() - started, 5)
+
+    def test_resume_from_checkpoint(self):
+        """Test pending retries and retry counts survive a restart"""
+        monitor = self._monitor(retry_interval=3600)
+        # 第一次重试后的等待中收到停止请求
+        threading.Timer(0.1, monitor.request_shutdown).start()
+        monitor.monitor_and_retry([1, 2])
+
+        state = CheckpointStore(self.checkpoint_path).load()
+        self.assertEqual(state['project_index'], 2)
+        self.assertEqual([c['workflow']['id'] for c in state['pending']], [11, 12, 20, 21, 22])
+        self.assertEqual(state['retry_records'], {'10': 1})
+
+        self.client.get_workflow_instances.reset_mock()
+
+        resumed = self._monitor(retry_interval=0)
+        resumed.monitor_and_retry([1, 2])
+
+        # 所有项目都已扫描，直接使用检查点中的待处理队列，不再重新扫描
+        self.client.get_workflow_instances.assert_not_called()
+        self.assertEqual(resumed.retry_records[10], 1)
+        self.assertEqual(resumed.retry_records[22], 1)
+
+
+class TestMonitorWarmStart(unittest.TestCase):
+    """Test warm-start state persistence"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.state_path = os.path.join(self.tmpdir.name, 'state.json')
+
+        self.client = Mock()
+        self.client.get_workflow_instances.side_effect = (
+            lambda project_code, state_type, **kwargs: [
+                {'id': 7, 'name': 'wf', 'state': 'FAILURE', 'endTime': '2025-01-01 00:00:00'}
+            ] if state_type == 'FAILURE' else []
+        )
+        self.client.get_task_instances.return_value = [
+            {'id': 1, 'name': 't', 'state': 'FAILURE', 'maxRetryTimes': 3, 'retryTimes': 1}
+        ]
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_verdicts_survive_restart(self):
+        """Test cached verdicts skip task fetches after a restart"""
+        monitor = WorkflowMonitor(client=self.client, retry_interval=0, state_path=self.state_path)
+        monitor.monitor_and_retry([1])
+        self.assertEqual(self.client.get_task_instances.call_count, 1)
+        self.assertIn(1, monitor.watermarks)
+
+        restarted = WorkflowMonitor(client=self.client, retry_interval=0, state_path=self.state_path)
+        self.assertTrue(restarted.load_state())
+        restarted.monitor_and_retry([1])
+
+        self.assertEqual(self.client.get_task_instances.call_count, 1)
+        self.client.retry_workflow_instance.assert_not_called()
+
+    def test_resolve_project_codes_uses_cache(self):
+        """Test project names are resolved once and then cached"""
+        self.client.get_projects.return_value = [{'code': 11, 'name': 'etl'}, {'code': 22, 'name': 'report'}]
+        monitor = WorkflowMonitor(client=self.client)
+
+        self.assertEqual(monitor.resolve_project_codes(['report', 'missing']), [22])
+        self.assertEqual(monitor.resolve_project_codes(['report']), [22])
+        self.assertEqual(self.client.get_projects.call_count, 1)
+
+
+class TestRecoveryMode(unittest.TestCase):
+    """Test failed-task-only recovery"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.client = Mock()
+        self.client.retry_workflow_instance.return_value = True
+        self.client.get_task_instances.return_value = [
+            {'id': 1, 'name': 'extract', 'state': 'SUCCESS',
+             'startTime': '2025-01-01 00:00:00', 'endTime': '2025-01-01 02:00:00'},
+            {'id': 2, 'name': 'transform', 'state': 'SUCCESS',
+             'startTime': '2025-01-01 02:00:00', 'endTime': '2025-01-01 03:30:00'},
+            {'id': 3, 'name': 'load', 'state': 'FAILURE', 'maxRetryTimes': 1, 'retryTimes': 1}
+        ]
+        self.workflow = {'id': 9, 'name': 'nightly_etl', 'state': 'FAILURE'}
+
+    def test_full_mode_keeps_strict_validation(self):
+        """Test the default mode still refuses partially succeeded workflows"""
+        monitor = WorkflowMonitor(client=self.client)
+
+        self.assertFalse(monitor.retry_failed_workflow(1, self.workflow))
+        self.client.retry_workflow_instance.assert_not_called()
+
+    def test_auto_mode_reruns_failed_tasks_only(self):
+        """Test auto mode picks failed-task recovery when most tasks succeeded"""
+        monitor = WorkflowMonitor(client=self.client, recovery={'mode': 'auto', 'auto_threshold': 0.5})
+
+        self.assertTrue(monitor.retry_failed_workflow(1, self.workflow))
+        self.assertEqual(
+            self.client.retry_workflow_instance.call_args.kwargs['execute_type'],
+            'START_FAILURE_TASK_PROCESS'
+        )
+        self.assertEqual(monitor.get_retry_statistics()['saved_task_hours'], 3.5)
+
+    def test_auto_mode_below_threshold_keeps_strict_validation(self):
+        """Test auto mode that falls back to a full rerun still refuses partially succeeded workflows"""
+        self.client.get_task_instances.return_value = [
+            {'id': 1, 'name': 'extract', 'state': 'SUCCESS'}
+        ] + [
+            {'id': task_id, 'name': f'load_{task_id}', 'state': 'FAILURE', 'maxRetryTimes': 0, 'retryTimes': 0}
+            for task_id in range(2, 6)
+        ]
+        monitor = WorkflowMonitor(client=self.client, recovery={'mode': 'auto', 'auto_threshold': 0.5})
+
+        self.assertFalse(monitor.retry_failed_workflow(1, self.workflow))
+        self.client.retry_workflow_instance.assert_not_called()
+
+    def test_unknown_recovery_mode_is_rejected(self):
+        """Test typos in recovery modes fail when the config and policies load"""
+        with self.assertRaises(ValueError):
+            WorkflowMonitor(client=self.client, recovery={'workflows': {'nightly_etl': 'failed_task'}})
+        with self.assertRaises(ValueError):
+            WorkflowMonitor(client=self.client, policies={'rules': [{'name': 'etl', 'recovery': 'fast'}]})
+
+    def test_workflow_override_beats_project(self):
+        """Test per-workflow recovery mode overrides the project mode"""
+        monitor = WorkflowMonitor(client=self.client, recovery={
+            'projects': {1: 'failed_tasks'},
+            'workflows': {'nightly_etl': 'full'}
+        })
+
+        self.assertEqual(monitor.recovery_mode_for(1, 'nightly_etl'), 'full')
+        self.assertEqual(monitor.recovery_mode_for(1, 'other'), 'failed_tasks')
+        self.assertEqual(monitor.recovery_mode_for(2, 'other'), 'full')
+
+
+class TestDependencyOrdering(unittest.TestCase):
+    """Test dependency-aware retry ordering"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.client = Mock()
+        self.client.retry_workflow_instance.return_value = True
+        self.client.get_task_instances.return_value = [
+            {'id': 1, 'name': 't', 'state': 'FAILURE', 'maxRetryTimes': 0, 'retryTimes': 0}
+        ]
+        # report(300) 依赖 ingest(100)，ingest 没有上游
+        self.client.get_workflow_definition.side_effect = lambda project_code, definition_code: {
+            'taskDefinitionList': [{
+                'taskType': 'DEPENDENT',
+                'taskParams': '{"dependence": {"dependTaskList": [{"dependItemList": '
+                              '[{"projectCode": 1, "definitionCode": 100}]}]}}'
+            }]
+        } if definition_code == 300 else {'taskDefinitionList': []}
+        self.client.get_workflow_instances.side_effect = (
+            lambda project_code, state_type, **kwargs: [
+                {'id': 3, 'name': 'report', 'state': 'FAILURE', 'processDefinitionCode': 300},
+                {'id': 1, 'name': 'ingest', 'state': 'FAILURE', 'processDefinitionCode': 100}
+            ] if state_type == 'FAILURE' else []
+        )
+
+    def test_downstream_held_until_upstream_succeeds(self):
+        """Test upstream is retried first and downstream waits for its success"""
+        monitor = WorkflowMonitor(client=self.client, retry_interval=0, dependency_aware=True)
+
+        monitor.monitor_and_retry([1])
+        retried = [call.kwargs['instance_id'] for call in self.client.retry_workflow_instance.call_args_list]
+        self.assertEqual(retried, [1])
+
+        # 下一轮：上游重试后仍在运行，下游继续暂缓
+        self.client.get_workflow_instances.side_effect = (
+            lambda project_code, state_type, **kwargs: [
+                {'id': 3, 'name': 'report', 'state': 'FAILURE', 'processDefinitionCode': 300}
+            ] if state_type == 'FAILURE' else []
+        )
+        self.client.get_workflow_instance.return_value = {'id': 1, 'state': 'RUNNING_EXECUTION'}
+        monitor.monitor_and_retry([1])
+        self.assertEqual(self.client.retry_workflow_instance.call_count, 1)
+
+        # 上游成功后释放下游
+        self.client.get_workflow_instance.return_value = {'id': 1, 'state': 'SUCCESS'}
+        monitor.monitor_and_retry([1])
+        self.assertEqual(self.client.retry_workflow_instance.call_args.kwargs['instance_id'], 3)
+
+        # 工作流定义只获取一次
+        self.assertEqual(self.client.get_workflow_definition.call_count, 2)
+
+    def test_ordering_does_not_hold_state_lock_during_api_calls(self):
+        """Test dependency lookups run without the state lock so API readers are not blocked"""
+        monitor = WorkflowMonitor(client=self.client, retry_interval=0, dependency_aware=True)
+        get_definition = self.client.get_workflow_definition.side_effect
+        lock_free = []
+
+        def slow_definition(**kwargs):
+            acquired = monitor._state_lock.acquire(timeout=1)
+            if acquired:
+                monitor._state_lock.release()
+            lock_free.append(acquired)
+            return get_definition(**kwargs)
+
+        self.client.get_workflow_definition.side_effect = slow_definition
+        monitor.monitor_and_retry([1])
+
+        self.assertTrue(lock_free)
+        self.assertTrue(all(lock_free))
+
+    def test_missing_upstream_holds_downstream_for_bounded_time(self):
+        """Test a deleted upstream instance holds its downstream with a reason, then releases it"""
+        resolver = DependencyResolver(self.client, max_hold=600)
+        self.client.get_workflow_instance.return_value = None
+        candidates = [{'project_code': 1, 'workflow': {'id': 3, 'processDefinitionCode': 300}}]
+
+        resolver.note_retry(1, {'id': 1, 'processDefinitionCode': 100})
+        _, held = resolver.order(candidates)
+        self.assertIn('cannot be fetched', held[3])
+
+        resolver.note_retry(1, {'id': 1, 'processDefinitionCode': 100}, now=time.time() - 601)
+        with self.assertLogs('check_dolphin.dependencies', level='WARNING'):
+            _, held = resolver.order(candidates)
+        self.assertEqual(held, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Tests for notification pipeline
+"""
+
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest.mock import Mock
+
+from check_dolphin.monitor import WorkflowMonitor
+from check_dolphin.notifier import Notifier
+
+
+class _Receiver(HTTPServer):
+    """本地 Webhook 接收端（前 fail_first 次请求返回 500）"""
+
+    def __init__(self, fail_first=0):
+        self.fail_first = fail_first
+        self.requests = 0
+        self.payloads = []
+        super().__init__(('127.0.0.1', 0), _ReceiverHandler)
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_port}/hook'
+
+
+class _ReceiverHandler(BaseHTTPRequestHandler):
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self.server.requests += 1
+        if self.server.requests <= self.server.fail_first:
+            self.send_response(500)
+        else:
+            self.server.payloads.append(json.loads(body))
+            self.send_response(200)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestNotifier(unittest.TestCase):
+    """Test batched asynchronous notifications"""
+
+    def _start_receiver(self, fail_first=0):
+        receiver = _Receiver(fail_first)
+        threading.Thread(target=receiver.serve_forever, daemon=True).start()
+        self.addCleanup(receiver.server_close)
+        self.addCleanup(receiver.shutdown)
+        return receiver
+
+    def test_events_in_window_become_one_digest(self):
+        """Test a burst of events is delivered as a single summary message"""
+        receiver = self._start_receiver()
+        notifier = Notifier(receiver.url, window=60, max_items=5)
+        notifier.start()
+
+        for i in range(200):
+            notifier.notify(Notifier.EVENT_RETRY_ISSUED, instance_id=i)
+        notifier.notify(Notifier.EVENT_CYCLE_OVERRUN, cycle_seconds=400)
+        notifier.stop()
+
+        self.assertEqual(len(receiver.payloads), 1)
+        payload = receiver.payloads[0]
+        self.assertEqual(payload['counts'], {'retry_issued': 200, 'cycle_overrun': 1})
+        self.assertEqual(len(payload['events']), 5)
+        self.assertIn('and 196 more', payload['text'])
+
+    def test_failed_delivery_is_retried(self):
+        """Test delivery is retried after a server error"""
+        receiver = self._start_receiver(fail_first=1)
+        notifier = Notifier(receiver.url, window=0, backoff=0.01)
+        notifier.start()
+
+        notifier.notify(Notifier.EVENT_PERMANENT_FAILURE, instance_id=1)
+        notifier.stop()
+
+        self.assertEqual(receiver.requests, 2)
+        self.assertEqual(notifier.get_stats()['messages_sent'], 1)
+
+    def test_exhausted_retry_notified_once(self):
+        """Test the monitor reports an exhausted instance only once"""
+        notifier = Mock()
+        monitor = WorkflowMonitor(client=Mock(), max_retry_count=1, notifier=notifier)
+        monitor.retry_records[7] = 1
+        workflow = {'id': 7, 'name': 'wf', 'state': 'FAILURE'}
+
+        monitor.retry_failed_workflow(1, workflow)
+        monitor.retry_failed_workflow(1, workflow)
+
+        notifier.notify.assert_called_once()
+        self.assertEqual(notifier.notify.call_args.args[0], Notifier.EVENT_RETRY_EXHAUSTED)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Tests for retry outcome tracking
+"""
+
+import json
+import unittest
+from unittest.mock import Mock
+
+from check_dolphin.monitor import WorkflowMonitor
+from check_dolphin.outcomes import OutcomeTracker
+
+
+class TestOutcomeTracker(unittest.TestCase):
+    """Test batched outcome polling and success-rate feedback"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.client = Mock()
+        self.client.get_workflow_instances.return_value = [
+            {'id': 1, 'name': 'etl', 'state': 'SUCCESS'},
+            {'id': 2, 'name': 'etl', 'state': 'RUNNING_EXECUTION'}
+        ]
+        self.client.get_workflow_instance.return_value = {'id': 3, 'name': 'report', 'state': 'FAILURE'}
+
+    def test_poll_is_batched_and_backs_off(self):
+        """Test one list call per project and longer intervals for running instances"""
+        tracker = OutcomeTracker(self.client, poll_interval=60, backoff=2)
+        for instance_id, name in ((1, 'etl'), (2, 'etl'), (3, 'report')):
+            tracker.track(7, {'id': instance_id, 'name': name}, now=0)
+
+        self.assertEqual(tracker.poll(now=30), 0)
+        self.client.get_workflow_instances.assert_not_called()
+
+        self.assertEqual(tracker.poll(now=90), 2)
+        self.assertEqual(self.client.get_workflow_instances.call_count, 1)
+        self.assertEqual(self.client.get_workflow_instance.call_count, 1)
+        self.assertEqual(tracker.pending[2]['next_poll'], 90 + 120)
+
+        stats = tracker.statistics()
+        self.assertEqual(stats['avg_recovery_seconds'], 90)
+        self.assertEqual(stats['workflows']['report']['success_rate'], 0)
+
+    def test_low_success_rate_skips_retry(self):
+        """Test workflows whose retries rarely succeed are no longer retried"""
+        tracker = OutcomeTracker(self.client, min_attempts=2, min_success_rate=0.5)
+        tracker.workflows['report'] = {'attempts': 4, 'successes': 1, 'recovery_seconds': 60.0}
+        monitor = WorkflowMonitor(client=self.client, outcomes=tracker)
+
+        can_retry, reason = monitor.evaluate_retry(7, {'id': 3, 'name': 'report'})
+
+        self.assertFalse(can_retry)
+        self.assertIn('25%', reason)
+        self.client.get_task_instances.assert_not_called()
+
+
+    def test_blocked_workflow_becomes_eligible_again(self):
+        """Test old failures decay so a blocked workflow is retried again and new results count"""
+        tracker = OutcomeTracker(self.client, min_attempts=3, min_success_rate=0.5, half_life=3600)
+        for instance_id in range(4):
+            tracker.track(7, {'id': instance_id, 'name': 'report'}, now=0)
+            tracker._record(instance_id, False, now=0)
+
+        self.assertFalse(tracker.worth_retrying('report', now=0)[0])
+        self.assertFalse(tracker.worth_retrying('report', now=1000)[0])
+        # 4 次失败衰减到不足 3 次后重新尝试
+        self.assertTrue(tracker.worth_retrying('report', now=3600)[0])
+
+        tracker.track(7, {'id': 9, 'name': 'report'}, now=3600)
+        tracker._record(9, True, now=3600)
+        self.assertEqual(tracker.workflows['report']['attempts'], 5)
+        self.assertAlmostEqual(tracker.workflows['report']['recent_attempts'], 3)
+
+        # 状态恢复后继续按时间衰减
+        restored = OutcomeTracker(self.client, min_attempts=3, min_success_rate=0.5, half_life=3600)
+        restored.restore_state(json.loads(json.dumps(tracker.export_state())))
+        self.assertTrue(restored.worth_retrying('report', now=3600 + 7200)[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
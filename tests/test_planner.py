@@ -0,0 +1,75 @@
+"""
+Tests for retry planner
+"""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from check_dolphin.monitor import WorkflowMonitor
+from check_dolphin.planner import RetryPlanner
+
+
+class TestRetryPlanner(unittest.TestCase):
+    """Test dry-run retry planning"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.client = Mock()
+        self.client.get_workflow_instances.side_effect = (
+            lambda project_code, state_type, **kwargs:
+            [{'id': 1, 'name': 'wf_a', 'state': 'FAILURE'}] if state_type == 'FAILURE' else []
+        )
+        self.client.get_task_instances.return_value = [
+            {'id': 10, 'name': 'task', 'state': 'FAILURE', 'maxRetryTimes': 0, 'retryTimes': 0}
+        ]
+        self.monitor = WorkflowMonitor(client=self.client, retry_interval=0)
+        self.planner = RetryPlanner(self.monitor, max_workers=2)
+
+    def test_build_plan_has_no_side_effects(self):
+        """Test planning never calls executors/execute"""
+        plan = self.planner.build_plan([123])
+
+        self.assertEqual(len(plan), 1)
+        self.assertEqual(plan[0]['verdict'], 'retry')
+        self.assertEqual(plan[0]['api_calls'], 2)
+        self.client.retry_workflow_instance.assert_not_called()
+        self.assertEqual(self.monitor.retry_records, {})
+
+    def test_plan_uses_checkpointed_retry_records(self):
+        """Test the dry run skips instances the daemon would skip after restoring its checkpoint"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'checkpoint.json')
+            writer = WorkflowMonitor(client=self.client, checkpoint_path=path, max_retry_count=2)
+            writer.retry_records[1] = 2
+            writer.save_checkpoint()
+
+            monitor = WorkflowMonitor(client=self.client, retry_interval=0, checkpoint_path=path, max_retry_count=2)
+            monitor.restore_retry_records()
+            plan = RetryPlanner(monitor, max_workers=2).build_plan([123])
+
+        self.assertNotEqual(plan[0]['verdict'], 'retry')
+
+    def test_write_plan_json_and_csv(self):
+        """Test machine-readable plan output"""
+        plan = self.planner.build_plan([123])
+        summary = self.planner.summarize(plan, project_count=1)
+
+        output = io.StringIO()
+        self.planner.write_plan(plan, output, fmt='json', summary=summary)
+        data = json.loads(output.getvalue())
+        self.assertEqual(data['summary']['retry'], 1)
+        self.assertEqual(data['summary']['api_calls'], 4)
+
+        output = io.StringIO()
+        self.planner.write_plan(plan, output, fmt='csv')
+        lines = output.getvalue().strip().splitlines()
+        self.assertEqual(lines[0], ','.join(RetryPlanner.PLAN_FIELDS))
+        self.assertEqual(len(lines), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Tests for retry policy engine
+"""
+
+import time
+import unittest
+from datetime import datetime
+from unittest.mock import Mock
+
+from check_dolphin.monitor import WorkflowMonitor
+from check_dolphin.policy import PolicyEngine
+
+
+class TestPolicyEngine(unittest.TestCase):
+    """Test compiled policy matching"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.config = {
+            'default': {'max_retries': 2},
+            'rules': [
+                {'regex': 'report_.*', 'exclude': True},
+                {'prefix': 'report_', 'max_retries': 4},
+                {'prefix': 'report_daily', 'project': 7, 'max_retries': 6},
+                {'name': 'report_daily_sales', 'max_retries': 8},
+                {'regex': '.*_tmp', 'recovery': 'failed_tasks'}
+            ]
+        }
+
+    def test_match_precedence(self):
+        """Test exact name beats longest prefix, which beats regex"""
+        engine = PolicyEngine(self.config)
+
+        self.assertEqual(engine.resolve(7, 'report_daily_sales')['max_retries'], 8)
+        self.assertEqual(engine.resolve(7, 'report_daily_cost')['max_retries'], 6)
+        self.assertEqual(engine.resolve(8, 'report_daily_cost')['max_retries'], 4)
+        self.assertEqual(engine.explain(8, 'etl_tmp')['match_type'], 'regex')
+        self.assertEqual(engine.resolve(8, 'etl'), {'max_retries': 2, 'rule': None})
+
+    def test_invalid_rules_fail_at_load_time(self):
+        """Test broken rules are rejected when compiled"""
+        with self.assertRaises(ValueError):
+            PolicyEngine({'rules': [{'regex': '('}]})
+        with self.assertRaises(ValueError):
+            PolicyEngine({'rules': [{'name': 'a', 'quiet_hours': '25:00-01:00'}]})
+        for fields in ({'max_retries': '3'}, {'max_retries': -1}, {'backoff': 'slow'}, {'backoff': True}):
+            with self.assertRaises(ValueError):
+                PolicyEngine({'rules': [dict(fields, name='a')]})
+        with self.assertRaises(ValueError):
+            PolicyEngine({'default': {'max_retries': 1.5}})
+
+    def test_regex_rules_match_in_config_order(self):
+        """Test overlapping regex rules, including ones that cannot be combined, match in config order"""
+        engine = PolicyEngine({'rules': [
+            {'regex': 'etl_daily_.*', 'max_retries': 1},
+            {'regex': '(?i)etl_.*', 'max_retries': 2},
+            {'regex': r'(a)\1_.*', 'max_retries': 3},
+            {'regex': 'etl_.*|aa_.*', 'max_retries': 4}
+        ]})
+
+        self.assertEqual(engine.resolve(1, 'etl_daily_sales')['max_retries'], 1)
+        self.assertEqual(engine.resolve(1, 'ETL_weekly')['max_retries'], 2)
+        self.assertEqual(engine.resolve(1, 'aa_report')['max_retries'], 3)
+        self.assertEqual(engine.match(1, 'ab_report'), (None, None))
+
+    def test_quiet_hours_cross_midnight(self):
+        """Test quiet hours spanning midnight"""
+        self.assertTrue(PolicyEngine.in_quiet_hours('22:00-06:00', datetime(2025, 1, 1, 23, 30)))
+        self.assertTrue(PolicyEngine.in_quiet_hours('22:00-06:00', datetime(2025, 1, 1, 5, 59)))
+        self.assertFalse(PolicyEngine.in_quiet_hours('22:00-06:00', datetime(2025, 1, 1, 12, 0)))
+
+    def test_monitor_applies_policy(self):
+        """Test the monitor honours per-workflow max retries, exclusion and backoff"""
+        monitor = WorkflowMonitor(client=Mock(), policies={'rules': [
+            {'name': 'etl', 'max_retries': 1},
+            {'name': 'scratch', 'exclude': True},
+            {'name': 'report', 'backoff': 600}
+        ]})
+        monitor.retry_records.update({1: 1, 3: 1})
+        monitor.last_retry_at[3] = time.time()
+
+        self.assertIn('max retry count (1)', monitor.evaluate_retry(1, {'id': 1, 'name': 'etl'})[1])
+        self.assertIn('Excluded', monitor.evaluate_retry(1, {'id': 2, 'name': 'scratch'})[1])
+        self.assertIn('Backing off', monitor.evaluate_retry(1, {'id': 3, 'name': 'report'})[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Tests for retry priority model and queue
+"""
+
+import unittest
+from datetime import datetime
+from unittest.mock import Mock
+
+from check_dolphin.monitor import WorkflowMonitor
+from check_dolphin.priority import PriorityModel, RetryQueue
+
+
+class TestPriorityModel(unittest.TestCase):
+    """Test weight and SLA based priorities"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.model = PriorityModel({
+            'default_weight': 1,
+            'projects': {100: 3},
+            'workflows': [{'pattern': 'report_*', 'weight': 5, 'sla': '06:00'}],
+            'sla_weight': 10,
+            'sla_horizon': 3600
+        })
+
+    def test_project_and_pattern_weights(self):
+        """Test workflow patterns override project weights"""
+        now = datetime(2025, 1, 1, 1, 0)
+
+        self.assertEqual(self.model.priority(1, {'name': 'etl'}, now), 1)
+        self.assertEqual(self.model.priority(100, {'name': 'etl'}, now), 3)
+        self.assertEqual(self.model.priority(100, {'name': 'report_daily'}, now), 5)
+
+    def test_sla_boost_grows_towards_deadline(self):
+        """Test priority rises as the SLA deadline approaches"""
+        workflow = {'name': 'report_daily'}
+
+        self.assertEqual(self.model.priority(1, workflow, datetime(2025, 1, 1, 5, 30)), 10)
+        self.assertEqual(self.model.priority(1, workflow, datetime(2025, 1, 1, 7, 0)), 15)
+
+    def test_invalid_sla_fails_at_load_time(self):
+        """Test an unquoted YAML time (loaded as an int) or a malformed SLA is rejected"""
+        for sla in (1110, '6am', '25:00'):
+            with self.assertRaises(ValueError):
+                PriorityModel({'workflows': [{'pattern': 'report_*', 'sla': sla}]})
+
+
+class TestRetryQueue(unittest.TestCase):
+    """Test heap-based retry queue"""
+
+    def test_drain_orders_by_priority_then_insertion(self):
+        """Test highest priority first and FIFO on ties"""
+        queue = RetryQueue()
+        for priority, item in [(1, 'a'), (5, 'b'), (1, 'c'), (3, 'd')]:
+            queue.push(priority, item)
+
+        self.assertEqual(queue.drain(), ['b', 'd', 'a', 'c'])
+        self.assertEqual(len(queue), 0)
+
+    def test_monitor_retries_important_workflows_first(self):
+        """Test the monitor spends a limited retry budget on the highest priority"""
+        client = Mock()
+        client.retry_workflow_instance.return_value = True
+        client.get_task_instances.return_value = [
+            {'id': 1, 'name': 't', 'state': 'FAILURE', 'maxRetryTimes': 0, 'retryTimes': 0}
+        ]
+        client.get_workflow_instances.side_effect = (
+            lambda project_code, state_type, **kwargs: [
+                {'id': 1, 'name': 'cleanup', 'state': 'FAILURE'},
+                {'id': 2, 'name': 'report_daily', 'state': 'FAILURE'}
+            ] if state_type == 'FAILURE' else []
+        )
+
+        monitor = WorkflowMonitor(
+            client=client,
+            retry_interval=0,
+            priority={'workflows': [{'pattern': 'report_*', 'weight': 10}]},
+            max_retries_per_cycle=1
+        )
+        monitor.monitor_and_retry([1])
+
+        client.retry_workflow_instance.assert_called_once()
+        self.assertEqual(client.retry_workflow_instance.call_args.kwargs['instance_id'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
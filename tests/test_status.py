@@ -0,0 +1,125 @@
+"""
+Tests for the multi-project status board
+"""
+
+import io
+import json
+import os
+import threading
+import unittest
+from unittest.mock import Mock, patch
+
+from check_dolphin.api_client import DolphinSchedulerClient
+from check_dolphin.monitor import WorkflowMonitor
+from check_dolphin.status import StatusBoard, StatusWriter, run_status
+
+
+def make_client(instances_by_project, failing_pages=None):
+    """Build a mock client that pages through the given instances using the real paging logic"""
+    client = Mock()
+    failing_pages = failing_pages or {}
+
+    def get_page(project_code, page_no, page_size, **filters):
+        instances = instances_by_project[project_code]
+        # 与真实客户端一样，请求失败时返回 None
+        if instances is None or page_no == failing_pages.get(project_code):
+            return None
+        return {
+            'items': instances[(page_no - 1) * page_size:page_no * page_size],
+            'total': len(instances)
+        }
+
+    client.get_workflow_instance_page.side_effect = get_page
+    client.iter_workflow_instances.side_effect = (
+        lambda **kwargs: DolphinSchedulerClient.iter_workflow_instances(client, **kwargs)
+    )
+    return client
+
+
+class TestStatusBoard(unittest.TestCase):
+    """Test concurrent fetching and streaming output"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.instances = {
+            1: [{'state': 'SUCCESS'}] * 230 + [{'state': 'FAILURE'}] * 20,
+            2: [{'state': 'RUNNING_EXECUTION'}, {'state': 'STOP'}],
+            3: None,
+            4: [{'state': 'SUCCESS'}] * 150
+        }
+        self.client = make_client(self.instances, failing_pages={4: 2})
+        self.board = StatusBoard(WorkflowMonitor(client=self.client), max_workers=3)
+
+    def test_fetch_counts_all_pages_and_reports_errors(self):
+        """Test every page is counted and failed requests yield an error row, not partial counts"""
+        rows = {row['project_code']: row for row in self.board.fetch([1, 2, 3, 4])}
+
+        self.assertEqual(rows[1]['total'], 250)
+        self.assertEqual(rows[1]['success'], 230)
+        self.assertEqual(rows[1]['failure'], 20)
+        self.assertEqual(rows[2]['running'], 1)
+        self.assertEqual(rows[2]['failure'], 1)
+        self.assertIn('page 1', rows[3]['error'])
+        self.assertNotIn('total', rows[3])
+        self.assertIn('page 2', rows[4]['error'])
+        self.assertNotIn('total', rows[4])
+        self.assertEqual(self.client.get_workflow_instance_page.call_count, 3 + 1 + 1 + 2)
+
+    def test_stream_json_and_csv(self):
+        """Test json streams one object per line and csv has a header and one row per project"""
+        output = io.StringIO()
+        run_status(self.board, StatusWriter(output, fmt='json'), [1, 2])
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(sorted(line['project_code'] for line in lines), [1, 2])
+
+        output = io.StringIO()
+        run_status(self.board, StatusWriter(output, fmt='csv'), [1, 2])
+        lines = output.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith('project_code,total'))
+        self.assertEqual(len(lines), 3)
+
+    def test_watch_redraws_only_changed_rows(self):
+        """Test the interactive board only rewrites rows whose counts changed"""
+        output = io.StringIO()
+        writer = StatusWriter(output, fmt='table', interactive=True)
+        writer.start_board([1, 2])
+
+        self.assertTrue(writer.update({'project_code': 2, 'total': 1, 'success': 1, 'failure': 0,
+                                       'running': 0, 'other': 0, 'fetched_at': 'a'}))
+        start = len(output.getvalue())
+        self.assertFalse(writer.update({'project_code': 2, 'total': 1, 'success': 1, 'failure': 0,
+                                        'running': 0, 'other': 0, 'fetched_at': 'b'}))
+        self.assertEqual(len(output.getvalue()), start)
+
+        self.assertTrue(writer.update({'project_code': 1, 'total': 2, 'success': 1, 'failure': 1,
+                                       'running': 0, 'other': 0, 'fetched_at': 'b'}))
+        # 第一行（项目 1）距离状态行之后的光标 3 行
+        self.assertIn('\x1b[3A\r\x1b[2K', output.getvalue()[start:])
+
+    def test_watch_appends_when_board_is_taller_than_terminal(self):
+        """Test a board that does not fit the terminal falls back to appending changed rows"""
+        output = io.StringIO()
+        writer = StatusWriter(output, fmt='table', interactive=True)
+        with patch('check_dolphin.status.shutil.get_terminal_size', return_value=os.terminal_size((80, 3))):
+            writer.start_board([1, 2])
+
+        self.assertTrue(writer.update({'project_code': 1, 'total': 2, 'success': 1, 'failure': 1,
+                                       'running': 0, 'other': 0, 'fetched_at': 'a'}))
+        self.assertNotIn('\x1b[', output.getvalue())
+        self.assertEqual(len(output.getvalue().splitlines()), 2)
+
+    def test_watch_appends_changes_when_not_a_terminal(self):
+        """Test non-interactive watch output only appends rows that changed"""
+        output = io.StringIO()
+        stop_event = threading.Event()
+        stop_event.set()
+        writer = StatusWriter(output, fmt='json', interactive=False)
+
+        run_status(self.board, writer, [1, 2], watch=1, stop_event=stop_event)
+        run_status(self.board, writer, [1, 2], watch=1, stop_event=stop_event)
+
+        self.assertEqual(len(output.getvalue().splitlines()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Tests for recursive sub-workflow validation
+"""
+
+import unittest
+from unittest.mock import Mock
+
+from check_dolphin.monitor import WorkflowMonitor
+from check_dolphin.subworkflows import SubWorkflowInspector
+
+
+class TestSubWorkflowInspector(unittest.TestCase):
+    """Test sub-workflow expansion and aggregated verdicts"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        # 父工作流 9 -> SUB_PROCESS 任务 1 -> 子工作流 90 -> SUB_PROCESS 任务 2 -> 子工作流 900
+        self.tasks = {
+            9: [{'id': 1, 'name': 'stage', 'taskType': 'SUB_PROCESS', 'state': 'FAILURE'}],
+            90: [
+                {'id': 2, 'name': 'inner', 'taskType': 'SUB_PROCESS', 'state': 'FAILURE'},
+                {'id': 3, 'name': 'extract', 'taskType': 'SHELL', 'state': 'SUCCESS'}
+            ],
+            900: [{'id': 4, 'name': 'load', 'taskType': 'SQL', 'state': 'FAILURE',
+                   'maxRetryTimes': 2, 'retryTimes': 2}]
+        }
+        self.client = Mock()
+        self.client.get_sub_process_instance_id.side_effect = (
+            lambda project_code, task_instance_id: {1: 90, 2: 900}.get(task_instance_id)
+        )
+        self.client.get_task_instances.side_effect = (
+            lambda project_code, process_instance_id: self.tasks[process_instance_id]
+        )
+        self.client.retry_workflow_instance.return_value = True
+        self.workflow = {'id': 9, 'name': 'pipeline', 'state': 'FAILURE'}
+
+    def test_collect_respects_depth_and_caches_child_ids(self):
+        """Test nested children are expanded up to the depth limit"""
+        inspector = SubWorkflowInspector(self.client, max_depth=1)
+        child_tasks, problems = inspector.collect(1, self.tasks[9])
+        self.assertEqual([t['name'] for t in child_tasks], ['stage/inner', 'stage/extract'])
+        self.assertEqual(problems, [])
+
+        inspector.max_depth = 3
+        child_tasks, _ = inspector.collect(1, self.tasks[9])
+        self.assertIn('stage/inner/load', [t['name'] for t in child_tasks])
+        self.assertEqual(self.client.get_sub_process_instance_id.call_count, 2)
+
+    def test_running_child_blocks_parent_retry(self):
+        """Test a running task deep in a sub-workflow blocks the parent retry"""
+        monitor = WorkflowMonitor(client=self.client, sub_workflows=SubWorkflowInspector(self.client))
+        self.assertTrue(monitor.retry_failed_workflow(1, self.workflow))
+
+        self.tasks[900][0]['state'] = 'RUNNING_EXECUTION'
+        can_retry, reason = WorkflowMonitor(
+            client=self.client, sub_workflows=SubWorkflowInspector(self.client)
+        ).evaluate_retry(1, self.workflow)
+
+        self.assertFalse(can_retry)
+        self.assertIn('stage/inner/load', reason)
+
+    def test_child_state_change_is_not_hidden_by_verdict_cache(self):
+        """Test the same monitor re-checks children even if the parent fingerprint is unchanged"""
+        monitor = WorkflowMonitor(client=self.client, sub_workflows=SubWorkflowInspector(self.client))
+        self.assertTrue(monitor.evaluate_retry(1, self.workflow)[0])
+
+        self.tasks[900][0]['state'] = 'RUNNING_EXECUTION'
+        can_retry, reason = monitor.evaluate_retry(1, self.workflow)
+
+        self.assertFalse(can_retry)
+        self.assertIn('stage/inner/load', reason)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Tests for API traffic recording and replay
+"""
+
+import gzip
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from check_dolphin.api_client import DolphinSchedulerClient
+from check_dolphin.transport import RecordingTransport, ReplayTransport
+from tests.test_api_client import make_response
+
+
+BASE_URL = "http://localhost:12345/dolphinscheduler"
+
+
+class TestRecordReplay(unittest.TestCase):
+    """Test recording a session and replaying it without network access"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'session.jsonl.gz')
+
+    def tearDown(self):
+        """Clean up temporary files"""
+        self.tmpdir.cleanup()
+
+    def record_session(self, delay=0.0):
+        """Record two project listings served by a mocked server"""
+        payloads = [
+            {'success': True, 'data': {'totalList': [{'code': 1, 'name': 'secret-token-owner'}]}},
+            {'success': True, 'data': {'totalList': [{'code': 1}, {'code': 2}]}}
+        ]
+        responses = iter(payloads)
+
+        def fake_request(**kwargs):
+            time.sleep(delay)
+            return make_response(next(responses), headers={'Set-Cookie': 'session=abc', 'ETag': '"v1"'})
+
+        recorder = RecordingTransport(self.path, secrets=['secret-token'])
+        client = DolphinSchedulerClient(
+            base_url=BASE_URL, token='secret-token', conditional_requests=False, transport=recorder
+        )
+        with patch('requests.request', side_effect=fake_request):
+            first = client.get_projects()
+            second = client.get_projects()
+        recorder.close()
+
+        return first, second
+
+    def test_record_scrubs_token_and_cookies(self):
+        """Test the archive is compressed and holds no token or cookie"""
+        self.record_session()
+
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            content = f.read()
+
+        self.assertNotIn('secret-token', content)
+        self.assertNotIn('session=abc', content)
+        self.assertIn('***-owner', content)
+        self.assertEqual(len(ReplayTransport.load(self.path)), 2)
+
+    @patch('requests.request')
+    def test_replay_returns_recorded_responses_in_order(self, mock_request):
+        """Test replay serves the recorded responses without touching the network"""
+        self.record_session()
+
+        client = DolphinSchedulerClient(
+            base_url=BASE_URL, token='other-token', conditional_requests=False,
+            transport=ReplayTransport(self.path, speed=0)
+        )
+
+        self.assertEqual(len(client.get_projects()), 1)
+        self.assertEqual(len(client.get_projects()), 2)
+        # 录制的响应用完后重复返回最后一次的响应
+        self.assertEqual(len(client.get_projects()), 2)
+        # 没有录制的请求返回 404，客户端按请求失败处理
+        self.assertIsNone(client.get_workflow_instance(project_code=1, instance_id=5))
+        mock_request.assert_not_called()
+
+    def test_replay_speed_scales_recorded_latency(self):
+        """Test replay delays by the recorded latency divided by the speed factor"""
+        self.record_session(delay=0.1)
+
+        transport = ReplayTransport(self.path, speed=4)
+        started = time.perf_counter()
+        transport.request('GET', f"{BASE_URL}/projects", params={'pageNo': 1, 'pageSize': 100})
+        elapsed = time.perf_counter() - started
+
+        self.assertGreaterEqual(elapsed, 0.02)
+        self.assertLess(elapsed, 0.09)
+
+
+if __name__ == '__main__':
+    unittest.main()